@@ -1,6 +1,12 @@
 """TuShare listed company data downloader."""
 
+from .aio import AsyncFetchRunner, AsyncListedCompanyFetcher, AsyncRateLimiter
 from .fetchers import ListedCompanyFetcher
 
-__all__ = ["ListedCompanyFetcher"]
+__all__ = [
+    "AsyncFetchRunner",
+    "AsyncListedCompanyFetcher",
+    "AsyncRateLimiter",
+    "ListedCompanyFetcher",
+]
 __version__ = "0.1.0"
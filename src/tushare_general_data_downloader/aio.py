@@ -0,0 +1,281 @@
+"""asyncio fetch engine for embedding the downloader in an event loop."""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from datetime import date
+from functools import partial
+from typing import Awaitable, Callable, TypeVar
+
+import pandas as pd
+
+from .api import BudgetExhausted, FetchRunner, RateLimiter, RequestBudget
+from .constants import (
+    DATASET_SHARE_FLOAT,
+    DATASET_STK_MANAGERS,
+    DEFAULT_SHARE_FLOAT_THRESHOLD,
+    ORDER_NEWEST_FIRST,
+    ORDER_OLDEST_FIRST,
+)
+from .fetchers import ApiCall, FetchSummary, ListedCompanyFetcher, resolve_fields
+from .registry import DatasetSpec, get_spec
+from .storage import DataStore
+from .windowing import DateWindow
+
+T = TypeVar("T")
+
+
+class AsyncRateLimiter:
+    """Token bucket: ``rpm`` requests per minute with up to ``burst`` back-to-back."""
+
+    def __init__(self, rpm: float, burst: int = 1) -> None:
+        self.rate = rpm / 60.0 if rpm > 0 else 0.0
+        self.capacity = max(burst, 1)
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    async def acquire(self) -> None:
+        if self.rate <= 0:
+            return
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._updated) * self.rate
+                )
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                await asyncio.sleep((1 - self._tokens) / self.rate)
+
+
+@dataclass
+class AsyncFetchRunner:
+    """Async counterpart of :class:`FetchRunner` with a cap on in-flight requests."""
+
+    rate_limiter: AsyncRateLimiter
+    retries: int = 6
+    base_delay: float = 2.0
+    max_delay: float = 60.0
+    max_in_flight: int = 64
+    budget: RequestBudget | None = None
+    _slots: asyncio.Semaphore | None = field(default=None, init=False, repr=False)
+
+    async def call(self, label: str, fn: Callable[[], Awaitable[T]]) -> T:
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.max_in_flight)
+        for attempt in range(1, self.retries + 1):
+            if self.budget is not None:
+                self.budget.consume()
+            try:
+                await self.rate_limiter.acquire()
+                async with self._slots:
+                    return await fn()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:  # pylint: disable=broad-except
+                if attempt == self.retries:
+                    raise
+                delay = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+                print(
+                    f"{label} failed (attempt {attempt}/{self.retries}): {exc}. "
+                    f"Retrying in {delay:.1f}s..."
+                )
+                await asyncio.sleep(delay)
+        raise RuntimeError("unreachable")
+
+
+def _merge(total: FetchSummary, part: FetchSummary) -> None:
+    total.windows += part.windows
+    total.rows += part.rows
+    total.files += part.files
+    total.paths.extend(part.paths)
+
+
+class AsyncListedCompanyFetcher:
+    """Windowed event-table fetcher whose window requests overlap on one event loop.
+
+    Each window runs as a task over the same steps as :class:`ListedCompanyFetcher`
+    (skip, autosplit to days, ts_code fan-out), with every request paced, retried
+    and budgeted by ``runner``; files are written on the loop between requests.
+    ``pro`` may expose coroutine methods, which need no threads, or the usual
+    blocking ``ts.pro_api()`` methods, which run on a private pool of at most
+    ``runner.max_in_flight`` threads. Dataset state advances only after a
+    window's files are on disk and only over the contiguous completed prefix, so
+    cancelling a run at any await point leaves ``--resume`` consistent.
+    """
+
+    def __init__(self, pro, runner: AsyncFetchRunner, store: DataStore) -> None:
+        self.pro = pro
+        self.runner = runner
+        self.store = store
+        # Plans windows and writes their files; its runner is never called.
+        self._steps = ListedCompanyFetcher(
+            pro, FetchRunner(rate_limiter=RateLimiter(min_interval=0)), store
+        )
+        self._executor: ThreadPoolExecutor | None = None
+
+    async def __aenter__(self) -> "AsyncListedCompanyFetcher":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        self.close()
+
+    def close(self) -> None:
+        """Drop the request pool; blocking calls still running have their frames discarded."""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+    async def _answer(self, call: ApiCall) -> pd.DataFrame:
+        method = getattr(self.pro, call.api)
+        kwargs = {**call.params, "fields": call.fields}
+
+        async def attempt():
+            if inspect.iscoroutinefunction(method):
+                return await method(**kwargs)
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.runner.max_in_flight, thread_name_prefix="tushare"
+                )
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(self._executor, partial(method, **kwargs))
+
+        df = await self.runner.call(call.label, attempt)
+        return pd.DataFrame() if df is None else df
+
+    async def _process_window(
+        self, spec: DatasetSpec, win: DateWindow, *, force: bool, threshold: int | None
+    ) -> FetchSummary:
+        summary = FetchSummary(dataset=spec.name)
+        steps = self._steps._process_steps(
+            spec,
+            win,
+            fields=resolve_fields(spec.name),
+            force=force,
+            threshold=threshold,
+            summary=summary,
+        )
+        answer = None
+        while True:
+            try:
+                call = steps.send(answer)
+            except StopIteration:
+                return summary
+            answer = await self._answer(call)
+
+    async def _run_windows(
+        self,
+        dataset: str,
+        windows: list[DateWindow],
+        process: Callable[[DateWindow], Awaitable[FetchSummary]],
+        *,
+        order: str,
+    ) -> FetchSummary:
+        summary = FetchSummary(dataset=dataset)
+        indices = list(range(len(windows)))
+        if order == ORDER_NEWEST_FIRST:
+            indices.reverse()
+        elif order != ORDER_OLDEST_FIRST:
+            raise ValueError(f"Unsupported order: {order}")
+        completed = [False] * len(windows)
+        pending: list[int] = []
+        frontier = 0
+
+        async def run_one(index: int) -> None:
+            nonlocal frontier
+            try:
+                part = await process(windows[index])
+            except BudgetExhausted:
+                pending.append(index)
+                return
+            # No awaits below: a window is either fully recorded or not at all.
+            _merge(summary, part)
+            completed[index] = True
+            advanced = frontier
+            while advanced < len(windows) and completed[advanced]:
+                advanced += 1
+            if advanced > frontier:
+                frontier = advanced
+                self.store.update_state(
+                    dataset, windows[frontier - 1].end, summary.rows, summary.windows
+                )
+
+        tasks = [asyncio.ensure_future(run_one(index)) for index in indices]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        summary.pending = [windows[index] for index in sorted(pending)]
+        if summary.pending:
+            print(f"{dataset}: request budget exhausted; {len(summary.pending)} window(s) pending.")
+        return summary
+
+    async def fetch_dataset(
+        self,
+        dataset: str,
+        start: date,
+        end: date,
+        *,
+        window: str | None = None,
+        resume: bool = False,
+        force: bool = False,
+        threshold: int | None = None,
+        order: str = ORDER_OLDEST_FIRST,
+    ) -> FetchSummary:
+        """Async counterpart of :meth:`ListedCompanyFetcher.fetch_dataset`."""
+        spec = get_spec(dataset)
+        self._steps._require_universe(spec)
+        if resume:
+            start = self.store.resume_start(dataset, start)
+        return await self._run_windows(
+            dataset,
+            spec.windows(start, end, window),
+            lambda win: self._process_window(spec, win, force=force, threshold=threshold),
+            order=order,
+        )
+
+    async def fetch_stk_managers(
+        self,
+        start: date,
+        end: date,
+        *,
+        window: str,
+        resume: bool,
+        force: bool,
+        order: str = ORDER_OLDEST_FIRST,
+    ) -> FetchSummary:
+        return await self.fetch_dataset(
+            DATASET_STK_MANAGERS, start, end, window=window, resume=resume, force=force, order=order
+        )
+
+    async def fetch_share_float(
+        self,
+        start: date,
+        end: date,
+        *,
+        window: str,
+        resume: bool,
+        force: bool,
+        threshold: int = DEFAULT_SHARE_FLOAT_THRESHOLD,
+        order: str = ORDER_OLDEST_FIRST,
+    ) -> FetchSummary:
+        return await self.fetch_dataset(
+            DATASET_SHARE_FLOAT,
+            start,
+            end,
+            window=window,
+            resume=resume,
+            force=force,
+            threshold=threshold,
+            order=order,
+        )
@@ -2,26 +2,82 @@
 
 from __future__ import annotations
 
+import heapq
+import itertools
+import threading
 import time
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Callable, TypeVar
 
+from .progress import ProgressTracker
+
 T = TypeVar("T")
 
 
 @dataclass
 class RateLimiter:
+    """Spacing limiter shared by every worker; higher priority waiters go first."""
+
     min_interval: float
     last_call: float = 0.0
+    _cond: threading.Condition = field(
+        default_factory=threading.Condition, init=False, repr=False, compare=False
+    )
+    _waiting: list[tuple[int, int]] = field(
+        default_factory=list, init=False, repr=False, compare=False
+    )
+    _seq: itertools.count = field(
+        default_factory=itertools.count, init=False, repr=False, compare=False
+    )
 
-    def wait(self) -> None:
+    def wait(self, priority: int = 0) -> None:
         if self.min_interval <= 0:
             return
-        now = time.monotonic()
-        elapsed = now - self.last_call
-        if elapsed < self.min_interval:
-            time.sleep(self.min_interval - elapsed)
-        self.last_call = time.monotonic()
+        with self._cond:
+            ticket = (-priority, next(self._seq))
+            heapq.heappush(self._waiting, ticket)
+            while True:
+                if self._waiting[0] != ticket:
+                    self._cond.wait()
+                    continue
+                now = time.monotonic()
+                delay = self.last_call + self.min_interval - now
+                if delay <= 0:
+                    heapq.heappop(self._waiting)
+                    self.last_call = now
+                    self._cond.notify_all()
+                    return
+                self._cond.wait(delay)
+
+
+class BudgetExhausted(RuntimeError):
+    """Raised before a request that would exceed the run's time or request budget."""
+
+
+@dataclass
+class RequestBudget:
+    """Per-run ceiling on wall time and/or request count, shared across workers."""
+
+    max_requests: int | None = None
+    time_budget: float | None = None
+    used: int = 0
+    started: float = field(default_factory=time.monotonic)
+    _lock: threading.Lock = field(
+        default_factory=threading.Lock, init=False, repr=False, compare=False
+    )
+
+    def exhausted(self) -> bool:
+        if self.max_requests is not None and self.used >= self.max_requests:
+            return True
+        if self.time_budget is not None:
+            return time.monotonic() - self.started >= self.time_budget
+        return False
+
+    def consume(self) -> None:
+        with self._lock:
+            if self.exhausted():
+                raise BudgetExhausted("request budget exhausted")
+            self.used += 1
 
 
 @dataclass
@@ -30,16 +86,25 @@ class FetchRunner:
     retries: int = 6
     base_delay: float = 2.0
     max_delay: float = 60.0
+    priority: int = 0
+    budget: RequestBudget | None = None
+    progress: ProgressTracker | None = None
 
     def call(self, label: str, fn: Callable[[], T]) -> T:
         for attempt in range(1, self.retries + 1):
+            if self.budget is not None:
+                self.budget.consume()
             try:
-                self.rate_limiter.wait()
+                self.rate_limiter.wait(self.priority)
+                if self.progress is not None:
+                    self.progress.request(label)
                 return fn()
             except Exception as exc:  # pylint: disable=broad-except
                 if attempt == self.retries:
                     raise
                 delay = min(self.base_delay * 2 ** (attempt - 1), self.max_delay)
+                if self.progress is not None:
+                    self.progress.backoff(label, delay, exc)
                 print(
                     f"{label} failed (attempt {attempt}/{self.retries}): {exc}. "
                     f"Retrying in {delay:.1f}s..."
@@ -0,0 +1,299 @@
+"""Coverage and integrity audit of raw windowed datasets, from file metadata only."""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import hashlib
+import json
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from datetime import date, timedelta
+from pathlib import Path
+
+from .constants import DATASET_SHARE_FLOAT, DEFAULT_SHARE_FLOAT_THRESHOLD, ROW_CAPS
+from .registry import DATASET_SPECS, POLICY_CODES
+from .storage import DataStore
+from .windowing import DateWindow, format_yyyymmdd, parse_yyyymmdd
+
+# Undated endpoints are as-of pulls, so gaps between their files mean nothing.
+WINDOWED_DATASETS = tuple(name for name, spec in DATASET_SPECS.items() if spec.dated)
+DEFAULT_AUDIT_WORKERS = 8
+
+
+@dataclass
+class FileFacts:
+    path: Path
+    size: int
+    mtime_ns: int
+    sha1: str = ""
+    rows: int | None = None
+    columns: tuple[str, ...] | None = None
+    error: str = ""
+
+
+@dataclass
+class AuditReport:
+    dataset: str
+    files: int = 0
+    covered: tuple[str, str] | None = None
+    gaps: list[tuple[str, str]] = field(default_factory=list)
+    overlaps: list[str] = field(default_factory=list)
+    empty: list[str] = field(default_factory=list)
+    truncated: list[str] = field(default_factory=list)
+    schema_drift: list[str] = field(default_factory=list)
+    checksum_mismatch: list[str] = field(default_factory=list)
+    unreadable: list[str] = field(default_factory=list)
+    refetch: list[tuple[str, str]] = field(default_factory=list)
+
+
+def _scan_csv(facts: FileFacts) -> None:
+    """Hash the file and count its lines in one streaming pass; no CSV parse."""
+    digest = hashlib.sha1()
+    newlines = 0
+    header = b""
+    with facts.path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            if not header:
+                header = chunk.split(b"\n", 1)[0]
+            digest.update(chunk)
+            newlines += chunk.count(b"\n")
+    facts.sha1 = digest.hexdigest()
+    facts.rows = max(newlines - 1, 0)
+    line = header.decode("utf-8-sig").strip()
+    # Only the header goes through the csv module, so quoted names come back bare.
+    facts.columns = tuple(next(csv.reader([line]), [])) if line else ()
+
+
+def _scan_columnar(facts: FileFacts, file_format: str) -> None:
+    digest = hashlib.sha1()
+    with facts.path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    facts.sha1 = digest.hexdigest()
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        metadata = pq.ParquetFile(facts.path).metadata
+        facts.rows = metadata.num_rows
+        facts.columns = tuple(metadata.schema.to_arrow_schema().names)
+    else:
+        import pyarrow as pa
+
+        with pa.memory_map(str(facts.path)) as source:
+            reader = pa.ipc.open_file(source)
+            facts.columns = tuple(reader.schema.names)
+            facts.rows = sum(
+                reader.get_batch(index).num_rows for index in range(reader.num_record_batches)
+            )
+
+
+def scan_file(path: Path, file_format: str) -> FileFacts:
+    stat = path.stat()
+    facts = FileFacts(path=path, size=stat.st_size, mtime_ns=stat.st_mtime_ns)
+    try:
+        if file_format == "csv":
+            _scan_csv(facts)
+        else:
+            _scan_columnar(facts, file_format)
+    except Exception as exc:  # noqa: BLE001 - any failure means the file needs a refetch
+        facts.error = f"{type(exc).__name__}: {exc}"
+    return facts
+
+
+def checksums_path(store: DataStore, dataset: str) -> Path:
+    return store.state_dir() / "checksums" / f"{dataset}.json"
+
+
+def _merge_ranges(windows: list[DateWindow]) -> list[DateWindow]:
+    merged: list[DateWindow] = []
+    for win in sorted(windows, key=lambda item: (item.start, item.end)):
+        if merged and win.start <= merged[-1].end + timedelta(days=1):
+            if win.end > merged[-1].end:
+                merged[-1] = DateWindow(start=merged[-1].start, end=win.end)
+        else:
+            merged.append(win)
+    return merged
+
+
+def _span(win: DateWindow) -> tuple[str, str]:
+    return format_yyyymmdd(win.start), format_yyyymmdd(win.end)
+
+
+def audit_dataset(
+    store: DataStore,
+    dataset: str,
+    *,
+    start: date | None = None,
+    end: date | None = None,
+    threshold: int | None = None,
+    workers: int = DEFAULT_AUDIT_WORKERS,
+    update_checksums: bool = True,
+) -> AuditReport:
+    """Audit ``raw/<dataset>`` window files.
+
+    A multi-day window at or above ``threshold`` rows is reported as truncated; a
+    single-day window only when it sits exactly at the cap, since day windows
+    past the cap are the merged result of a ts_code split.
+    """
+    report = AuditReport(dataset=dataset)
+    threshold = threshold or ROW_CAPS.get(dataset, DEFAULT_SHARE_FLOAT_THRESHOLD)
+    # ts_code fan-out windows merge many capped requests, so row counts prove nothing.
+    check_truncation = DATASET_SPECS[dataset].policy != POLICY_CODES
+    windows: dict[Path, DateWindow] = {}
+    for path in store.iter_raw_files(dataset):
+        win = store.parse_raw_window(dataset, path)
+        if win is not None:
+            windows[path] = win
+    report.files = len(windows)
+
+    with ThreadPoolExecutor(max_workers=max(workers, 1)) as pool:
+        facts = list(pool.map(lambda path: scan_file(path, store.file_format), windows))
+
+    recorded_path = checksums_path(store, dataset)
+    recorded = (
+        json.loads(recorded_path.read_text(encoding="utf-8")) if recorded_path.exists() else {}
+    )
+    refetch: list[DateWindow] = []
+    schemas = Counter(item.columns for item in facts if not item.error and item.rows)
+    expected = schemas.most_common(1)[0][0] if schemas else None
+    for item in facts:
+        win = windows[item.path]
+        name = item.path.name
+        if item.error:
+            report.unreadable.append(name)
+            refetch.append(win)
+            continue
+        previous = recorded.get(name)
+        if (
+            previous
+            and previous["size"] == item.size
+            and previous["mtime_ns"] == item.mtime_ns
+            and previous["sha1"] != item.sha1
+        ):
+            report.checksum_mismatch.append(name)
+            refetch.append(win)
+        if item.rows == 0:
+            report.empty.append(name)
+        elif expected is not None and item.columns != expected:
+            report.schema_drift.append(name)
+        multi_day = win.start < win.end
+        if not check_truncation:
+            continue
+        if (multi_day and item.rows >= threshold) or (not multi_day and item.rows == threshold):
+            report.truncated.append(name)
+            refetch.append(win)
+
+    ordered = sorted(windows.values(), key=lambda win: (win.start, win.end))
+    reach: DateWindow | None = None
+    for win in ordered:
+        if reach is not None and win.start <= reach.end:
+            report.overlaps.append("{}-{} / {}-{}".format(*_span(reach), *_span(win)))
+        if reach is None or win.end > reach.end:
+            reach = win
+
+    covered = _merge_ranges(ordered)
+    if covered:
+        report.covered = (_span(covered[0])[0], _span(covered[-1])[1])
+    state = store.load_state(dataset)
+    ends = [covered[-1].end] if covered else []
+    if state and state.last_end_date:
+        ends.append(parse_yyyymmdd(state.last_end_date))
+    low = start or (covered[0].start if covered else None)
+    high = end or (max(ends) if ends else None)
+    if low is not None and high is not None:
+        cursor = low
+        for win in covered:
+            if win.end < cursor:
+                continue
+            if win.start > high:
+                break
+            if win.start > cursor:
+                gap = DateWindow(start=cursor, end=min(win.start - timedelta(days=1), high))
+                report.gaps.append(_span(gap))
+                refetch.append(gap)
+            cursor = max(cursor, win.end + timedelta(days=1))
+        if cursor <= high:
+            gap = DateWindow(start=cursor, end=high)
+            report.gaps.append(_span(gap))
+            refetch.append(gap)
+
+    report.refetch = [_span(win) for win in _merge_ranges(refetch)]
+    if update_checksums:
+        current = {
+            item.path.name: {"size": item.size, "mtime_ns": item.mtime_ns, "sha1": item.sha1}
+            for item in facts
+            if not item.error and item.path.name not in report.checksum_mismatch
+        }
+        recorded_path.parent.mkdir(parents=True, exist_ok=True)
+        recorded_path.write_text(json.dumps(current, indent=2), encoding="utf-8")
+    return report
+
+
+def format_report(report: AuditReport) -> str:
+    lines = [f"{report.dataset}: files={report.files} covered={report.covered or '-'}"]
+    for label, values in (
+        ("gaps", report.gaps),
+        ("overlaps", report.overlaps),
+        ("empty windows", report.empty),
+        ("suspected truncation", report.truncated),
+        ("schema drift", report.schema_drift),
+        ("checksum mismatch", report.checksum_mismatch),
+        ("unreadable", report.unreadable),
+    ):
+        if values:
+            shown = ", ".join(
+                "->".join(value) if isinstance(value, tuple) else value for value in values[:10]
+            )
+            more = f" (+{len(values) - 10} more)" if len(values) > 10 else ""
+            lines.append(f"  {label}: {len(values)}: {shown}{more}")
+    return "\n".join(lines)
+
+
+def audit_main(argv: list[str], default_output_dir: str = "data") -> None:
+    parser = argparse.ArgumentParser(
+        prog="tushare-listed-fetch audit",
+        description="Audit raw window files for coverage and integrity without full parses",
+    )
+    parser.add_argument("--output-dir", default=default_output_dir, help="Base output directory")
+    parser.add_argument("--format", choices=["csv", "parquet", "ipc"], default="csv")
+    parser.add_argument(
+        "--datasets",
+        default=",".join(WINDOWED_DATASETS),
+        help="Comma-separated windowed datasets to audit",
+    )
+    parser.add_argument("--start-date", default="", help="Expected coverage start YYYYMMDD")
+    parser.add_argument("--end-date", default="", help="Expected coverage end YYYYMMDD")
+    parser.add_argument(
+        "--share-float-threshold",
+        type=int,
+        default=DEFAULT_SHARE_FLOAT_THRESHOLD,
+        help="Row count treated as the share_float response cap",
+    )
+    parser.add_argument("--workers", type=int, default=DEFAULT_AUDIT_WORKERS)
+    parser.add_argument("--json", default="", help="Also write the full report to this file")
+    args = parser.parse_args(argv)
+
+    store = DataStore(base_dir=Path(args.output_dir), file_format=args.format)
+    start = parse_yyyymmdd(args.start_date) if args.start_date else None
+    end = parse_yyyymmdd(args.end_date) if args.end_date else None
+    reports = []
+    for dataset in [item.strip() for item in args.datasets.split(",") if item.strip()]:
+        if dataset not in WINDOWED_DATASETS:
+            raise SystemExit(f"audit supports windowed datasets only: {dataset}")
+        threshold = args.share_float_threshold if dataset == DATASET_SHARE_FLOAT else None
+        report = audit_dataset(
+            store, dataset, start=start, end=end, threshold=threshold, workers=args.workers
+        )
+        reports.append(report)
+        print(format_report(report))
+
+    print("\nRefetch windows:")
+    for report in reports:
+        for first, last in report.refetch:
+            print(f"{report.dataset} {first} {last}")
+    if args.json:
+        Path(args.json).write_text(
+            json.dumps([asdict(report) for report in reports], indent=2), encoding="utf-8"
+        )
@@ -0,0 +1,77 @@
+"""ts_code batching helpers for requests that cannot be narrowed by date alone."""
+
+from __future__ import annotations
+
+from typing import Sequence
+
+from .constants import DATASET_STOCK_BASIC
+from .storage import DataStore
+
+# Keeps the comma-joined ts_code parameter to a modest request size.
+MAX_CODES_PER_REQUEST = 1000
+
+
+def split_evenly(codes: Sequence[str], parts: int) -> list[list[str]]:
+    parts = max(1, min(parts, len(codes)))
+    size, extra = divmod(len(codes), parts)
+    batches: list[list[str]] = []
+    cursor = 0
+    for index in range(parts):
+        step = size + (1 if index < extra else 0)
+        batches.append(list(codes[cursor : cursor + step]))
+        cursor += step
+    return batches
+
+
+def load_universe(store: DataStore) -> list[str]:
+    """Sorted ts_codes from the curated ``stock_basic`` snapshot, or [] when absent."""
+    path = store.curated_path(DATASET_STOCK_BASIC)
+    if not path.exists():
+        return []
+    frame = store.read_frame(path)
+    if "ts_code" not in frame.columns:
+        return []
+    return sorted({str(code) for code in frame["ts_code"].dropna()})
+
+
+def rows_per_code(store: DataStore, dataset: str) -> dict[str, int]:
+    """Historical row count per ts_code in the curated output of ``dataset``."""
+    path = store.curated_path(dataset)
+    if not path.exists():
+        return {}
+    frame = store.read_frame(path)
+    if "ts_code" not in frame.columns:
+        return {}
+    return {str(code): int(count) for code, count in frame["ts_code"].value_counts().items()}
+
+
+def pack_code_batches(
+    codes: Sequence[str],
+    estimates: dict[str, int],
+    row_cap: int,
+    *,
+    headroom: float = 0.8,
+    max_codes: int = MAX_CODES_PER_REQUEST,
+) -> list[list[str]]:
+    """Greedily pack codes so each batch's expected rows stay under ``row_cap * headroom``.
+
+    Codes without history are assumed to look like the median known stock.
+    """
+    if not codes:
+        return []
+    known = sorted(estimates.values())
+    fallback = known[len(known) // 2] if known else 1
+    budget = max(row_cap * headroom, 1.0)
+    batches: list[list[str]] = []
+    current: list[str] = []
+    current_rows = 0.0
+    for code in codes:
+        rows = max(estimates.get(code, fallback), 1)
+        if current and (current_rows + rows > budget or len(current) >= max_codes):
+            batches.append(current)
+            current, current_rows = [], 0.0
+        current.append(code)
+        current_rows += rows
+    batches.append(current)
+    return batches
+
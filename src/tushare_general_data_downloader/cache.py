@@ -0,0 +1,111 @@
+"""Memory-bounded LRU cache for frames read through ``DataStore``."""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+CacheKey = tuple[str, str, "tuple[str, ...] | None", bool]
+FileVersion = tuple[int, int]
+
+
+@dataclass
+class _Entry:
+    version: FileVersion
+    frame: pd.DataFrame
+    nbytes: int
+
+
+def file_version(path: Path) -> FileVersion:
+    stat = path.stat()
+    return stat.st_mtime_ns, stat.st_size
+
+
+class FrameCache:
+    """LRU over ``(path, format, columns, text)`` limited to ``max_bytes`` of frame memory.
+
+    Entries carry the file's ``(mtime_ns, size)`` and are dropped when it no longer
+    matches, so a rewritten file is never served stale. A projected read is also
+    answered from a cached full read of the same file. Callers get a shallow
+    copy: adding or replacing columns is safe, mutating values in place is not.
+    """
+
+    def __init__(self, max_bytes: int) -> None:
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self._entries: OrderedDict[CacheKey, _Entry] = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(
+        self, path: Path, file_format: str, columns: list[str] | None, text: bool
+    ) -> pd.DataFrame | None:
+        try:
+            version = file_version(path)
+        except FileNotFoundError:
+            self.discard(path)
+            return None
+        projection = tuple(columns) if columns is not None else None
+        with self._lock:
+            for key in dict.fromkeys(
+                [(str(path), file_format, projection, text), (str(path), file_format, None, text)]
+            ):
+                entry = self._entries.get(key)
+                if entry is None:
+                    continue
+                if entry.version != version:
+                    self._drop(key)
+                    continue
+                if key[2] is None and projection is not None:
+                    if not set(projection) <= set(entry.frame.columns):
+                        continue
+                    frame = entry.frame[list(projection)]
+                else:
+                    frame = entry.frame
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return frame.copy(deep=False)
+            self.misses += 1
+        return None
+
+    def put(
+        self,
+        path: Path,
+        file_format: str,
+        columns: list[str] | None,
+        text: bool,
+        frame: pd.DataFrame,
+        version: FileVersion,
+    ) -> None:
+        nbytes = int(frame.memory_usage(index=True, deep=True).sum())
+        if nbytes > self.max_bytes:
+            return
+        key = (str(path), file_format, tuple(columns) if columns is not None else None, text)
+        with self._lock:
+            if key in self._entries:
+                self._drop(key)
+            self._entries[key] = _Entry(version=version, frame=frame, nbytes=nbytes)
+            self.bytes += nbytes
+            while self.bytes > self.max_bytes:
+                self._drop(next(iter(self._entries)))
+
+    def discard(self, path: Path) -> None:
+        with self._lock:
+            for key in [key for key in self._entries if key[0] == str(path)]:
+                self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _drop(self, key: CacheKey) -> None:
+        self.bytes -= self._entries.pop(key).nbytes
@@ -4,26 +4,63 @@ from __future__ import annotations
 
 import argparse
 import os
+import sys
+from contextlib import nullcontext
+from datetime import date
 from pathlib import Path
 
 import tushare as ts
 
-from .api import FetchRunner, RateLimiter
+from .api import FetchRunner, RateLimiter, RequestBudget
+from .audit import audit_main
+from .batching import load_universe
+from .client import DEFAULT_API_URL, PooledProClient
 from .constants import (
     ALL_DATASETS,
     DATASET_SHARE_FLOAT,
     DATASET_STK_MANAGERS,
+    DATASET_STOCK_BASIC,
+    DATASET_STOCK_COMPANY,
     DEDUP_KEYS,
     DEFAULT_EXCHANGES,
     DEFAULT_MANAGERS_WINDOW,
+    DEFAULT_DIMENSION_INTERVAL,
+    DEFAULT_PRIORITIES,
     DEFAULT_SHARE_FLOAT_THRESHOLD,
     DEFAULT_SHARE_FLOAT_WINDOW,
+    DEFAULT_WATCH_LOOKBACK_DAYS,
+    DEFAULT_WATCH_TIMES,
     DEFAULT_YEARS,
+    EXTRA_DATASETS,
+    ORDER_OLDEST_FIRST,
+    WINDOW_ORDERS,
+)
+from .distributed import (
+    DEFAULT_LEASE_SECONDS,
+    WindowTask,
+    WorkQueue,
+    default_worker_id,
+    run_worker,
 )
 from .env import load_local_env
 from .fetchers import ListedCompanyFetcher
+from .planner import format_duration, format_plan, plan_snapshot, plan_windowed
+from .progress import DEFAULT_STATUS_INTERVAL, ProgressTracker
+from .registry import WINDOWED_DATASETS, get_spec
+from .master import refresh_security_master
+from .memory import MemoryMonitor, parse_size
+from .scheduler import DatasetJob, run_jobs
+from .sqlexport import SQL_ENGINES
 from .storage import DataStore
-from .windowing import format_yyyymmdd, resolve_date_range
+from .watch import WatchConfig, WatchLoop
+from .windowing import (
+    format_yyyymmdd,
+    iter_windows,
+    parse_hhmm,
+    parse_yyyymmdd,
+    resolve_date_range,
+    today_bjt,
+)
 
 PROJECT_ROOT = Path(__file__).resolve().parents[2]
 
@@ -36,38 +73,211 @@ def _parse_datasets(raw: str | None) -> list[str]:
     if not raw:
         return list(ALL_DATASETS)
     datasets = _parse_csv_list(raw)
-    invalid = sorted(set(datasets) - set(ALL_DATASETS))
+    invalid = sorted(set(datasets) - set(ALL_DATASETS) - set(EXTRA_DATASETS))
     if invalid:
         raise SystemExit(f"Unsupported dataset(s): {', '.join(invalid)}")
     return datasets
 
 
+def _parse_ts_codes(args: argparse.Namespace, store: DataStore) -> list[str]:
+    codes: list[str] = []
+    if args.ts_codes:
+        codes.extend(_parse_csv_list(args.ts_codes))
+    if args.ts_codes_file:
+        text = Path(args.ts_codes_file).read_text(encoding="utf-8")
+        codes.extend(_parse_csv_list(text.replace("\n", ",")))
+    if codes == ["all"]:
+        codes = load_universe(store)
+        if not codes:
+            raise SystemExit("--ts-codes all needs curated stock_basic; fetch it first")
+    return codes
+
+
 def _parse_exchanges(raw: str | None) -> tuple[str, ...]:
     if not raw:
         return DEFAULT_EXCHANGES
     return tuple(_parse_csv_list(raw))
 
 
+def _parse_priorities(raw: str | None) -> dict[str, int]:
+    priorities = dict(DEFAULT_PRIORITIES)
+    if not raw:
+        return priorities
+    for item in _parse_csv_list(raw):
+        name, sep, value = item.partition("=")
+        name = name.strip()
+        if not sep or name not in priorities:
+            raise SystemExit(f"Invalid priority entry: {item} (expected dataset=int)")
+        try:
+            priorities[name] = int(value)
+        except ValueError as exc:
+            raise SystemExit(f"Invalid priority entry: {item} (expected dataset=int)") from exc
+    return priorities
+
+
+def _parse_duration(raw: str | None) -> float | None:
+    if not raw:
+        return None
+    value = raw.strip().lower()
+    units = {"s": 1.0, "m": 60.0, "h": 3600.0}
+    scale = units.get(value[-1:], None)
+    number = value[:-1] if scale else value
+    try:
+        return float(number) * (scale or 1.0)
+    except ValueError as exc:
+        raise SystemExit(f"Invalid duration: {raw} (examples: 900, 45m, 2h)") from exc
+
+
 def init_tushare(token: str) -> ts.pro_api:
     ts.set_token(token)
     return ts.pro_api()
 
 
+def init_client(args: argparse.Namespace, token: str):
+    if args.client == "pooled":
+        return PooledProClient(
+            token,
+            url=args.api_url,
+            timeout=args.http_timeout,
+            connect_timeout=args.connect_timeout,
+            pool_size=args.pool_size,
+            columnar=args.columnar,
+        )
+    if args.columnar:
+        raise SystemExit("--columnar requires --client pooled")
+    return init_tushare(token)
+
+
 def _save_consolidated(store: DataStore, dataset: str) -> tuple[int, Path | None]:
-    df = store.consolidate(dataset, DEDUP_KEYS.get(dataset, []))
-    if df.empty:
-        return 0, None
-    path = store.save_curated(dataset, df)
-    return len(df), path
+    with _stage(store, f"consolidate {dataset}"):
+        return store.save_consolidated(dataset, DEDUP_KEYS.get(dataset, []))
+
+
+def _stage(store: DataStore, name: str):
+    return store.memory.stage(name) if store.memory else nullcontext()
+
+
+def _resolve_rpm(cli_rpm: float | None) -> float:
+    if cli_rpm is not None:
+        return cli_rpm
+    rpm_env = os.getenv("TUSHARE_RPM", "").strip()
+    if rpm_env:
+        try:
+            return float(rpm_env)
+        except ValueError:
+            return 200.0
+    return 200.0
+
+
+def _print_plan(
+    args: argparse.Namespace,
+    store: DataStore,
+    datasets: list[str],
+    exchanges: tuple[str, ...],
+    start_dt: date | None,
+    end_dt: date | None,
+    rpm: float,
+    min_interval: float,
+) -> None:
+    plans = []
+    if "stock_basic" in datasets:
+        plans.append(plan_snapshot(store, "stock_basic", 1))
+    if "stock_company" in datasets:
+        plans.append(plan_snapshot(store, "stock_company", len(exchanges)))
+    if DATASET_STK_MANAGERS in datasets and start_dt and end_dt:
+        plans.append(
+            plan_windowed(
+                store,
+                DATASET_STK_MANAGERS,
+                start_dt,
+                end_dt,
+                window=args.managers_window,
+                resume=args.resume,
+                force=args.force,
+            )
+        )
+    if DATASET_SHARE_FLOAT in datasets and start_dt and end_dt:
+        plans.append(
+            plan_windowed(
+                store,
+                DATASET_SHARE_FLOAT,
+                start_dt,
+                end_dt,
+                window=args.share_float_window,
+                resume=args.resume,
+                force=args.force,
+                threshold=args.share_float_threshold,
+            )
+        )
+    for dataset in EXTRA_DATASETS:
+        if dataset in datasets and start_dt and end_dt:
+            spec = get_spec(dataset)
+            plans.append(
+                plan_windowed(
+                    store,
+                    dataset,
+                    start_dt,
+                    end_dt,
+                    window=spec.window,
+                    resume=args.resume,
+                    force=args.force,
+                    threshold=spec.row_cap,
+                )
+            )
+
+    print(f"Fetch plan (rpm={rpm:g}, no API calls made):")
+    for plan in plans:
+        print(format_plan(plan, min_interval))
+    total_requests = sum(plan.requests for plan in plans)
+    print(
+        f"Total: requests={total_requests} "
+        f"eta={format_duration(total_requests * min_interval)}"
+    )
+    if start_dt and end_dt:
+        print(
+            f"Event date range: {format_yyyymmdd(start_dt)} -> {format_yyyymmdd(end_dt)}"
+        )
+
+
+def _publish_tasks(
+    args: argparse.Namespace,
+    store: DataStore,
+    queue: WorkQueue,
+    datasets: list[str],
+    start_dt: date | None,
+    end_dt: date | None,
+) -> None:
+    if not (start_dt and end_dt):
+        raise SystemExit("--publish needs stk_managers and/or share_float in --datasets")
+    for dataset, window in (
+        (DATASET_STK_MANAGERS, args.managers_window),
+        (DATASET_SHARE_FLOAT, args.share_float_window),
+    ):
+        if dataset not in datasets:
+            continue
+        start = store.resume_start(dataset, start_dt) if args.resume else start_dt
+        tasks = [
+            WindowTask(dataset=dataset, start=win.start, end=win.end, force=args.force)
+            for win in iter_windows(window, start, end_dt)
+            if args.force or not store.raw_window_path(dataset, win.start, win.end).exists()
+        ]
+        added = queue.publish(tasks)
+        print(f"- {dataset}: published {added} new task(s) of {len(tasks)} pending window(s)")
+    print(f"Queue status: {queue.status()}")
 
 
 def main(argv: list[str] | None = None) -> None:
+    argv = sys.argv[1:] if argv is None else argv
+    if argv and argv[0] == "audit":
+        audit_main(argv[1:], default_output_dir=str(PROJECT_ROOT / "data"))
+        return
     parser = argparse.ArgumentParser(description="Fetch TuShare listed-company datasets")
     parser.add_argument("--token", default="", help="TuShare token (or set TUSHARE_TOKEN)")
     parser.add_argument(
         "--datasets",
         default=None,
-        help=f"Comma-separated datasets (default: {', '.join(ALL_DATASETS)})",
+        help=f"Comma-separated datasets (default: {', '.join(ALL_DATASETS)}; "
+        f"also available: {', '.join(EXTRA_DATASETS)})",
     )
     parser.add_argument(
         "--output-dir",
@@ -76,10 +286,15 @@ def main(argv: list[str] | None = None) -> None:
     )
     parser.add_argument(
         "--format",
-        choices=["csv", "parquet"],
+        choices=["csv", "parquet", "ipc"],
         default="csv",
         help="Output file format",
     )
+    parser.add_argument(
+        "--intern-text",
+        action="store_true",
+        help="CSV only: store long text columns once in strings/<dataset>.csv and write refs",
+    )
     parser.add_argument(
         "--list-status",
         default="",
@@ -137,6 +352,155 @@ def main(argv: list[str] | None = None) -> None:
         default=None,
         help="Max requests per minute (default: env TUSHARE_RPM or 200)",
     )
+    parser.add_argument(
+        "--concurrent",
+        action="store_true",
+        help="Run selected datasets concurrently under the shared --rpm budget",
+    )
+    parser.add_argument(
+        "--priorities",
+        default=None,
+        help="Comma-separated dataset=int rate priorities, higher first "
+        "(default: dimension tables 20, stk_managers 10, share_float 0)",
+    )
+    parser.add_argument(
+        "--order",
+        choices=WINDOW_ORDERS,
+        default=ORDER_OLDEST_FIRST,
+        help="Window processing order for event tables",
+    )
+    parser.add_argument(
+        "--time-budget",
+        default=None,
+        help="Stop issuing requests after this long (seconds, or e.g. 45m, 2h)",
+    )
+    parser.add_argument(
+        "--max-requests",
+        type=int,
+        default=None,
+        help="Stop after this many API requests (retries included)",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="Keep running and refresh incrementally on a Beijing-time schedule",
+    )
+    parser.add_argument(
+        "--watch-times",
+        default=DEFAULT_WATCH_TIMES,
+        help=f"Comma-separated HH:MM Beijing-time poll slots (default: {DEFAULT_WATCH_TIMES})",
+    )
+    parser.add_argument(
+        "--watch-lookback-days",
+        type=int,
+        default=DEFAULT_WATCH_LOOKBACK_DAYS,
+        help="Trailing day windows force-refreshed every watch cycle",
+    )
+    parser.add_argument(
+        "--dimension-interval",
+        default=DEFAULT_DIMENSION_INTERVAL,
+        help="Minimum time between stock_basic/stock_company refreshes in watch mode",
+    )
+    parser.add_argument(
+        "--distributed",
+        default=None,
+        help="Shared work directory for multi-host backfills (run as a worker)",
+    )
+    parser.add_argument(
+        "--publish",
+        action="store_true",
+        help="With --distributed: publish pending event windows as tasks and exit",
+    )
+    parser.add_argument(
+        "--worker-id",
+        default=None,
+        help="With --distributed: worker name recorded in leases (default: host-pid)",
+    )
+    parser.add_argument(
+        "--lease-seconds",
+        type=float,
+        default=DEFAULT_LEASE_SECONDS,
+        help="With --distributed: lease expiry before a crashed worker's task is reclaimed",
+    )
+    parser.add_argument(
+        "--client",
+        choices=["tushare", "pooled"],
+        default="tushare",
+        help="API client: the tushare library, or a keep-alive pooled HTTP client",
+    )
+    parser.add_argument(
+        "--api-url", default=DEFAULT_API_URL, help="API endpoint for --client pooled"
+    )
+    parser.add_argument(
+        "--http-timeout", type=float, default=30.0, help="Read timeout for --client pooled"
+    )
+    parser.add_argument(
+        "--connect-timeout",
+        type=float,
+        default=10.0,
+        help="Connect timeout for --client pooled",
+    )
+    parser.add_argument(
+        "--pool-size", type=int, default=8, help="Keep-alive connections for --client pooled"
+    )
+    parser.add_argument(
+        "--status-file",
+        default="",
+        help="Periodically rewrite this JSON file with per-dataset progress, rows/s, RPM and ETA",
+    )
+    parser.add_argument(
+        "--status-interval",
+        type=float,
+        default=DEFAULT_STATUS_INTERVAL,
+        help="Seconds between progress redraws and --status-file updates",
+    )
+    parser.add_argument(
+        "--no-progress",
+        action="store_true",
+        help="Disable the live progress line shown when stderr is a terminal",
+    )
+    parser.add_argument(
+        "--memory-limit",
+        default="",
+        help="Memory budget such as 2G; consolidation spills to disk to stay within it",
+    )
+    parser.add_argument(
+        "--publish-ipc",
+        action="store_true",
+        help="Also publish curated datasets as versioned, mmap-able Arrow IPC (needs pyarrow)",
+    )
+    parser.add_argument(
+        "--export-sql",
+        default="",
+        help="Upsert curated datasets into this SQLite file (.duckdb uses DuckDB if installed)",
+    )
+    parser.add_argument(
+        "--sql-engine",
+        choices=SQL_ENGINES,
+        default="auto",
+        help="Engine for --export-sql",
+    )
+    parser.add_argument(
+        "--columnar",
+        action="store_true",
+        help="With --client pooled: decode responses straight into Arrow (needs pyarrow)",
+    )
+    parser.add_argument(
+        "--ts-codes",
+        default=None,
+        help="Targeted refresh of event tables for these ts_codes (comma-separated, "
+        "or 'all' for the curated stock_basic universe), batched by row cap",
+    )
+    parser.add_argument(
+        "--ts-codes-file",
+        default=None,
+        help="File with ts_codes (comma- or newline-separated) for a targeted refresh",
+    )
+    parser.add_argument(
+        "--plan",
+        action="store_true",
+        help="Print request counts, expected rows and ETA without calling the API",
+    )
     parser.add_argument("--retries", type=int, default=6, help="Retry attempts")
     parser.add_argument(
         "--base-delay", type=float, default=2.0, help="Retry base delay in seconds"
@@ -148,14 +512,11 @@ def main(argv: list[str] | None = None) -> None:
     args = parser.parse_args(argv)
 
     load_local_env()
-    token = args.token.strip() or os.getenv("TUSHARE_TOKEN", "").strip()
-    if not token:
-        raise SystemExit("Missing TuShare token. Provide --token or set TUSHARE_TOKEN.")
 
     datasets = _parse_datasets(args.datasets)
     exchanges = _parse_exchanges(args.exchanges)
 
-    needs_event_range = DATASET_STK_MANAGERS in datasets or DATASET_SHARE_FLOAT in datasets
+    needs_event_range = bool(set(WINDOWED_DATASETS) & set(datasets))
     if needs_event_range:
         start_dt, end_dt = resolve_date_range(
             args.start_date, args.end_date, args.years, default_years=DEFAULT_YEARS
@@ -163,80 +524,241 @@ def main(argv: list[str] | None = None) -> None:
     else:
         start_dt = end_dt = None
 
-    rpm_env = os.getenv("TUSHARE_RPM", "").strip()
-    if args.rpm is not None:
-        rpm = args.rpm
-    elif rpm_env:
-        try:
-            rpm = float(rpm_env)
-        except ValueError:
-            rpm = 200.0
-    else:
-        rpm = 200.0
+    rpm = _resolve_rpm(args.rpm)
     min_interval = 60.0 / rpm if rpm > 0 else 0.0
 
-    store = DataStore(base_dir=Path(args.output_dir), file_format=args.format)
+    store = DataStore(
+        base_dir=Path(args.output_dir),
+        file_format=args.format,
+        intern_text=args.intern_text,
+        publish_ipc=args.publish_ipc,
+        memory=MemoryMonitor(parse_size(args.memory_limit)) if args.memory_limit else None,
+    )
+    if args.plan:
+        _print_plan(args, store, datasets, exchanges, start_dt, end_dt, rpm, min_interval)
+        return
+    for leftover in store.recover():
+        print(f"Recovered interrupted write: removed {leftover}")
+    queue = None
+    if args.distributed:
+        queue = WorkQueue(Path(args.distributed), lease_seconds=args.lease_seconds)
+        if args.publish:
+            _publish_tasks(args, store, queue, datasets, start_dt, end_dt)
+            return
+
+    token = args.token.strip() or os.getenv("TUSHARE_TOKEN", "").strip()
+    if not token:
+        raise SystemExit("Missing TuShare token. Provide --token or set TUSHARE_TOKEN.")
+
     runner = FetchRunner(
         rate_limiter=RateLimiter(min_interval=min_interval),
         retries=args.retries,
         base_delay=args.base_delay,
         max_delay=args.max_delay,
+        progress=ProgressTracker(
+            rpm=rpm,
+            status_file=Path(args.status_file) if args.status_file else None,
+            interval=args.status_interval,
+            display=False if args.no_progress else None,
+        ).start(),
     )
-    fetcher = ListedCompanyFetcher(init_tushare(token), runner, store)
+    if args.time_budget or args.max_requests is not None:
+        runner.budget = RequestBudget(
+            max_requests=args.max_requests,
+            time_budget=_parse_duration(args.time_budget),
+        )
+    fetcher = ListedCompanyFetcher(init_client(args, token), runner, store)
+
+    if queue is not None:
+        worker_id = args.worker_id or default_worker_id()
+        try:
+            done = run_worker(
+                fetcher, queue, worker_id=worker_id, threshold=args.share_float_threshold
+            )
+        finally:
+            runner.progress.stop()
+        status = queue.status()
+        print(
+            f"\nWorker {worker_id} finished {len(done)} task(s), "
+            f"rows={sum(summary.rows for summary in done)}; queue status: {status}"
+        )
+        if args.consolidate and status["done"] == status["tasks"]:
+            for dataset in WINDOWED_DATASETS:
+                if dataset in datasets:
+                    rows, path = _save_consolidated(store, dataset)
+                    if path:
+                        print(f"- consolidated {dataset}: rows={rows} path={path}")
+        return
+
+    if args.ts_codes or args.ts_codes_file:
+        codes = _parse_ts_codes(args, store)
+        code_start = parse_yyyymmdd(args.start_date) if args.start_date else None
+        code_end = parse_yyyymmdd(args.end_date) if args.end_date else None
+        try:
+            summaries = [
+                fetcher.fetch_by_codes(dataset, codes, start=code_start, end=code_end)
+                for dataset in WINDOWED_DATASETS
+                if dataset in datasets
+            ]
+        finally:
+            runner.progress.stop()
+        for summary in summaries:
+            if args.consolidate:
+                store.merge_into_curated(
+                    summary.dataset, DEDUP_KEYS.get(summary.dataset, []), summary.paths
+                )
+            print(f"- {summary.dataset}: requests={summary.windows} rows={summary.rows}")
+        return
+
+    if args.watch:
+        try:
+            times = [parse_hhmm(item) for item in _parse_csv_list(args.watch_times)]
+        except ValueError as exc:
+            raise SystemExit(f"Invalid --watch-times: {args.watch_times}") from exc
+        if not times:
+            raise SystemExit("--watch-times must list at least one HH:MM slot")
+        config = WatchConfig(
+            datasets=datasets,
+            start=start_dt or today_bjt(),
+            times=times,
+            lookback_days=args.watch_lookback_days,
+            dimension_interval=_parse_duration(args.dimension_interval) or 0.0,
+            managers_window=args.managers_window,
+            share_float_window=args.share_float_window,
+            threshold=args.share_float_threshold,
+            list_status=args.list_status,
+            exchanges=exchanges,
+        )
+        try:
+            WatchLoop(fetcher, config).run()
+        except KeyboardInterrupt:
+            print("\nWatch stopped.")
+        finally:
+            runner.progress.stop()
+        return
 
-    summaries = []
+    priorities = _parse_priorities(args.priorities)
+    jobs: list[DatasetJob] = []
 
     if "stock_basic" in datasets:
-        summaries.append(fetcher.fetch_stock_basic(list_status=args.list_status))
+        jobs.append(
+            DatasetJob(
+                "stock_basic",
+                priorities["stock_basic"],
+                lambda f: f.fetch_stock_basic(list_status=args.list_status),
+            )
+        )
     if "stock_company" in datasets:
-        summaries.append(fetcher.fetch_stock_company(exchanges=exchanges))
+        jobs.append(
+            DatasetJob(
+                "stock_company",
+                priorities["stock_company"],
+                lambda f: f.fetch_stock_company(exchanges=exchanges),
+            )
+        )
     if DATASET_STK_MANAGERS in datasets and start_dt and end_dt:
-        summaries.append(
-            fetcher.fetch_stk_managers(
-                start_dt,
-                end_dt,
-                window=args.managers_window,
-                resume=args.resume,
-                force=args.force,
+        jobs.append(
+            DatasetJob(
+                DATASET_STK_MANAGERS,
+                priorities[DATASET_STK_MANAGERS],
+                lambda f: f.fetch_stk_managers(
+                    start_dt,
+                    end_dt,
+                    window=args.managers_window,
+                    resume=args.resume,
+                    force=args.force,
+                    order=args.order,
+                ),
             )
         )
     if DATASET_SHARE_FLOAT in datasets and start_dt and end_dt:
-        summaries.append(
-            fetcher.fetch_share_float(
-                start_dt,
-                end_dt,
-                window=args.share_float_window,
-                resume=args.resume,
-                force=args.force,
-                threshold=args.share_float_threshold,
+        jobs.append(
+            DatasetJob(
+                DATASET_SHARE_FLOAT,
+                priorities[DATASET_SHARE_FLOAT],
+                lambda f: f.fetch_share_float(
+                    start_dt,
+                    end_dt,
+                    window=args.share_float_window,
+                    resume=args.resume,
+                    force=args.force,
+                    threshold=args.share_float_threshold,
+                    order=args.order,
+                ),
             )
         )
+    for dataset in EXTRA_DATASETS:
+        if dataset in datasets and start_dt and end_dt:
+            jobs.append(
+                DatasetJob(
+                    dataset,
+                    priorities[dataset],
+                    lambda f, dataset=dataset: f.fetch_dataset(
+                        dataset,
+                        start_dt,
+                        end_dt,
+                        resume=args.resume,
+                        force=args.force,
+                        order=args.order,
+                    ),
+                )
+            )
+
+    try:
+        summaries = run_jobs(jobs, fetcher, concurrent=args.concurrent)
+    finally:
+        runner.progress.stop()
 
     if args.consolidate:
-        for dataset in (DATASET_STK_MANAGERS, DATASET_SHARE_FLOAT):
+        for dataset in WINDOWED_DATASETS:
             if dataset not in datasets:
                 continue
             rows, path = _save_consolidated(store, dataset)
             if path:
                 print(f"- consolidated {dataset}: rows={rows} path={path}")
 
+    if {DATASET_STOCK_BASIC, DATASET_STOCK_COMPANY, DATASET_STK_MANAGERS} & set(datasets):
+        with _stage(store, "security master"):
+            master = refresh_security_master(store)
+        if master and master.rebuilt:
+            print(f"- security master: rows={master.rows} path={master.path}")
+
+    if args.export_sql:
+        with _stage(store, "export sql"):
+            results = store.export_sql(Path(args.export_sql), datasets, engine=args.sql_engine)
+        for result in results:
+            print(
+                f"- exported {result.dataset}: inserted={result.inserted} "
+                f"updated={result.updated} removed={result.removed}"
+            )
+
     print("\nFetch complete:")
     for summary in summaries:
         print(
             f"- {summary.dataset}: windows={summary.windows} rows={summary.rows} files={summary.files}"
         )
+        if summary.pending:
+            first, last = summary.pending[0], summary.pending[-1]
+            print(
+                f"  pending={len(summary.pending)} "
+                f"({format_yyyymmdd(first.start)} -> {format_yyyymmdd(last.end)}); "
+                "rerun to continue"
+            )
     if start_dt and end_dt:
         print(
             f"Event date range: {format_yyyymmdd(start_dt)} -> {format_yyyymmdd(end_dt)}"
         )
 
     if args.consolidate:
-        for dataset in (DATASET_STK_MANAGERS, DATASET_SHARE_FLOAT):
+        for dataset in WINDOWED_DATASETS:
             if dataset in datasets:
                 curated = store.curated_path(dataset)
                 if curated.exists():
                     print(f"- curated output: {curated}")
 
+    if store.memory is not None:
+        print("\n" + "\n".join(store.memory.report()))
+
 
 if __name__ == "__main__":
     main()
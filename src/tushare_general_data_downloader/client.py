@@ -0,0 +1,83 @@
+"""Keep-alive HTTP client implementing the ``pro`` interface used by the fetchers."""
+
+from __future__ import annotations
+
+from functools import partial
+
+import requests
+from requests.adapters import HTTPAdapter
+
+DEFAULT_API_URL = "http://api.waditu.com/dataapi"
+
+
+class TushareAPIError(RuntimeError):
+    """Raised when the API answers with a non-zero ``code``."""
+
+
+class PooledProClient:
+    """Drop-in replacement for ``ts.pro_api()`` backed by a pooled ``requests.Session``.
+
+    Connections are kept alive and reused across calls, responses are negotiated
+    with gzip/deflate, and timeouts are explicit. The underlying urllib3 pool is
+    thread-safe, so one client can be shared by concurrent dataset workers; size
+    ``pool_size`` to at least the number of workers. With ``columnar=True`` calls
+    return ``pyarrow.Table`` objects decoded column-wise from the JSON payload;
+    this module only imports pandas on the DataFrame path, although the package
+    itself still depends on it through the fetchers.
+    """
+
+    def __init__(
+        self,
+        token: str,
+        *,
+        url: str = DEFAULT_API_URL,
+        timeout: float = 30.0,
+        connect_timeout: float = 10.0,
+        pool_size: int = 8,
+        columnar: bool = False,
+    ) -> None:
+        self._token = token
+        self._url = url.rstrip("/")
+        self._timeout = (connect_timeout, timeout)
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+        session.headers.update({"Accept-Encoding": "gzip, deflate", "Connection": "keep-alive"})
+        self._session = session
+        self._columnar = columnar
+
+    def query_payload(self, api_name: str, fields: str | None = "", **params) -> dict:
+        """Return the raw ``{"fields": [...], "items": [[...], ...]}`` payload."""
+        body = {
+            "api_name": api_name,
+            "token": self._token,
+            "params": params,
+            "fields": fields or "",
+        }
+        response = self._session.post(
+            f"{self._url}/{api_name}", json=body, timeout=self._timeout
+        )
+        response.raise_for_status()
+        result = response.json()
+        if result.get("code") != 0:
+            raise TushareAPIError(result.get("msg") or f"{api_name} failed")
+        return result.get("data") or {"fields": [], "items": []}
+
+    def query(self, api_name: str, fields: str | None = "", **params):
+        data = self.query_payload(api_name, fields=fields, **params)
+        if self._columnar:
+            from .columnar import decode_payload
+
+            return decode_payload(data)
+        import pandas as pd
+
+        return pd.DataFrame(data.get("items") or [], columns=data.get("fields") or [])
+
+    def close(self) -> None:
+        self._session.close()
+
+    def __getattr__(self, name: str):
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return partial(self.query, name)
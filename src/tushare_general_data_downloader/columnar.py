@@ -0,0 +1,73 @@
+"""Decode API payloads straight into Arrow tables, bypassing pandas.
+
+Requires the optional ``pyarrow`` dependency (``pip install .[parquet]``).
+"""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .constants import FIELD_TYPES
+
+_ROW_INDEX = "__row"
+
+
+def field_type(name: str) -> pa.DataType:
+    declared = FIELD_TYPES.get(name)
+    return pa.from_numpy_dtype(declared) if declared else pa.string()
+
+
+def decode_payload(payload: dict) -> pa.Table:
+    """Build one typed Arrow column per field from a ``fields``/``items`` payload."""
+    fields = list(payload.get("fields") or [])
+    items = payload.get("items") or []
+    schema = pa.schema([(name, field_type(name)) for name in fields])
+    if not items:
+        return schema.empty_table()
+    columns = list(zip(*items))
+    arrays = []
+    for name, values in zip(fields, columns):
+        target = field_type(name)
+        if pa.types.is_string(target):
+            values = [None if value is None else str(value) for value in values]
+        arrays.append(pa.array(values, type=target))
+    return pa.Table.from_arrays(arrays, schema=schema)
+
+
+def dedup_table(table: pa.Table, keys: list[str]) -> pa.Table:
+    """Drop duplicate keys keeping the last occurrence, like ``drop_duplicates(keep="last")``."""
+    if table.num_rows == 0:
+        return table
+    subset = [key for key in keys if key in table.column_names] or table.column_names
+    indexed = table.append_column(_ROW_INDEX, pa.array(range(table.num_rows), pa.int64()))
+    last = indexed.group_by(subset, use_threads=False).aggregate([(_ROW_INDEX, "max")])
+    keep = pc.sort_indices(last[f"{_ROW_INDEX}_max"])
+    return table.take(pc.take(last[f"{_ROW_INDEX}_max"], keep))
+
+
+def concat_tables(tables: list[pa.Table]) -> pa.Table:
+    return pa.concat_tables(tables, promote_options="default")
+
+
+def write_table(
+    table: pa.Table, path: Path, file_format: str, *, dictionary_columns: list[str] = ()
+) -> None:
+    if file_format == "ipc":
+        for name in dictionary_columns:
+            index = table.column_names.index(name)
+            table = table.set_column(index, name, pc.dictionary_encode(table.column(name)))
+    if file_format == "parquet":
+        import pyarrow.parquet as pq
+
+        pq.write_table(table, path)
+    elif file_format == "ipc":
+        import pyarrow.feather as feather
+
+        feather.write_feather(table, path, compression="uncompressed")
+    else:
+        import pyarrow.csv as pa_csv
+
+        pa_csv.write_csv(table, path)
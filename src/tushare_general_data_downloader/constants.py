@@ -6,6 +6,9 @@ DATASET_STOCK_BASIC = "stock_basic"
 DATASET_STOCK_COMPANY = "stock_company"
 DATASET_STK_MANAGERS = "stk_managers"
 DATASET_SHARE_FLOAT = "share_float"
+DATASET_DIVIDEND = "dividend"
+DATASET_TOP10_HOLDERS = "top10_holders"
+DATASET_PLEDGE_DETAIL = "pledge_detail"
 
 ALL_DATASETS = (
     DATASET_STOCK_BASIC,
@@ -13,6 +16,12 @@ ALL_DATASETS = (
     DATASET_STK_MANAGERS,
     DATASET_SHARE_FLOAT,
 )
+# Registry-driven endpoints; fetched only when named in --datasets.
+EXTRA_DATASETS = (
+    DATASET_DIVIDEND,
+    DATASET_TOP10_HOLDERS,
+    DATASET_PLEDGE_DETAIL,
+)
 
 DEFAULT_FIELDS = {
     DATASET_STOCK_BASIC: (
@@ -26,6 +35,43 @@ DEFAULT_FIELDS = {
     DATASET_SHARE_FLOAT: (
         "ts_code,ann_date,float_date,holder_name,share_type,float_share,float_ratio"
     ),
+    DATASET_DIVIDEND: (
+        "ts_code,end_date,ann_date,div_proc,stk_div,stk_bo_rate,stk_co_rate,cash_div,"
+        "cash_div_tax,record_date,ex_date,pay_date,div_listdate,imp_ann_date,base_date,base_share"
+    ),
+    DATASET_TOP10_HOLDERS: "ts_code,ann_date,end_date,holder_name,hold_amount,hold_ratio",
+    DATASET_PLEDGE_DETAIL: (
+        "ts_code,ann_date,holder_name,pledge_amount,start_date,end_date,is_release,"
+        "release_date,pledgor,holding_amount,pledged_amount,p_total_ratio,h_total_ratio,"
+        "is_buyback"
+    ),
+}
+
+# Arrow types for numeric fields; every other field decodes as a string.
+FIELD_TYPES = {
+    "float_share": "float64",
+    "float_ratio": "float64",
+    "reg_capital": "float64",
+    "employees": "float64",
+    "stk_div": "float64",
+    "stk_bo_rate": "float64",
+    "stk_co_rate": "float64",
+    "cash_div": "float64",
+    "cash_div_tax": "float64",
+    "base_share": "float64",
+    "hold_amount": "float64",
+    "hold_ratio": "float64",
+    "pledge_amount": "float64",
+    "holding_amount": "float64",
+    "pledged_amount": "float64",
+    "p_total_ratio": "float64",
+    "h_total_ratio": "float64",
+}
+
+# Long or highly repeated text: dictionary-encoded in Parquet/IPC, interned in CSV.
+TEXT_COLUMNS = {
+    DATASET_STOCK_COMPANY: ["introduction", "main_business", "business_scope"],
+    DATASET_STK_MANAGERS: ["name", "title"],
 }
 
 ENV_FIELD_OVERRIDES = {
@@ -33,6 +79,9 @@ ENV_FIELD_OVERRIDES = {
     DATASET_STOCK_COMPANY: "TUSHARE_FIELDS_STOCK_COMPANY",
     DATASET_STK_MANAGERS: "TUSHARE_FIELDS_STK_MANAGERS",
     DATASET_SHARE_FLOAT: "TUSHARE_FIELDS_SHARE_FLOAT",
+    DATASET_DIVIDEND: "TUSHARE_FIELDS_DIVIDEND",
+    DATASET_TOP10_HOLDERS: "TUSHARE_FIELDS_TOP10_HOLDERS",
+    DATASET_PLEDGE_DETAIL: "TUSHARE_FIELDS_PLEDGE_DETAIL",
 }
 
 DEDUP_KEYS = {
@@ -53,10 +102,47 @@ DEDUP_KEYS = {
         "share_type",
         "ann_date",
     ],
+    DATASET_DIVIDEND: ["ts_code", "end_date", "ann_date", "div_proc"],
+    DATASET_TOP10_HOLDERS: ["ts_code", "end_date", "ann_date", "holder_name"],
+    DATASET_PLEDGE_DETAIL: [
+        "ts_code",
+        "ann_date",
+        "holder_name",
+        "start_date",
+        "pledge_amount",
+    ],
 }
 
 DEFAULT_EXCHANGES = ("SSE", "SZSE", "BSE")
 DEFAULT_SHARE_FLOAT_THRESHOLD = 5500
+# Rows per request used to size ts_code batches; stk_managers is kept conservative.
+ROW_CAPS = {
+    DATASET_STK_MANAGERS: 4000,
+    DATASET_SHARE_FLOAT: DEFAULT_SHARE_FLOAT_THRESHOLD,
+    DATASET_DIVIDEND: 6000,
+    DATASET_TOP10_HOLDERS: 5000,
+    DATASET_PLEDGE_DETAIL: 1000,
+}
 DEFAULT_MANAGERS_WINDOW = "month"
 DEFAULT_SHARE_FLOAT_WINDOW = "week"
 DEFAULT_YEARS = 5
+
+ORDER_OLDEST_FIRST = "oldest-first"
+ORDER_NEWEST_FIRST = "newest-first"
+WINDOW_ORDERS = (ORDER_OLDEST_FIRST, ORDER_NEWEST_FIRST)
+
+# Beijing-time poll slots for --watch, around the trading session and evening disclosures.
+DEFAULT_WATCH_TIMES = "09:00,12:00,15:30,18:00,21:00"
+DEFAULT_WATCH_LOOKBACK_DAYS = 2
+DEFAULT_DIMENSION_INTERVAL = "24h"
+
+# Larger values win the shared rate budget when datasets run concurrently.
+DEFAULT_PRIORITIES = {
+    DATASET_STOCK_BASIC: 20,
+    DATASET_STOCK_COMPANY: 20,
+    DATASET_STK_MANAGERS: 10,
+    DATASET_SHARE_FLOAT: 0,
+    DATASET_DIVIDEND: 0,
+    DATASET_TOP10_HOLDERS: 0,
+    DATASET_PLEDGE_DETAIL: 0,
+}
@@ -0,0 +1,94 @@
+"""Keyed, vectorized diffs between two versions of a table."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import numpy as np
+import pandas as pd
+
+
+@dataclass
+class FrameDelta:
+    inserted: pd.DataFrame
+    updated: pd.DataFrame
+    previous: pd.DataFrame
+    removed: pd.DataFrame
+
+    @property
+    def empty(self) -> bool:
+        return self.inserted.empty and self.updated.empty and self.removed.empty
+
+    def counts(self) -> dict[str, int]:
+        return {
+            "inserted": len(self.inserted),
+            "updated": len(self.updated),
+            "removed": len(self.removed),
+        }
+
+
+def row_hashes(df: pd.DataFrame, columns: list[str]) -> np.ndarray:
+    return pd.util.hash_pandas_object(df.reindex(columns=columns), index=False).to_numpy()
+
+
+def _key_index(df: pd.DataFrame, keys: list[str]) -> pd.Index:
+    if len(keys) == 1:
+        return pd.Index(df[keys[0]])
+    return pd.MultiIndex.from_frame(df[keys])
+
+
+def diff_frames(old: pd.DataFrame | None, new: pd.DataFrame, keys: list[str]) -> FrameDelta:
+    """Classify rows of ``new`` against ``old`` by key and full-row hash.
+
+    ``updated`` holds the new versions and ``previous`` the matching old ones, in
+    the same order. Without usable keys the whole row acts as the key, so changes
+    surface as a removal plus an insertion.
+    """
+    if old is None or old.empty:
+        empty = new.iloc[0:0]
+        return FrameDelta(inserted=new, updated=empty, previous=empty, removed=empty)
+    if new.empty:
+        empty = old.iloc[0:0]
+        return FrameDelta(inserted=new, updated=empty, previous=empty, removed=old)
+    columns = list(dict.fromkeys([*new.columns, *old.columns]))
+    keys = [key for key in keys if key in old.columns and key in new.columns]
+    if not keys:
+        old = old.reindex(columns=columns)
+        new = new.reindex(columns=columns)
+        keys = columns
+    old = old.drop_duplicates(subset=keys, keep="last")
+    new = new.drop_duplicates(subset=keys, keep="last")
+
+    old_index = _key_index(old, keys)
+    new_index = _key_index(new, keys)
+    in_old = new_index.isin(old_index)
+    in_new = old_index.isin(new_index)
+
+    old_hash = pd.Series(row_hashes(old, columns), index=old_index)
+    new_hash = row_hashes(new, columns)
+    common = new_index[in_old]
+    changed = np.zeros(len(new), dtype=bool)
+    changed[in_old] = old_hash.reindex(common).to_numpy() != new_hash[in_old]
+
+    updated = new[changed]
+    previous = old.set_axis(old_index).loc[_key_index(updated, keys)].reset_index(drop=True)
+    return FrameDelta(
+        inserted=new[~in_old],
+        updated=updated,
+        previous=previous,
+        removed=old[~in_new],
+    )
+
+
+def upsert_delta(old: pd.DataFrame | None, new: pd.DataFrame, keys: list[str]) -> FrameDelta:
+    """Delta of upserting ``new`` into ``old``: rows absent from ``new`` are kept, not removed."""
+    if new.empty:
+        return diff_frames(None, new, keys)
+    if old is None or old.empty:
+        return diff_frames(old, new, keys)
+    keys = [key for key in keys if key in old.columns and key in new.columns]
+    if keys:
+        old = old[_key_index(old, keys).isin(_key_index(new, keys))]
+    delta = diff_frames(old, new, keys)
+    delta.removed = delta.removed.iloc[0:0]
+    return delta
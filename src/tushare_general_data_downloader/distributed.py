@@ -0,0 +1,278 @@
+"""Coordinator-free work sharing for multi-host backfills over a shared directory.
+
+Window tasks are published as files under ``<root>/tasks``. Workers claim one by
+creating ``<root>/leases/<task>.lease`` exclusively, keep it alive with heartbeats
+and mark it finished with ``<root>/done/<task>.json``. A lease whose expiry has
+passed (its worker crashed or hung) can be taken over by any other worker. Every
+step is idempotent, so a task finished twice just rewrites the same raw window.
+Lease expiry uses wall-clock time, so hosts need reasonably synced clocks.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import socket
+import threading
+import time
+import uuid
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Callable, Iterable
+
+from .api import BudgetExhausted
+from .fetchers import FetchSummary, ListedCompanyFetcher
+from .windowing import DateWindow, format_yyyymmdd, parse_yyyymmdd
+
+DEFAULT_LEASE_SECONDS = 300.0
+# Upper bound on how long an idle worker waits before re-checking peers' leases.
+MAX_POLL_SECONDS = 10.0
+
+
+@dataclass(frozen=True)
+class WindowTask:
+    dataset: str
+    start: date
+    end: date
+    force: bool = False
+
+    @property
+    def task_id(self) -> str:
+        return f"{self.dataset}_{format_yyyymmdd(self.start)}_{format_yyyymmdd(self.end)}"
+
+    def to_dict(self) -> dict:
+        return {
+            "dataset": self.dataset,
+            "start": format_yyyymmdd(self.start),
+            "end": format_yyyymmdd(self.end),
+            "force": self.force,
+        }
+
+    @classmethod
+    def from_dict(cls, raw: dict) -> "WindowTask":
+        return cls(
+            dataset=raw["dataset"],
+            start=parse_yyyymmdd(raw["start"]),
+            end=parse_yyyymmdd(raw["end"]),
+            force=bool(raw.get("force", False)),
+        )
+
+
+@dataclass
+class Lease:
+    task: WindowTask
+    worker_id: str
+    token: str
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def _write_json_atomic(path: Path, payload: dict) -> None:
+    tmp = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    tmp.write_text(json.dumps(payload, ensure_ascii=False), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_json(path: Path) -> dict | None:
+    try:
+        return json.loads(path.read_text(encoding="utf-8"))
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
+
+
+class WorkQueue:
+    def __init__(self, root: Path, *, lease_seconds: float = DEFAULT_LEASE_SECONDS) -> None:
+        self.root = root
+        self.lease_seconds = lease_seconds
+        for sub in ("tasks", "leases", "done"):
+            (root / sub).mkdir(parents=True, exist_ok=True)
+
+    def _task_path(self, task_id: str) -> Path:
+        return self.root / "tasks" / f"{task_id}.json"
+
+    def _lease_path(self, task_id: str) -> Path:
+        return self.root / "leases" / f"{task_id}.lease"
+
+    def _done_path(self, task_id: str) -> Path:
+        return self.root / "done" / f"{task_id}.json"
+
+    def publish(self, tasks: Iterable[WindowTask]) -> int:
+        """Add tasks that are not already queued; returns how many were new."""
+        added = 0
+        for task in tasks:
+            path = self._task_path(task.task_id)
+            try:
+                fd = os.open(path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                continue
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                json.dump(task.to_dict(), handle)
+            added += 1
+        return added
+
+    def _try_create_lease(self, task: WindowTask, worker_id: str) -> Lease | None:
+        token = uuid.uuid4().hex
+        payload = {
+            "worker": worker_id,
+            "token": token,
+            "expires": time.time() + self.lease_seconds,
+        }
+        try:
+            fd = os.open(self._lease_path(task.task_id), os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+        except FileExistsError:
+            return None
+        with os.fdopen(fd, "w", encoding="utf-8") as handle:
+            json.dump(payload, handle)
+        return Lease(task=task, worker_id=worker_id, token=token)
+
+    def _reap_expired(self, task_id: str) -> None:
+        lease_path = self._lease_path(task_id)
+        current = _read_json(lease_path)
+        if current is None or float(current.get("expires", 0)) > time.time():
+            return
+        stale = lease_path.with_name(f"{lease_path.name}.{uuid.uuid4().hex}.stale")
+        try:
+            os.rename(lease_path, stale)
+        except FileNotFoundError:
+            return
+        taken = _read_json(stale)
+        if taken is not None and taken.get("token") != current.get("token"):
+            # Someone renewed or re-claimed between our read and rename; put it back.
+            try:
+                os.link(stale, lease_path)
+            except FileExistsError:
+                pass
+        stale.unlink(missing_ok=True)
+
+    def claim(self, worker_id: str) -> Lease | None:
+        for task_path in sorted((self.root / "tasks").glob("*.json")):
+            task_id = task_path.stem
+            if self._done_path(task_id).exists():
+                continue
+            raw = _read_json(task_path)
+            if raw is None:
+                continue
+            task = WindowTask.from_dict(raw)
+            lease = self._try_create_lease(task, worker_id)
+            if lease is None:
+                self._reap_expired(task_id)
+                lease = self._try_create_lease(task, worker_id)
+            if lease is not None:
+                if self._done_path(task_id).exists():
+                    self.release(lease)
+                    continue
+                return lease
+        return None
+
+    def _owns(self, lease: Lease) -> bool:
+        current = _read_json(self._lease_path(lease.task.task_id))
+        return current is not None and current.get("token") == lease.token
+
+    def heartbeat(self, lease: Lease) -> bool:
+        if not self._owns(lease):
+            return False
+        _write_json_atomic(
+            self._lease_path(lease.task.task_id),
+            {
+                "worker": lease.worker_id,
+                "token": lease.token,
+                "expires": time.time() + self.lease_seconds,
+            },
+        )
+        return True
+
+    def release(self, lease: Lease) -> None:
+        if self._owns(lease):
+            self._lease_path(lease.task.task_id).unlink(missing_ok=True)
+
+    def complete(self, lease: Lease, summary: FetchSummary) -> None:
+        _write_json_atomic(
+            self._done_path(lease.task.task_id),
+            {
+                "worker": lease.worker_id,
+                "rows": summary.rows,
+                "files": summary.files,
+                "finished": time.time(),
+            },
+        )
+        self.release(lease)
+
+    def status(self) -> dict[str, int]:
+        tasks = {path.stem for path in (self.root / "tasks").glob("*.json")}
+        done = {path.stem for path in (self.root / "done").glob("*.json")} & tasks
+        leased = {path.stem for path in (self.root / "leases").glob("*.lease")} - done
+        return {
+            "tasks": len(tasks),
+            "done": len(done),
+            "leased": len(leased),
+            "available": len(tasks - done - leased),
+        }
+
+
+class _Heartbeat:
+    def __init__(self, queue: WorkQueue, lease: Lease) -> None:
+        self._queue = queue
+        self._lease = lease
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def _run(self) -> None:
+        interval = max(self._queue.lease_seconds / 3, 0.05)
+        while not self._stop.wait(interval):
+            if not self._queue.heartbeat(self._lease):
+                print(f"Lost lease on {self._lease.task.task_id}; finishing idempotently.")
+                return
+
+    def __enter__(self) -> "_Heartbeat":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self._stop.set()
+        self._thread.join()
+
+
+def run_worker(
+    fetcher: ListedCompanyFetcher,
+    queue: WorkQueue,
+    *,
+    worker_id: str,
+    threshold: int,
+    sleep: Callable[[float], None] = time.sleep,
+) -> list[FetchSummary]:
+    """Claim and process tasks until every task is done.
+
+    While peers still hold leases the worker keeps polling, so a task whose
+    worker crashed is reclaimed once its lease expires. Budget exhaustion
+    releases the current lease and returns like the single-process path.
+    """
+    summaries: list[FetchSummary] = []
+    poll = min(max(queue.lease_seconds / 3, 0.05), MAX_POLL_SECONDS)
+    while True:
+        lease = queue.claim(worker_id)
+        if lease is None:
+            if not queue.status()["leased"]:
+                return summaries
+            sleep(poll)
+            continue
+        task = lease.task
+        try:
+            with _Heartbeat(queue, lease):
+                summary = fetcher.fetch_window(
+                    task.dataset,
+                    DateWindow(start=task.start, end=task.end),
+                    force=task.force,
+                    threshold=threshold,
+                )
+        except BudgetExhausted:
+            queue.release(lease)
+            print(f"Worker {worker_id}: request budget exhausted; released {task.task_id}.")
+            return summaries
+        except BaseException:
+            queue.release(lease)
+            raise
+        queue.complete(lease, summary)
+        summaries.append(summary)
@@ -0,0 +1,123 @@
+"""Append-only per-dataset change feed written whenever curated output changes."""
+
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+import pandas as pd
+
+from .delta import FrameDelta
+from .journal import temp_path
+from .storage import DataStore
+
+CHANGE_KINDS = ("inserted", "updated", "removed")
+# Entries inlined in manifest.json; every entry also has its own JSON file, so
+# the manifest stays small however long the feed grows.
+MANIFEST_ENTRIES = 100
+
+
+@dataclass
+class FeedEntry:
+    sequence: int
+    created_at: str
+    counts: dict[str, int]
+    files: dict[str, str] = field(default_factory=dict)
+
+
+def feed_dir(store: DataStore, dataset: str) -> Path:
+    return store.base_dir / "feed" / dataset
+
+
+def manifest_path(store: DataStore, dataset: str) -> Path:
+    return feed_dir(store, dataset) / "manifest.json"
+
+
+def entry_path(store: DataStore, dataset: str, sequence: int) -> Path:
+    return feed_dir(store, dataset) / f"{sequence:08d}.json"
+
+
+def _write_json(path: Path, payload: dict) -> None:
+    tmp = temp_path(path)
+    tmp.write_text(json.dumps(payload, ensure_ascii=False, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def read_manifest(store: DataStore, dataset: str) -> list[FeedEntry]:
+    """The most recent ``MANIFEST_ENTRIES`` entries; see ``read_entries`` for older ones."""
+    path = manifest_path(store, dataset)
+    if not path.exists():
+        return []
+    raw = json.loads(path.read_text(encoding="utf-8"))
+    return [FeedEntry(**entry) for entry in raw.get("entries", [])]
+
+
+def head_sequence(store: DataStore, dataset: str) -> int:
+    """Sequence of the newest published change set; 0 before the first one."""
+    path = manifest_path(store, dataset)
+    if not path.exists():
+        return 0
+    return int(json.loads(path.read_text(encoding="utf-8")).get("sequence", 0))
+
+
+def read_entries(store: DataStore, dataset: str, after: int = 0) -> list[FeedEntry]:
+    """Entries with ``sequence > after``, oldest first, including ones aged out of the manifest."""
+    recent = read_manifest(store, dataset)
+    first = recent[0].sequence if recent else head_sequence(store, dataset) + 1
+    older = []
+    for sequence in range(after + 1, first):
+        path = entry_path(store, dataset, sequence)
+        if path.exists():
+            older.append(FeedEntry(**json.loads(path.read_text(encoding="utf-8"))))
+    return older + [entry for entry in recent if entry.sequence > after]
+
+
+def publish_delta(store: DataStore, dataset: str, delta: FrameDelta) -> FeedEntry | None:
+    """Write the non-empty parts of ``delta`` as the next sequence number.
+
+    Files land before the manifest is replaced, so a consumer that only trusts
+    manifest entries never sees a half-written change set.
+    """
+    if delta.empty:
+        return None
+    sequence = head_sequence(store, dataset) + 1
+    entry = FeedEntry(
+        sequence=sequence,
+        created_at=datetime.now().isoformat(timespec="seconds"),
+        counts=delta.counts(),
+    )
+    directory = feed_dir(store, dataset)
+    for kind in CHANGE_KINDS:
+        frame = getattr(delta, kind)
+        if frame.empty:
+            continue
+        path = directory / f"{sequence:08d}_{kind}.{store.suffix}"
+        store.write_frame(frame.reset_index(drop=True), path)
+        entry.files[kind] = path.name
+    _write_json(entry_path(store, dataset, sequence), asdict(entry))
+    entries = [*read_manifest(store, dataset), entry][-MANIFEST_ENTRIES:]
+    _write_json(
+        manifest_path(store, dataset),
+        {"dataset": dataset, "sequence": sequence, "entries": [asdict(e) for e in entries]},
+    )
+    return entry
+
+
+def read_changes(
+    store: DataStore, dataset: str, after: int = 0, *, text: bool = False
+) -> list[tuple[FeedEntry, dict[str, pd.DataFrame]]]:
+    """Entries with ``sequence > after`` and their change frames, oldest first."""
+    directory = feed_dir(store, dataset)
+    return [
+        (
+            entry,
+            {
+                kind: store.read_frame(directory / name, text=text)
+                for kind, name in entry.files.items()
+            },
+        )
+        for entry in read_entries(store, dataset, after)
+    ]
@@ -2,31 +2,43 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from datetime import date, timedelta
-from typing import Iterable
+from dataclasses import dataclass, field, replace
+from datetime import date, datetime
+from pathlib import Path
+from typing import Callable, Generator, Iterable, Iterator
 
+import math
 import os
 import pandas as pd
 import tushare as ts
 
-from .api import FetchRunner
+from .api import BudgetExhausted, FetchRunner
+from .progress import ProgressTracker
+from .registry import POLICY_CODES, POLICY_DAY, DatasetSpec, get_spec
+from .batching import (
+    load_universe,
+    pack_code_batches,
+    rows_per_code,
+    split_evenly,
+)
 from .constants import (
     DATASET_SHARE_FLOAT,
     DATASET_STK_MANAGERS,
     DEDUP_KEYS,
     DEFAULT_FIELDS,
+    DEFAULT_MANAGERS_WINDOW,
     DEFAULT_SHARE_FLOAT_THRESHOLD,
+    DEFAULT_SHARE_FLOAT_WINDOW,
     ENV_FIELD_OVERRIDES,
+    ORDER_NEWEST_FIRST,
+    ORDER_OLDEST_FIRST,
 )
+from .snapshots import record_snapshot
 from .storage import DataStore
 from .windowing import (
     DateWindow,
     format_yyyymmdd,
     iter_day_ranges,
-    iter_month_ranges,
-    iter_week_ranges,
-    parse_yyyymmdd,
 )
 
 
@@ -36,6 +48,95 @@ class FetchSummary:
     windows: int = 0
     rows: int = 0
     files: int = 0
+    pending: list[DateWindow] = field(default_factory=list)
+    paths: list[Path] = field(default_factory=list)
+
+
+@dataclass
+class WindowFrame:
+    """One fetched window; ``frame`` is a DataFrame or, on the columnar path, an Arrow table."""
+
+    dataset: str
+    window: DateWindow
+    frame: pd.DataFrame
+
+
+def raw_window_sink(store: DataStore) -> Callable[[WindowFrame], None]:
+    """Sink for the streaming API that persists each window under ``raw/``."""
+
+    def sink(item: WindowFrame) -> None:
+        store.save_raw_window(item.dataset, item.window.start, item.window.end, item.frame)
+
+    return sink
+
+
+def resolve_fields(dataset: str) -> str | None:
+    env_key = ENV_FIELD_OVERRIDES.get(dataset)
+    if env_key:
+        override = os.getenv(env_key)
+        if override:
+            return override
+    return DEFAULT_FIELDS.get(dataset)
+
+
+def dedup_frame(dataset: str, df: pd.DataFrame) -> pd.DataFrame:
+    keys = DEDUP_KEYS.get(dataset, [])
+    if not isinstance(df, pd.DataFrame):
+        from .columnar import dedup_table
+
+        return dedup_table(df, keys)
+    if df.empty:
+        return df
+    subset = [key for key in keys if key in df.columns]
+    if subset:
+        return df.drop_duplicates(subset=subset, keep="last")
+    return df.drop_duplicates()
+
+
+def _column_values(df, column: str) -> list[str]:
+    if isinstance(df, pd.DataFrame):
+        return [str(value) for value in df[column].dropna()] if column in df.columns else []
+    if column not in df.column_names:
+        return []
+    return [str(value) for value in df.column(column).to_pylist() if value is not None]
+
+
+@dataclass(frozen=True)
+class ApiCall:
+    """One endpoint request planned by the window steps; the driver answers it with a frame."""
+
+    label: str
+    api: str
+    params: dict[str, str]
+    fields: str | None
+
+
+# Window steps yield ``ApiCall``s, which the driver answers with the response frame,
+# and items such as ``(window, frame)``, which it answers with ``None``.
+Steps = Generator[object, object, object]
+
+
+def _forward(steps: Steps, handle: Callable[[object], None]) -> Steps:
+    """Pass the requests of ``steps`` up to the driver and its items to ``handle``."""
+    answer = None
+    while True:
+        try:
+            step = steps.send(answer)
+        except StopIteration as stop:
+            return stop.value
+        if isinstance(step, ApiCall):
+            answer = yield step
+        else:
+            handle(step)
+            answer = None
+
+
+def _concat(frames: list) -> pd.DataFrame:
+    if isinstance(frames[0], pd.DataFrame):
+        return pd.concat(frames, ignore_index=True)
+    from .columnar import concat_tables
+
+    return concat_tables(frames)
 
 
 class ListedCompanyFetcher:
@@ -43,14 +144,22 @@ class ListedCompanyFetcher:
         self.pro = pro
         self.runner = runner
         self.store = store
+        self._universe_cache: list[str] | None = None
+
+    def with_priority(self, priority: int) -> "ListedCompanyFetcher":
+        """Return a fetcher sharing client, store and rate limiter at another priority."""
+        return ListedCompanyFetcher(self.pro, replace(self.runner, priority=priority), self.store)
+
+    @property
+    def progress(self) -> ProgressTracker | None:
+        return self.runner.progress
 
     def _resolve_fields(self, dataset: str) -> str | None:
-        env_key = ENV_FIELD_OVERRIDES.get(dataset)
-        if env_key:
-            override = os.getenv(env_key)
-            if override:
-                return override
-        return DEFAULT_FIELDS.get(dataset)
+        return resolve_fields(dataset)
+
+    def _split_depth(self, dataset: str, depth: int) -> None:
+        if self.progress is not None:
+            self.progress.split(dataset, depth)
 
     def _fetch_with_fields(self, label: str, fn, fields: str | None):
         if fields:
@@ -58,107 +167,194 @@ class ListedCompanyFetcher:
         return self.runner.call(label, fn)
 
     def _dedup(self, dataset: str, df: pd.DataFrame) -> pd.DataFrame:
-        if df.empty:
-            return df
-        keys = DEDUP_KEYS.get(dataset, [])
-        subset = [key for key in keys if key in df.columns]
-        if subset:
-            return df.drop_duplicates(subset=subset, keep="last")
-        return df.drop_duplicates()
+        return dedup_frame(dataset, df)
 
-    def fetch_stock_basic(self, list_status: str) -> FetchSummary:
-        fields = self._resolve_fields("stock_basic")
+    def _answer(self, call: ApiCall) -> pd.DataFrame:
         df = self._fetch_with_fields(
-            f"stock_basic list_status={list_status or 'ALL'}",
-            lambda fields=None: self.pro.stock_basic(list_status=list_status, fields=fields),
-            fields,
+            call.label,
+            lambda fields=None: getattr(self.pro, call.api)(fields=fields, **call.params),
+            call.fields,
         )
+        return pd.DataFrame() if df is None else df
+
+    def _drive(self, steps: Steps) -> Iterator:
+        """Answer the requests of ``steps`` through ``runner`` and yield its items."""
+        answer = None
+        while True:
+            try:
+                step = steps.send(answer)
+            except StopIteration:
+                return
+            if isinstance(step, ApiCall):
+                answer = self._answer(step)
+            else:
+                answer = None
+                yield step
+
+    def fetch_stock_basic(self, list_status: str) -> FetchSummary:
+        fields = self._resolve_fields("stock_basic")
+        run_date = date.today()
+        if self.progress is not None:
+            self.progress.begin("stock_basic", 1)
+        try:
+            df = self._fetch_with_fields(
+                f"stock_basic list_status={list_status or 'ALL'}",
+                lambda fields=None: self.pro.stock_basic(list_status=list_status, fields=fields),
+                fields,
+            )
+        except BudgetExhausted:
+            return self._snapshot_pending("stock_basic", run_date)
         if df is None:
             df = pd.DataFrame()
+        if self.progress is not None:
+            self.progress.window_done("stock_basic", len(df))
         df = self._dedup("stock_basic", df)
-        run_date = date.today()
-        self.store.save_raw_snapshot("stock_basic", run_date, df)
-        self.store.save_curated("stock_basic", df)
-        return FetchSummary(dataset="stock_basic", windows=1, rows=len(df), files=2)
+        return self._record_snapshot("stock_basic", run_date, df, windows=1)
 
     def fetch_stock_company(self, exchanges: Iterable[str]) -> FetchSummary:
         fields = self._resolve_fields("stock_company")
         frames: list[pd.DataFrame] = []
         windows = 0
+        run_date = date.today()
+        exchanges = list(exchanges)
+        if self.progress is not None:
+            self.progress.begin("stock_company", len(exchanges))
         for exchange in exchanges:
             label = f"stock_company exchange={exchange}"
-            df = self._fetch_with_fields(
-                label,
-                lambda fields=None, exchange=exchange: self.pro.stock_company(
-                    exchange=exchange, fields=fields
-                ),
-                fields,
-            )
+            try:
+                df = self._fetch_with_fields(
+                    label,
+                    lambda fields=None, exchange=exchange: self.pro.stock_company(
+                        exchange=exchange, fields=fields
+                    ),
+                    fields,
+                )
+            except BudgetExhausted:
+                return self._snapshot_pending("stock_company", run_date)
             windows += 1
-            if df is None or df.empty:
+            if self.progress is not None:
+                self.progress.window_done("stock_company", 0 if df is None else len(df))
+            if df is None or len(df) == 0:
                 continue
             frames.append(df)
         if frames:
-            merged = pd.concat(frames, ignore_index=True)
+            merged = _concat(frames)
             merged = self._dedup("stock_company", merged)
         else:
             merged = pd.DataFrame()
-        run_date = date.today()
-        self.store.save_raw_snapshot("stock_company", run_date, merged)
-        self.store.save_curated("stock_company", merged)
-        return FetchSummary(dataset="stock_company", windows=windows, rows=len(merged), files=2)
-
-    def _iter_windows(self, window: str, start: date, end: date) -> list[DateWindow]:
-        if window == "day":
-            return iter_day_ranges(start, end)
-        if window == "week":
-            return iter_week_ranges(start, end)
-        if window == "month":
-            return iter_month_ranges(start, end)
-        raise ValueError(f"Unsupported window: {window}")
+        return self._record_snapshot("stock_company", run_date, merged, windows=windows)
 
-    def fetch_stk_managers(
+    def _record_snapshot(
+        self, dataset: str, run_date: date, df: pd.DataFrame, *, windows: int
+    ) -> FetchSummary:
+        if not isinstance(df, pd.DataFrame):
+            df = df.to_pandas()
+        if self.progress is not None:
+            self.progress.finish(dataset)
+        curated = self.store.curated_path(dataset)
+        if len(df) == 0 and curated.exists():
+            print(f"Warning: {dataset} returned no rows; keeping the previous snapshot.")
+            return FetchSummary(dataset=dataset, windows=windows)
+        result = record_snapshot(self.store, dataset, df, run_date)
+        counts = result.delta.counts()
+        print(
+            f"{dataset}: inserted={counts['inserted']} updated={counts['updated']} "
+            f"removed={counts['removed']}"
+        )
+        summary = FetchSummary(dataset=dataset, windows=windows, rows=len(df), files=result.files)
+        if result.changes_path:
+            summary.paths.append(result.changes_path)
+        return summary
+
+    def _snapshot_pending(self, dataset: str, run_date: date) -> FetchSummary:
+        print(f"{dataset}: request budget exhausted; snapshot not refreshed.")
+        if self.progress is not None:
+            self.progress.finish(dataset, exhausted=True)
+        return FetchSummary(dataset=dataset, pending=[DateWindow(start=run_date, end=run_date)])
+
+    def _run_windows(
+        self,
+        dataset: str,
+        windows: list[DateWindow],
+        process: Callable[[DateWindow, FetchSummary], FetchSummary],
+        *,
+        order: str,
+    ) -> FetchSummary:
+        """Process windows in the requested order and stop cleanly on budget exhaustion.
+
+        State only advances over the contiguous run of completed windows from the
+        oldest one, so ``--resume`` stays correct when windows finish newest-first.
+        """
+        summary = FetchSummary(dataset=dataset)
+        indices = list(range(len(windows)))
+        if order == ORDER_NEWEST_FIRST:
+            indices.reverse()
+        elif order != ORDER_OLDEST_FIRST:
+            raise ValueError(f"Unsupported order: {order}")
+        completed = [False] * len(windows)
+        frontier = 0
+        progress = self.progress
+        if progress is not None:
+            progress.begin(dataset, len(windows))
+        for position, index in enumerate(indices):
+            rows = summary.rows
+            try:
+                summary = process(windows[index], summary)
+            except BudgetExhausted:
+                summary.pending = [windows[i] for i in sorted(indices[position:])]
+                print(
+                    f"{dataset}: request budget exhausted; "
+                    f"{len(summary.pending)} window(s) pending."
+                )
+                break
+            if progress is not None:
+                progress.window_done(dataset, summary.rows - rows)
+            completed[index] = True
+            advanced = frontier
+            while advanced < len(windows) and completed[advanced]:
+                advanced += 1
+            if advanced > frontier:
+                frontier = advanced
+                self.store.update_state(
+                    dataset, windows[frontier - 1].end, summary.rows, summary.windows
+                )
+        if progress is not None:
+            progress.finish(dataset, exhausted=bool(summary.pending))
+        return summary
+
+    def fetch_dataset(
         self,
+        dataset: str,
         start: date,
         end: date,
         *,
-        window: str,
-        resume: bool,
-        force: bool,
+        window: str | None = None,
+        resume: bool = False,
+        force: bool = False,
+        threshold: int | None = None,
+        order: str = ORDER_OLDEST_FIRST,
     ) -> FetchSummary:
-        dataset = DATASET_STK_MANAGERS
+        """Generic engine for every registered endpoint; see ``registry.DatasetSpec``.
+
+        ``window`` overrides the spec's default window size and ``threshold`` its
+        row cap; skip, autosplit, resume and budget handling are shared.
+        """
+        spec = get_spec(dataset)
         fields = self._resolve_fields(dataset)
-        state = self.store.load_state(dataset)
-        if resume and state and state.last_end_date:
-            start = max(start, parse_yyyymmdd(state.last_end_date) + timedelta(days=1))
-        windows = self._iter_windows(window, start, end)
-        summary = FetchSummary(dataset=dataset)
-        for win in windows:
-            path = self.store.raw_window_path(dataset, win.start, win.end)
-            if path.exists() and not force:
-                summary.windows += 1
-                continue
-            label = f"stk_managers {format_yyyymmdd(win.start)}->{format_yyyymmdd(win.end)}"
-            df = self._fetch_with_fields(
-                label,
-                lambda fields=None, start=win.start, end=win.end: self.pro.stk_managers(
-                    start_date=format_yyyymmdd(start),
-                    end_date=format_yyyymmdd(end),
-                    fields=fields,
-                ),
-                fields,
-            )
-            if df is None:
-                df = pd.DataFrame()
-            df = self._dedup(dataset, df)
-            self.store.save_raw_window(dataset, win.start, win.end, df)
-            summary.files += 1
-            summary.windows += 1
-            summary.rows += len(df)
-            self.store.update_state(dataset, win.end, summary.rows, summary.windows)
-        return summary
+        self._require_universe(spec)
+        if resume:
+            start = self.store.resume_start(dataset, start)
+        windows = spec.windows(start, end, window)
+        return self._run_windows(
+            dataset,
+            windows,
+            lambda win, summary: self._process_window(
+                spec, win, fields=fields, force=force, threshold=threshold, summary=summary
+            ),
+            order=order,
+        )
 
-    def fetch_share_float(
+    def fetch_stk_managers(
         self,
         start: date,
         end: date,
@@ -166,111 +362,457 @@ class ListedCompanyFetcher:
         window: str,
         resume: bool,
         force: bool,
-        threshold: int = DEFAULT_SHARE_FLOAT_THRESHOLD,
+        order: str = ORDER_OLDEST_FIRST,
     ) -> FetchSummary:
-        dataset = DATASET_SHARE_FLOAT
-        fields = self._resolve_fields(dataset)
-        state = self.store.load_state(dataset)
-        if resume and state and state.last_end_date:
-            start = max(start, parse_yyyymmdd(state.last_end_date) + timedelta(days=1))
-        windows = self._iter_windows(window, start, end)
-        summary = FetchSummary(dataset=dataset)
-        for win in windows:
-            summary = self._process_share_float_window(
-                win,
-                fields=fields,
-                force=force,
-                threshold=threshold,
-                summary=summary,
+        return self.fetch_dataset(
+            DATASET_STK_MANAGERS, start, end, window=window, resume=resume, force=force, order=order
+        )
+
+    def fetch_window(
+        self,
+        dataset: str,
+        win: DateWindow,
+        *,
+        force: bool,
+        threshold: int | None = None,
+    ) -> FetchSummary:
+        """Fetch a single event window without touching dataset state."""
+        return self._process_window(
+            get_spec(dataset),
+            win,
+            fields=self._resolve_fields(dataset),
+            force=force,
+            threshold=threshold,
+            summary=FetchSummary(dataset=dataset),
+        )
+
+    def _skip_existing(self, dataset: str, force: bool) -> Callable[[DateWindow], bool]:
+        def skip(win: DateWindow) -> bool:
+            return not force and self.store.raw_window_path(dataset, win.start, win.end).exists()
+
+        return skip
+
+    def _record(
+        self, dataset: str, win: DateWindow, df: pd.DataFrame | None, summary: FetchSummary
+    ) -> None:
+        summary.windows += 1
+        if df is None:
+            return
+        summary.paths.append(self.store.save_raw_window(dataset, win.start, win.end, df))
+        summary.files += 1
+        summary.rows += len(df)
+
+    def _process_window(
+        self,
+        spec: DatasetSpec,
+        win: DateWindow,
+        *,
+        fields: str | None,
+        force: bool,
+        threshold: int | None,
+        summary: FetchSummary,
+    ) -> FetchSummary:
+        for _ in self._drive(
+            self._process_steps(
+                spec, win, fields=fields, force=force, threshold=threshold, summary=summary
             )
+        ):
+            pass
         return summary
 
-    def _process_share_float_window(
+    def _process_steps(
         self,
+        spec: DatasetSpec,
         win: DateWindow,
         *,
         fields: str | None,
         force: bool,
-        threshold: int,
+        threshold: int | None,
         summary: FetchSummary,
-    ) -> FetchSummary:
-        dataset = DATASET_SHARE_FLOAT
-        path = self.store.raw_window_path(dataset, win.start, win.end)
-        if path.exists() and not force:
-            summary.windows += 1
-            return summary
+    ) -> Steps:
+        """Fetch and persist one window; shared by the sync and asyncio engines."""
+        skip = self._skip_existing(spec.name, force)
+        if spec.policy == POLICY_CODES and not skip(win):
+            yield from self._code_window_steps(
+                spec, win, fields=fields, force=force, threshold=threshold, summary=summary
+            )
+            return
+        yield from _forward(
+            self._window_steps(spec, win, fields=fields, threshold=threshold, skip=skip),
+            lambda item: self._record(spec.name, *item, summary),
+        )
 
-        label = f"share_float {format_yyyymmdd(win.start)}->{format_yyyymmdd(win.end)}"
-        df = self._fetch_with_fields(
-            label,
-            lambda fields=None, start=win.start, end=win.end: self.pro.share_float(
-                start_date=format_yyyymmdd(start),
-                end_date=format_yyyymmdd(end),
-                fields=fields,
-            ),
-            fields,
+    def _code_window_steps(
+        self,
+        spec: DatasetSpec,
+        win: DateWindow,
+        *,
+        fields: str | None,
+        force: bool,
+        threshold: int | None,
+        summary: FetchSummary,
+    ) -> Steps:
+        """Fan ``win`` out over the universe, persisting each ts_code batch as it lands.
+
+        The batch plan is checkpointed next to the batch files, so a run stopped
+        by the budget or a crash resumes at the first missing batch; the window
+        file is only assembled once every batch is on disk.
+        """
+        dataset = spec.name
+        threshold = threshold or spec.row_cap
+        if force:
+            self.store.discard_raw_parts(dataset, win.start, win.end)
+        batches = self.store.load_batch_plan(dataset, win.start, win.end)
+        if batches is None:
+            codes = self._require_universe(spec)
+            batches = split_evenly(codes, max(1, math.ceil(len(codes) / spec.codes_per_request)))
+            self.store.save_batch_plan(dataset, win.start, win.end, batches)
+        label = self._window_label(spec, win)
+        self._split_depth(dataset, 0)
+        for index, batch in enumerate(batches):
+            path = self.store.raw_part_path(dataset, win.start, win.end, index)
+            if path.exists():
+                continue
+            frames: list[pd.DataFrame] = []
+            yield from _forward(
+                self._code_batch_steps(
+                    spec,
+                    [batch],
+                    label=label,
+                    fields=fields,
+                    threshold=threshold,
+                    params=spec.date_params(win),
+                ),
+                lambda item: frames.append(item[1]),
+            )
+            self.store.write_frame(self._dedup(dataset, _concat(frames)), path)
+        rows, path = self.store.combine_raw_parts(dataset, win.start, win.end)
+        summary.windows += 1
+        summary.files += 1
+        summary.rows += rows
+        summary.paths.append(path)
+
+    @staticmethod
+    def _window_label(spec: DatasetSpec, win: DateWindow) -> str:
+        if win.start < win.end or not spec.dated:
+            return f"{spec.name} {format_yyyymmdd(win.start)}->{format_yyyymmdd(win.end)}"
+        return f"{spec.name} {format_yyyymmdd(win.start)}"
+
+    def _window_frames(
+        self,
+        spec: DatasetSpec,
+        win: DateWindow,
+        *,
+        fields: str | None,
+        threshold: int | None,
+        skip: Callable[[DateWindow], bool],
+    ) -> Iterator[tuple[DateWindow, pd.DataFrame | None]]:
+        return self._drive(
+            self._window_steps(spec, win, fields=fields, threshold=threshold, skip=skip)
         )
-        if df is None:
-            df = pd.DataFrame()
 
-        if len(df) >= threshold and win.start < win.end:
+    def _window_steps(
+        self,
+        spec: DatasetSpec,
+        win: DateWindow,
+        *,
+        fields: str | None,
+        threshold: int | None,
+        skip: Callable[[DateWindow], bool],
+        split: bool = True,
+    ) -> Steps:
+        """Yield ``(window, deduped frame)`` items; skipped windows yield ``None``.
+
+        Range windows at the row cap fan out to days, and days still at the cap to
+        ts_code batches. Single-date endpoints always fetch day by day.
+        """
+        dataset = spec.name
+        threshold = threshold or spec.row_cap
+        if skip(win):
+            yield win, None
+            return
+        if spec.policy == POLICY_DAY and win.start < win.end:
+            for day_win in iter_day_ranges(win.start, win.end):
+                yield from self._window_steps(
+                    spec, day_win, fields=fields, threshold=threshold, skip=skip
+                )
+            return
+
+        label = self._window_label(spec, win)
+        if spec.policy == POLICY_CODES:
+            self._split_depth(dataset, 0)
+            df = yield from self._code_fan_out_steps(
+                spec, win, label=label, fields=fields, threshold=threshold, codes=self._universe()
+            )
+            yield win, self._dedup(dataset, df)
+            return
+
+        self._split_depth(dataset, 0 if split else 1)
+        df = yield ApiCall(label, spec.api, spec.date_params(win), fields)
+        if not spec.autosplit or not threshold:
+            yield win, self._dedup(dataset, df)
+            return
+
+        if split and len(df) >= threshold and win.start < win.end:
             print(
                 f"{label} returned {len(df)} rows (near limit); splitting into daily windows."
             )
             for day_win in iter_day_ranges(win.start, win.end):
-                summary = self._process_share_float_day(
-                    day_win,
+                yield from self._window_steps(
+                    spec, day_win, fields=fields, threshold=threshold, skip=skip, split=False
+                )
+            return
+
+        if len(df) >= threshold:
+            # The codes of a truncated response are a subset of the day, so fanning
+            # out over them alone would silently drop the rest.
+            universe = self._universe()
+            codes = sorted(set(universe) | set(_column_values(df, "ts_code")))
+            if universe and len(codes) > 1:
+                df = yield from self._code_fan_out_steps(
+                    spec,
+                    win,
+                    label=label,
                     fields=fields,
-                    force=force,
                     threshold=threshold,
-                    summary=summary,
+                    codes=codes,
+                    depth=1 if split else 2,
                 )
-            self.store.update_state(dataset, win.end, summary.rows, summary.windows)
-            return summary
+                print(f"{label} hit the row cap; refetched as ts_code batches.")
+            else:
+                print(
+                    f"Warning: {label} returned {len(df)} rows; data may be truncated. "
+                    "Fetch stock_basic first to enable ts_code splitting."
+                )
+        yield win, self._dedup(dataset, df)
 
-        df = self._dedup(dataset, df)
-        self.store.save_raw_window(dataset, win.start, win.end, df)
-        summary.files += 1
-        summary.windows += 1
-        summary.rows += len(df)
-        self.store.update_state(dataset, win.end, summary.rows, summary.windows)
-        return summary
+    def fetch_share_float(
+        self,
+        start: date,
+        end: date,
+        *,
+        window: str,
+        resume: bool,
+        force: bool,
+        threshold: int = DEFAULT_SHARE_FLOAT_THRESHOLD,
+        order: str = ORDER_OLDEST_FIRST,
+    ) -> FetchSummary:
+        return self.fetch_dataset(
+            DATASET_SHARE_FLOAT,
+            start,
+            end,
+            window=window,
+            resume=resume,
+            force=force,
+            threshold=threshold,
+            order=order,
+        )
+
+    def _universe(self) -> list[str]:
+        if self._universe_cache is None:
+            self._universe_cache = load_universe(self.store)
+        return self._universe_cache
+
+    def _require_universe(self, spec: DatasetSpec) -> list[str]:
+        """The ts_code universe, which ``codes`` endpoints cannot be queried without."""
+        if spec.policy != POLICY_CODES:
+            return []
+        codes = self._universe()
+        if not codes:
+            raise ValueError(f"{spec.name} needs curated stock_basic for ts_codes; fetch it first")
+        return codes
 
-    def _process_share_float_day(
+    def _iter_code_batches(
         self,
-        win: DateWindow,
+        spec: DatasetSpec,
+        batches: list[list[str]],
         *,
+        label: str,
         fields: str | None,
-        force: bool,
         threshold: int,
-        summary: FetchSummary,
-    ) -> FetchSummary:
-        dataset = DATASET_SHARE_FLOAT
-        path = self.store.raw_window_path(dataset, win.start, win.end)
-        if path.exists() and not force:
-            summary.windows += 1
-            return summary
+        params: dict[str, str],
+    ) -> Iterator[tuple[list[str], pd.DataFrame]]:
+        return self._drive(
+            self._code_batch_steps(
+                spec, batches, label=label, fields=fields, threshold=threshold, params=params
+            )
+        )
 
-        label = f"share_float {format_yyyymmdd(win.start)}"
-        df = self._fetch_with_fields(
-            label,
-            lambda fields=None, start=win.start, end=win.end: self.pro.share_float(
-                start_date=format_yyyymmdd(start),
-                end_date=format_yyyymmdd(end),
+    def _code_batch_steps(
+        self,
+        spec: DatasetSpec,
+        batches: list[list[str]],
+        *,
+        label: str,
+        fields: str | None,
+        threshold: int,
+        params: dict[str, str],
+        depth: int = 0,
+    ) -> Steps:
+        """Query comma-joined ts_code batches, bisecting any batch that hits the row cap.
+
+        Yields ``(batch, frame)`` items. ``depth`` is the autosplit depth of the
+        initial batches, for progress reporting.
+        """
+        stack = [(batch, depth) for batch in reversed(batches)]
+        while stack:
+            batch, batch_depth = stack.pop()
+            self._split_depth(spec.name, batch_depth)
+            batch_label = f"{label} ts_code[{batch[0]}..{batch[-1]}]x{len(batch)}"
+            batch_params = {**params, "ts_code": ",".join(batch)}
+            df = yield ApiCall(batch_label, spec.api, batch_params, fields)
+            if len(df) >= threshold and len(batch) > 1:
+                halves = reversed(split_evenly(batch, 2))
+                stack.extend((half, batch_depth + 1) for half in halves)
+                continue
+            if len(df) >= threshold:
+                print(f"Warning: {batch_label} returned {len(df)} rows; data may be truncated.")
+            yield batch, df
+
+    def _code_fan_out_steps(
+        self,
+        spec: DatasetSpec,
+        win: DateWindow,
+        *,
+        label: str,
+        fields: str | None,
+        threshold: int,
+        codes: list[str],
+        depth: int = 0,
+    ) -> Steps:
+        """Query ``win`` as ts_code batches and return the merged pieces."""
+        batches = split_evenly(codes, max(2, math.ceil(len(codes) / spec.codes_per_request)))
+        frames: list[pd.DataFrame] = []
+        yield from _forward(
+            self._code_batch_steps(
+                spec,
+                batches,
+                label=label,
                 fields=fields,
+                threshold=threshold,
+                params=spec.date_params(win),
+                depth=depth,
             ),
-            fields,
+            lambda item: frames.append(item[1]),
         )
-        if df is None:
-            df = pd.DataFrame()
-        if len(df) >= threshold:
-            print(
-                f"Warning: {label} returned {len(df)} rows; data may be truncated."
+        return _concat(frames) if frames else pd.DataFrame()
+
+    def fetch_by_codes(
+        self,
+        dataset: str,
+        codes: list[str],
+        *,
+        start: date | None = None,
+        end: date | None = None,
+        row_cap: int | None = None,
+    ) -> FetchSummary:
+        """Targeted refresh: fetch ``dataset`` for ``codes`` with as few requests as possible.
+
+        Codes are packed into comma-joined batches sized from historical rows per
+        stock in ``curated/`` so each request stays under the row cap; batches that
+        still hit the cap are bisected. Each batch lands as its own raw file, which
+        sorts after the date windows so consolidation keeps the refreshed rows.
+        """
+        spec = get_spec(dataset)
+        cap = row_cap or spec.row_cap
+        fields = self._resolve_fields(dataset)
+        params: dict[str, str] = {}
+        if start and spec.start_param:
+            params[spec.start_param] = format_yyyymmdd(start)
+        if end and spec.end_param:
+            params[spec.end_param] = format_yyyymmdd(end)
+        batches = pack_code_batches(
+            sorted(set(codes)),
+            rows_per_code(self.store, dataset),
+            cap,
+            max_codes=spec.codes_per_request,
+        )
+        run_stamp = datetime.now().strftime("%Y%m%d%H%M%S")
+        summary = FetchSummary(dataset=dataset)
+        for index, (_, df) in enumerate(
+            self._iter_code_batches(
+                spec, batches, label=dataset, fields=fields, threshold=cap, params=params
             )
-        df = self._dedup(dataset, df)
-        self.store.save_raw_window(dataset, win.start, win.end, df)
-        summary.files += 1
-        summary.windows += 1
-        summary.rows += len(df)
-        self.store.update_state(dataset, win.end, summary.rows, summary.windows)
+        ):
+            df = self._dedup(dataset, df)
+            path = self.store.raw_codes_path(dataset, run_stamp, index)
+            self.store.write_frame(df, path)
+            summary.paths.append(path)
+            summary.windows += 1
+            summary.files += 1
+            summary.rows += len(df)
+        print(f"{dataset}: {len(codes)} code(s) fetched in {summary.windows} request(s).")
         return summary
+
+    def _ordered_windows(
+        self, spec: DatasetSpec, window: str | None, start: date, end: date, order: str
+    ) -> list[DateWindow]:
+        windows = spec.windows(start, end, window)
+        if order == ORDER_NEWEST_FIRST:
+            return windows[::-1]
+        if order != ORDER_OLDEST_FIRST:
+            raise ValueError(f"Unsupported order: {order}")
+        return windows
+
+    def iter_dataset(
+        self,
+        dataset: str,
+        start: date,
+        end: date,
+        *,
+        window: str | None = None,
+        threshold: int | None = None,
+        order: str = ORDER_OLDEST_FIRST,
+        sink: Callable[[WindowFrame], None] | None = None,
+    ) -> Iterator[WindowFrame]:
+        """Yield deduped frames of any registered dataset per window as they arrive.
+
+        Nothing is written and no state is touched unless ``sink`` is given, e.g.
+        ``raw_window_sink(store)`` to keep the usual ``raw/`` files as a side effect.
+        """
+        spec = get_spec(dataset)
+        fields = self._resolve_fields(dataset)
+        self._require_universe(spec)
+        for win in self._ordered_windows(spec, window, start, end, order):
+            for frame_win, df in self._window_frames(
+                spec, win, fields=fields, threshold=threshold, skip=lambda _: False
+            ):
+                item = WindowFrame(dataset=dataset, window=frame_win, frame=df)
+                if sink is not None:
+                    sink(item)
+                yield item
+
+    def iter_stk_managers(
+        self,
+        start: date,
+        end: date,
+        *,
+        window: str = DEFAULT_MANAGERS_WINDOW,
+        order: str = ORDER_OLDEST_FIRST,
+        sink: Callable[[WindowFrame], None] | None = None,
+    ) -> Iterator[WindowFrame]:
+        """Yield deduped ``stk_managers`` frames per window as they arrive."""
+        return self.iter_dataset(
+            DATASET_STK_MANAGERS, start, end, window=window, order=order, sink=sink
+        )
+
+    def iter_share_float(
+        self,
+        start: date,
+        end: date,
+        *,
+        window: str = DEFAULT_SHARE_FLOAT_WINDOW,
+        threshold: int = DEFAULT_SHARE_FLOAT_THRESHOLD,
+        order: str = ORDER_OLDEST_FIRST,
+        sink: Callable[[WindowFrame], None] | None = None,
+    ) -> Iterator[WindowFrame]:
+        """Yield deduped ``share_float`` frames per window, autosplitting like the fetcher."""
+        return self.iter_dataset(
+            DATASET_SHARE_FLOAT,
+            start,
+            end,
+            window=window,
+            threshold=threshold,
+            order=order,
+            sink=sink,
+        )
@@ -0,0 +1,125 @@
+"""In-flight write journal and crash recovery for ``DataStore`` files."""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import socket
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Callable, Iterator
+
+# Entries and temp files from other hosts (or without a journal entry) are only
+# considered abandoned after this long, so workers sharing a store are safe.
+DEFAULT_STALE_SECONDS = 3600.0
+
+
+def temp_path(path: Path) -> Path:
+    return path.with_name(f"{path.name}.tmp")
+
+
+def _fsync(path: Path) -> None:
+    """Flush ``path`` to disk so the rename never exposes a file with unwritten blocks."""
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        os.fsync(fd)
+    finally:
+        os.close(fd)
+
+
+def _pid_alive(pid: int) -> bool:
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    except OSError:
+        return False
+    return True
+
+
+class WriteJournal:
+    """One small JSON file per write in progress under ``state/inflight``.
+
+    The entry is created before the temp file and removed after the rename, so a
+    crash leaves exactly the entries whose targets need checking.
+    """
+
+    def __init__(self, directory: Path) -> None:
+        self.directory = directory
+
+    def _entry_path(self, path: Path) -> Path:
+        digest = hashlib.sha1(str(path.resolve()).encode("utf-8")).hexdigest()[:16]
+        return self.directory / f"{path.name}.{digest}.json"
+
+    @contextmanager
+    def inflight(self, path: Path) -> Iterator[Path]:
+        """Yield the temp path to write; it replaces ``path`` when the block succeeds."""
+        tmp = temp_path(path)
+        entry = self._entry_path(path)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        entry.write_text(
+            json.dumps(
+                {
+                    "path": str(path),
+                    "tmp": str(tmp),
+                    "pid": os.getpid(),
+                    "host": socket.gethostname(),
+                    "started": time.time(),
+                }
+            ),
+            encoding="utf-8",
+        )
+        try:
+            yield tmp
+            _fsync(tmp)
+            os.replace(tmp, path)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        finally:
+            entry.unlink(missing_ok=True)
+
+    def _abandoned(self, record: dict, now: float, stale_seconds: float) -> bool:
+        if record.get("host") == socket.gethostname():
+            return not _pid_alive(int(record.get("pid", -1)))
+        return now - float(record.get("started", 0)) > stale_seconds
+
+    def recover(
+        self,
+        roots: list[Path],
+        validate: Callable[[Path], bool],
+        *,
+        stale_seconds: float = DEFAULT_STALE_SECONDS,
+    ) -> list[Path]:
+        """Discard temp files and unreadable targets left by interrupted writes."""
+        removed: list[Path] = []
+        now = time.time()
+        if self.directory.exists():
+            for entry in sorted(self.directory.glob("*.json")):
+                try:
+                    record = json.loads(entry.read_text(encoding="utf-8"))
+                except (OSError, ValueError):
+                    entry.unlink(missing_ok=True)
+                    continue
+                if not self._abandoned(record, now, stale_seconds):
+                    continue
+                tmp, target = Path(record["tmp"]), Path(record["path"])
+                if tmp.exists():
+                    tmp.unlink()
+                    removed.append(tmp)
+                if target.exists() and not validate(target):
+                    target.unlink()
+                    removed.append(target)
+                entry.unlink(missing_ok=True)
+        for root in roots:
+            if not root.exists():
+                continue
+            for tmp in root.rglob("*.tmp"):
+                if now - tmp.stat().st_mtime > stale_seconds:
+                    tmp.unlink(missing_ok=True)
+                    removed.append(tmp)
+        return removed
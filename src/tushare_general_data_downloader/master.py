@@ -0,0 +1,162 @@
+"""Denormalized security master: stock_basic + stock_company + serving managers.
+
+Written as an uncompressed Arrow IPC file so services can memory-map it; needs
+the optional ``pyarrow`` dependency (``pip install .[parquet]``).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+import pandas as pd
+
+from .constants import (
+    DATASET_STK_MANAGERS,
+    DATASET_STOCK_BASIC,
+    DATASET_STOCK_COMPANY,
+    TEXT_COLUMNS,
+)
+from .journal import temp_path
+from .storage import DataStore
+from .tenures import END_COLUMN, OPEN_END, load_tenure_index
+
+MASTER_NAME = "security_master"
+MASTER_INPUTS = (DATASET_STOCK_BASIC, DATASET_STOCK_COMPANY, DATASET_STK_MANAGERS)
+# stk_managers title -> prefix of the attached name/begin_date columns.
+MANAGER_ROLES = {"董事长": "mgr_chairman", "总经理": "mgr_manager"}
+
+
+@dataclass
+class MasterResult:
+    path: Path
+    rows: int
+    rebuilt: bool
+
+
+def master_path(store: DataStore) -> Path:
+    return store.curated_dir() / f"{MASTER_NAME}.arrow"
+
+
+def manifest_path(store: DataStore) -> Path:
+    return store.curated_dir() / f"{MASTER_NAME}.json"
+
+
+def _write_manifest(path: Path, manifest: dict) -> None:
+    tmp = temp_path(path)
+    tmp.write_text(json.dumps(manifest, indent=2), encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _file_digest(path: Path) -> str:
+    digest = hashlib.sha1()
+    with path.open("rb") as handle:
+        for chunk in iter(lambda: handle.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def input_fingerprints(store: DataStore, cached: dict | None = None) -> dict[str, dict]:
+    """Content digests of the curated inputs, reusing ``cached`` ones whose size/mtime match.
+
+    Dimension snapshots skip unchanged writes, but consolidating or merging
+    stk_managers rewrites its curated file even when no row changed, so the
+    mtime alone would trigger needless rebuilds.
+    """
+    cached = cached or {}
+    prints: dict[str, dict] = {}
+    for dataset in MASTER_INPUTS:
+        path = store.curated_path(dataset)
+        if not path.exists():
+            continue
+        stat = path.stat()
+        entry = {"size": stat.st_size, "mtime_ns": stat.st_mtime_ns}
+        previous = cached.get(dataset, {})
+        if all(previous.get(key) == value for key, value in entry.items()):
+            entry["sha1"] = previous["sha1"]
+        else:
+            entry["sha1"] = _file_digest(path)
+        prints[dataset] = entry
+    return prints
+
+
+def serving_managers(store: DataStore) -> pd.DataFrame:
+    """Latest open-ended tenure per ts_code for each role in ``MANAGER_ROLES``."""
+    rows = load_tenure_index(store).rows
+    if rows.empty or "title" not in rows.columns:
+        return pd.DataFrame(columns=["ts_code"])
+    serving = rows[(rows[END_COLUMN] == OPEN_END) & rows["title"].isin(list(MANAGER_ROLES))]
+    serving = serving.astype({"title": str}).drop_duplicates(["ts_code", "title"], keep="last")
+    wide = serving.pivot(index="ts_code", columns="title", values=["name", "begin_date"])
+    wide.columns = [f"{MANAGER_ROLES[title]}_{field}" for field, title in wide.columns]
+    return wide.reset_index()
+
+
+def build_security_master(store: DataStore) -> pd.DataFrame:
+    basic_path = store.curated_path(DATASET_STOCK_BASIC)
+    if not basic_path.exists():
+        return pd.DataFrame()
+    master = store.read_frame(basic_path, text=True)
+    company_path = store.curated_path(DATASET_STOCK_COMPANY)
+    if company_path.exists():
+        company = store.read_frame(company_path, text=True)
+        company = company.drop(
+            columns=[col for col in company.columns if col in master.columns and col != "ts_code"]
+        )
+        master = master.merge(company, on="ts_code", how="left")
+    managers = serving_managers(store)
+    if len(managers.columns) > 1:
+        master = master.merge(managers.astype("string"), on="ts_code", how="left")
+    master = master.sort_values("ts_code", kind="stable").reset_index(drop=True)
+    for column in TEXT_COLUMNS.get(DATASET_STOCK_COMPANY, []):
+        if column in master.columns:
+            master[column] = master[column].astype("category")
+    return master
+
+
+def refresh_security_master(
+    store: DataStore, *, force: bool = False, warn: bool = False
+) -> MasterResult | None:
+    """Rebuild the master only when an input's content changed since the last build.
+
+    Without pyarrow the master is skipped silently, since fetches refresh it
+    automatically; pass ``warn`` when the caller asked for it explicitly.
+    """
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        if warn:
+            print("Warning: security master needs pyarrow (pip install .[parquet]); skipped.")
+        return None
+    path = master_path(store)
+    manifest = manifest_path(store)
+    previous = json.loads(manifest.read_text(encoding="utf-8")) if manifest.exists() else {}
+    prints = input_fingerprints(store, previous.get("inputs"))
+    if DATASET_STOCK_BASIC not in prints:
+        return None
+    unchanged = {name: entry["sha1"] for name, entry in prints.items()} == {
+        name: entry.get("sha1") for name, entry in previous.get("inputs", {}).items()
+    }
+    if unchanged and path.exists() and not force:
+        if prints != previous.get("inputs"):
+            _write_manifest(manifest, {**previous, "inputs": prints})
+        return MasterResult(path=path, rows=int(previous.get("rows", 0)), rebuilt=False)
+
+    master = build_security_master(store)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".arrow.tmp")
+    master.to_feather(tmp, compression="uncompressed")
+    tmp.replace(path)
+    _write_manifest(manifest, {"rows": len(master), "inputs": prints})
+    return MasterResult(path=path, rows=len(master), rebuilt=True)
+
+
+def load_security_master(store: DataStore) -> pd.DataFrame:
+    """Memory-map the master and return it indexed by ts_code."""
+    import pyarrow.feather as feather
+
+    table = feather.read_table(master_path(store), memory_map=True)
+    return table.to_pandas().set_index("ts_code")
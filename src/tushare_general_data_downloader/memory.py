@@ -0,0 +1,160 @@
+"""Memory budget, per-stage peak tracking and hash-partitioned spill files."""
+
+from __future__ import annotations
+
+import math
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import pandas as pd
+
+SIZE_UNITS = {"k": 1 << 10, "m": 1 << 20, "g": 1 << 30, "t": 1 << 40}
+# Fraction of the limit one spill partition may occupy once loaded: the partition,
+# its dedup copy and the matching slice of the previous curated file coexist.
+PARTITION_SHARE = 0.25
+
+
+def parse_size(raw: str | None) -> int | None:
+    """Parse ``512M``, ``2G``, ``1.5g`` or plain bytes."""
+    if not raw:
+        return None
+    value = raw.strip().lower().removesuffix("b")
+    scale = SIZE_UNITS.get(value[-1:], None)
+    number = value[:-1] if scale else value
+    try:
+        return int(float(number) * (scale or 1))
+    except ValueError as exc:
+        raise SystemExit(f"Invalid size: {raw} (examples: 512M, 2G)") from exc
+
+
+def format_size(nbytes: int) -> str:
+    for unit in ("B", "KiB", "MiB", "GiB"):
+        if abs(nbytes) < 1024 or unit == "GiB":
+            return f"{nbytes:.0f} {unit}" if unit == "B" else f"{nbytes:.1f} {unit}"
+        nbytes /= 1024
+    return f"{nbytes:.1f} GiB"
+
+
+def current_rss() -> int:
+    """Resident set size of this process in bytes (0 when unavailable)."""
+    try:
+        with open("/proc/self/statm", encoding="ascii") as handle:
+            return int(handle.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class MemoryMonitor:
+    """Track a byte limit and the peak RSS observed in each named stage.
+
+    Peaks are sampled at stage boundaries and at ``checkpoint`` calls, which the
+    spill-aware code paths make after every chunk they load.
+    """
+
+    def __init__(self, limit: int | None) -> None:
+        self.limit = limit
+        self.peaks: dict[str, int] = {}
+        self._active: list[str] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def stage(self, name: str) -> Iterator[None]:
+        with self._lock:
+            self._active.append(name)
+        self.checkpoint()
+        try:
+            yield
+        finally:
+            self.checkpoint()
+            with self._lock:
+                self._active.remove(name)
+
+    def checkpoint(self) -> int:
+        rss = current_rss()
+        with self._lock:
+            for name in self._active:
+                self.peaks[name] = max(self.peaks.get(name, 0), rss)
+        return rss
+
+    def partitions_for(self, estimated_bytes: int) -> int:
+        """How many spill partitions keep each one within the budget (1 = in memory)."""
+        if not self.limit or estimated_bytes <= self.limit * PARTITION_SHARE * 2:
+            return 1
+        return max(2, math.ceil(estimated_bytes / (self.limit * PARTITION_SHARE)))
+
+    def report(self) -> list[str]:
+        lines = [f"- {name}: peak rss {format_size(peak)}" for name, peak in self.peaks.items()]
+        if self.limit:
+            lines.insert(0, f"Memory limit {format_size(self.limit)}:")
+        return lines
+
+
+def estimate_frame_bytes(paths: list[Path], sample: pd.DataFrame, sample_path: Path) -> int:
+    """Scale total on-disk size by the in-memory/on-disk ratio of one loaded file.
+
+    Pass the largest file as the sample: a near-empty one is mostly fixed
+    overhead and would inflate the ratio.
+    """
+    if sample.empty:
+        ratio = 1.0
+    else:
+        on_disk = max(sample_path.stat().st_size, 1)
+        ratio = max(sample.memory_usage(index=True, deep=True).sum() / on_disk, 1.0)
+    return int(sum(path.stat().st_size for path in paths) * ratio)
+
+
+class PartitionSpill:
+    """Hash-partition rows by a key column into per-partition pickle chunks on disk.
+
+    Rows with equal keys always land in the same partition, and chunks are read
+    back in the order they were added, so ``keep="last"`` dedup per partition
+    gives the same rows as a dedup over the full concatenation.
+    """
+
+    def __init__(self, directory: Path, partitions: int, key: str) -> None:
+        self.directory = directory
+        self.partitions = partitions
+        self.key = key
+        self._chunks = 0
+        directory.mkdir(parents=True, exist_ok=True)
+
+    def add(self, df: pd.DataFrame) -> None:
+        if df.empty:
+            return
+        if self.key in df.columns:
+            buckets = pd.util.hash_array(df[self.key].astype(str).to_numpy()) % self.partitions
+        else:
+            buckets = pd.util.hash_pandas_object(df, index=False).to_numpy() % self.partitions
+        for partition, part in df.groupby(buckets, sort=False):
+            path = self.directory / f"p{int(partition):04d}" / f"{self._chunks:08d}.pkl"
+            path.parent.mkdir(exist_ok=True)
+            part.to_pickle(path)
+        self._chunks += 1
+
+    def read(self, partition: int) -> list[pd.DataFrame]:
+        directory = self.directory / f"p{partition:04d}"
+        if not directory.exists():
+            return []
+        return [pd.read_pickle(path) for path in sorted(directory.glob("*.pkl"))]
+
+
+@contextmanager
+def spill_directory(base: Path) -> Iterator[Path]:
+    base.mkdir(parents=True, exist_ok=True)
+    directory = Path(tempfile.mkdtemp(prefix="spill-", dir=base))
+    try:
+        yield directory
+    finally:
+        shutil.rmtree(directory, ignore_errors=True)
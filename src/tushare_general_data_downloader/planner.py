@@ -0,0 +1,118 @@
+"""Offline request planning for windowed backfills."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+
+from .batching import load_universe
+from .registry import POLICY_CODES, POLICY_DAY, POLICY_RANGE, get_spec
+from .storage import DataStore
+from .windowing import iter_day_ranges, window_days
+
+
+@dataclass
+class DatasetPlan:
+    dataset: str
+    windows: int = 0
+    skipped: int = 0
+    requests: int = 0
+    expected_rows: int = 0
+    expected_splits: int = 0
+    rows_per_day: float | None = None
+
+    def eta_seconds(self, min_interval: float) -> float:
+        return self.requests * min_interval
+
+
+def historical_density(store: DataStore, dataset: str) -> float | None:
+    """Average rows per calendar day across existing raw windows."""
+    rows = 0
+    days = 0
+    for path in store.iter_raw_files(dataset):
+        win = store.parse_raw_window(dataset, path)
+        if win is None:
+            continue
+        rows += store.count_rows(path)
+        days += window_days(win)
+    if not days:
+        return None
+    return rows / days
+
+
+def plan_windowed(
+    store: DataStore,
+    dataset: str,
+    start: date,
+    end: date,
+    *,
+    window: str | None,
+    resume: bool,
+    force: bool,
+    threshold: int | None = None,
+) -> DatasetPlan:
+    """Mirror the fetcher's resume/skip/autosplit decisions without calling the API."""
+    spec = get_spec(dataset)
+    if resume:
+        start = store.resume_start(dataset, start)
+    density = historical_density(store, dataset)
+    windows = spec.windows(start, end, window)
+    codes = len(load_universe(store)) if spec.policy == POLICY_CODES else 0
+    plan = DatasetPlan(dataset=dataset, windows=len(windows), rows_per_day=density)
+    for win in windows:
+        path = store.raw_window_path(dataset, win.start, win.end)
+        if path.exists() and not force:
+            plan.skipped += 1
+            continue
+        if spec.policy == POLICY_DAY:
+            # Single-date endpoints write one file per day, so skip at day level.
+            days = [
+                day
+                for day in iter_day_ranges(win.start, win.end)
+                if force or not store.raw_window_path(dataset, day.start, day.end).exists()
+            ]
+            if not days:
+                plan.skipped += 1
+                continue
+            plan.requests += len(days)
+        else:
+            plan.requests += spec.requests_per_window(win, codes)
+        expected = density * window_days(win) if density else 0.0
+        plan.expected_rows += round(expected)
+        if spec.policy != POLICY_RANGE or not spec.autosplit:
+            continue
+        if threshold and expected >= threshold and win.start < win.end:
+            plan.expected_splits += 1
+            for day in iter_day_ranges(win.start, win.end):
+                day_path = store.raw_window_path(dataset, day.start, day.end)
+                if day_path.exists() and not force:
+                    continue
+                plan.requests += 1
+    return plan
+
+
+def plan_snapshot(store: DataStore, dataset: str, requests: int) -> DatasetPlan:
+    curated = store.curated_path(dataset)
+    rows = store.count_rows(curated) if curated.exists() else 0
+    return DatasetPlan(dataset=dataset, windows=requests, requests=requests, expected_rows=rows)
+
+
+def format_duration(seconds: float) -> str:
+    total = int(round(seconds))
+    hours, rest = divmod(total, 3600)
+    minutes, secs = divmod(rest, 60)
+    if hours:
+        return f"{hours}h{minutes:02d}m{secs:02d}s"
+    if minutes:
+        return f"{minutes}m{secs:02d}s"
+    return f"{secs}s"
+
+
+def format_plan(plan: DatasetPlan, min_interval: float) -> str:
+    density = f"{plan.rows_per_day:.1f}" if plan.rows_per_day is not None else "n/a"
+    return (
+        f"- {plan.dataset}: windows={plan.windows} skipped={plan.skipped} "
+        f"requests={plan.requests} expected_rows~{plan.expected_rows} "
+        f"splits~{plan.expected_splits} rows/day={density} "
+        f"eta={format_duration(plan.eta_seconds(min_interval))}"
+    )
@@ -0,0 +1,273 @@
+"""Live per-dataset progress, throughput and ETA for long backfills."""
+
+from __future__ import annotations
+
+import json
+import os
+import sys
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass, field
+from datetime import datetime
+from pathlib import Path
+from typing import Callable, TextIO
+
+from .planner import format_duration
+
+# Completions kept for the rolling rate behind the ETA; old windows (e.g. ones
+# skipped because their files already existed) stop skewing it after this many.
+ETA_SAMPLES = 20
+RPM_WINDOW_SECONDS = 60.0
+DEFAULT_STATUS_INTERVAL = 5.0
+
+STATE_RUNNING = "running"
+STATE_BACKOFF = "backoff"
+STATE_DONE = "done"
+STATE_BUDGET = "budget-exhausted"
+
+
+@dataclass
+class DatasetProgress:
+    dataset: str
+    windows_total: int = 0
+    windows_done: int = 0
+    rows: int = 0
+    requests: int = 0
+    retries: int = 0
+    state: str = STATE_RUNNING
+    split_depth: int = 0
+    max_split_depth: int = 0
+    started: float = 0.0
+    finished: float | None = None
+    backoff_until: float | None = None
+    last_error: str = ""
+    _completions: deque = field(
+        default_factory=lambda: deque(maxlen=ETA_SAMPLES), repr=False, compare=False
+    )
+    _requests: deque = field(default_factory=deque, repr=False, compare=False)
+
+
+def dataset_of(label: str) -> str:
+    """Request labels start with the dataset name, e.g. ``share_float 20240101->...``."""
+    return label.split(" ", 1)[0]
+
+
+class ProgressTracker:
+    """Thread-safe progress counters fed by the fetch loops and ``FetchRunner``.
+
+    ``start`` launches a daemon thread that redraws a one-line TTY display and
+    rewrites the JSON status file every ``interval`` seconds, so a run stuck in
+    backoff still refreshes its status.
+    """
+
+    def __init__(
+        self,
+        *,
+        rpm: float = 0.0,
+        status_file: Path | None = None,
+        interval: float = DEFAULT_STATUS_INTERVAL,
+        stream: TextIO | None = None,
+        display: bool | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.rpm = rpm
+        self.status_file = status_file
+        self.interval = interval
+        self.stream = stream or sys.stderr
+        self.display = self.stream.isatty() if display is None else display
+        self.clock = clock
+        self.started = clock()
+        self.datasets: dict[str, DatasetProgress] = {}
+        self._requests: deque = deque()
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+        self._drawn = False
+        self.failed_cycles = 0
+        self.last_error = ""
+
+    def _entry(self, dataset: str) -> DatasetProgress:
+        entry = self.datasets.get(dataset)
+        if entry is None:
+            entry = DatasetProgress(dataset=dataset, started=self.clock())
+            self.datasets[dataset] = entry
+        return entry
+
+    def begin(self, dataset: str, windows: int) -> None:
+        with self._lock:
+            entry = self._entry(dataset)
+            entry.windows_total += windows
+            entry.state = STATE_RUNNING
+            entry.finished = None
+            entry._completions.append((self.clock(), entry.windows_done))
+
+    def window_done(self, dataset: str, rows: int = 0) -> None:
+        with self._lock:
+            entry = self._entry(dataset)
+            entry.windows_done += 1
+            entry.rows += rows
+            entry.split_depth = 0
+            entry._completions.append((self.clock(), entry.windows_done))
+
+    def request(self, label: str) -> None:
+        now = self.clock()
+        with self._lock:
+            entry = self._entry(dataset_of(label))
+            entry.requests += 1
+            entry.state = STATE_RUNNING
+            entry.backoff_until = None
+            entry._requests.append(now)
+            self._requests.append(now)
+
+    def backoff(self, label: str, delay: float, error: BaseException) -> None:
+        with self._lock:
+            entry = self._entry(dataset_of(label))
+            entry.retries += 1
+            entry.state = STATE_BACKOFF
+            entry.backoff_until = self.clock() + delay
+            entry.last_error = f"{type(error).__name__}: {error}"
+
+    def split(self, dataset: str, depth: int) -> None:
+        """Record the autosplit depth of the request about to run (0 = planned window)."""
+        with self._lock:
+            entry = self._entry(dataset)
+            entry.split_depth = depth
+            entry.max_split_depth = max(entry.max_split_depth, depth)
+
+    def finish(self, dataset: str, *, exhausted: bool = False) -> None:
+        with self._lock:
+            entry = self._entry(dataset)
+            entry.state = STATE_BUDGET if exhausted else STATE_DONE
+            entry.split_depth = 0
+            entry.finished = self.clock()
+
+    def cycle_failed(self, error: BaseException) -> None:
+        """Record a watch cycle that raised, and publish it right away."""
+        with self._lock:
+            self.failed_cycles += 1
+            self.last_error = f"{type(error).__name__}: {error}"
+        if self.status_file is not None:
+            self.write_status()
+
+    @staticmethod
+    def _recent(requests: deque, now: float) -> int:
+        while requests and requests[0] < now - RPM_WINDOW_SECONDS:
+            requests.popleft()
+        return len(requests)
+
+    def _achieved_rpm(self, requests: deque, now: float) -> float:
+        span = min(now - self.started, RPM_WINDOW_SECONDS)
+        if span <= 0:
+            return 0.0
+        return self._recent(requests, now) * 60.0 / span
+
+    @staticmethod
+    def _eta(entry: DatasetProgress) -> float | None:
+        remaining = entry.windows_total - entry.windows_done
+        if remaining <= 0:
+            return 0.0
+        if len(entry._completions) < 2:
+            return None
+        (first_at, first_done), (last_at, last_done) = entry._completions[0], entry._completions[-1]
+        if last_done <= first_done or last_at <= first_at:
+            return None
+        return remaining * (last_at - first_at) / (last_done - first_done)
+
+    def snapshot(self) -> dict:
+        now = self.clock()
+        with self._lock:
+            datasets = {}
+            for name, entry in self.datasets.items():
+                elapsed = (entry.finished or now) - entry.started
+                eta = None if entry.finished is not None else self._eta(entry)
+                record = {
+                    key: value for key, value in asdict(entry).items() if not key.startswith("_")
+                }
+                record.update(
+                    elapsed_seconds=round(elapsed, 1),
+                    rows_per_sec=round(entry.rows / elapsed, 2) if elapsed > 0 else 0.0,
+                    rpm=round(self._achieved_rpm(entry._requests, now), 1),
+                    eta_seconds=round(eta, 1) if eta is not None else None,
+                    backoff_remaining=(
+                        round(max(entry.backoff_until - now, 0.0), 1)
+                        if entry.backoff_until is not None
+                        else None
+                    ),
+                )
+                for key in ("started", "finished", "backoff_until"):
+                    record.pop(key)
+                datasets[name] = record
+            return {
+                "updated_at": datetime.now().isoformat(timespec="seconds"),
+                "pid": os.getpid(),
+                "elapsed_seconds": round(now - self.started, 1),
+                "rpm_limit": self.rpm,
+                "rpm": round(self._achieved_rpm(self._requests, now), 1),
+                "requests": sum(entry.requests for entry in self.datasets.values()),
+                "failed_cycles": self.failed_cycles,
+                "last_error": self.last_error,
+                "datasets": datasets,
+            }
+
+    def write_status(self) -> Path | None:
+        """Replace the status file atomically so pollers never read a partial document."""
+        if self.status_file is None:
+            return None
+        self.status_file.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.status_file.with_name(f"{self.status_file.name}.tmp")
+        tmp.write_text(json.dumps(self.snapshot(), indent=2), encoding="utf-8")
+        os.replace(tmp, self.status_file)
+        return self.status_file
+
+    def format_line(self, status: dict | None = None) -> str:
+        status = status or self.snapshot()
+        parts = []
+        for name, item in status["datasets"].items():
+            total = item["windows_total"]
+            done = item["windows_done"]
+            percent = f" {done * 100 // total}%" if total else ""
+            if item["state"] == STATE_BACKOFF:
+                tail = f"backoff {format_duration(item['backoff_remaining'] or 0)}"
+            elif item["state"] != STATE_RUNNING:
+                tail = item["state"]
+            else:
+                eta = item["eta_seconds"]
+                tail = f"eta {format_duration(eta) if eta is not None else '?'}"
+            depth = f" split={item['split_depth']}" if item["split_depth"] else ""
+            parts.append(
+                f"{name} {done}/{total}{percent} {item['rows_per_sec']:.0f} rows/s{depth} {tail}"
+            )
+        limit = f"/{status['rpm_limit']:g}" if status["rpm_limit"] else ""
+        parts.append(f"rpm {status['rpm']:.0f}{limit}")
+        return " | ".join(parts)
+
+    def refresh(self) -> None:
+        status = self.snapshot()
+        if self.display:
+            self.stream.write("\r\x1b[K" + self.format_line(status))
+            self.stream.flush()
+            self._drawn = True
+        if self.status_file is not None:
+            self.write_status()
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval):
+            self.refresh()
+
+    def start(self) -> "ProgressTracker":
+        if self._thread is None and (self.display or self.status_file is not None):
+            self._thread = threading.Thread(target=self._loop, name="progress", daemon=True)
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """Stop the refresh thread, write the final status and end the TTY line."""
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self.refresh()
+        if self._drawn:
+            self.stream.write("\n")
+            self.stream.flush()
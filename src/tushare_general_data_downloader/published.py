@@ -0,0 +1,107 @@
+"""Versioned Arrow IPC copies of curated datasets, shared across processes via mmap.
+
+Needs the optional ``pyarrow`` dependency (``pip install .[parquet]``).
+"""
+
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+from .storage import DataStore
+
+POINTER_NAME = "CURRENT"
+DEFAULT_KEEP_VERSIONS = 3
+
+
+def published_dir(store: DataStore, dataset: str) -> Path:
+    return store.base_dir / "published" / dataset
+
+
+def _version_name(version: int) -> str:
+    return f"v{version:06d}.arrow"
+
+
+def published_version(store: DataStore, dataset: str) -> int:
+    pointer = published_dir(store, dataset) / POINTER_NAME
+    if not pointer.exists():
+        return 0
+    return int(pointer.read_text(encoding="utf-8").strip()[1:7])
+
+
+def _encode(df, schema: pa.Schema | None) -> pa.Table:
+    if isinstance(df, pa.Table):
+        table = df
+    elif schema is None:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    else:
+        table = pa.Table.from_pandas(df.reindex(columns=schema.names), preserve_index=False)
+    return table if schema is None else table.cast(schema)
+
+
+def _dictionary_encode(store: DataStore, dataset: str, table: pa.Table) -> pa.Table:
+    for name in store.text_columns(dataset):
+        if name in table.column_names and not pa.types.is_dictionary(table.schema.field(name).type):
+            index = table.column_names.index(name)
+            table = table.set_column(index, name, pc.dictionary_encode(table.column(name)))
+    return table
+
+
+def publish_ipc(
+    store: DataStore, dataset: str, df, *, keep: int = DEFAULT_KEEP_VERSIONS
+) -> Path | None:
+    """Write ``df``, or an iterable of chunks, as the next version and repoint ``CURRENT``.
+
+    Returns None, leaving ``CURRENT`` untouched, when the iterable yields no chunks.
+
+    Versions are never rewritten in place, so a process that has one mapped keeps
+    a consistent view; the oldest versions beyond ``keep`` are unlinked, which
+    POSIX allows while they are still mapped.
+    """
+    directory = published_dir(store, dataset)
+    directory.mkdir(parents=True, exist_ok=True)
+    version = published_version(store, dataset) + 1
+    path = directory / _version_name(version)
+    tmp = path.with_suffix(".arrow.tmp")
+    single = isinstance(df, (pd.DataFrame, pa.Table))
+    writer = sink = schema = None
+    try:
+        for chunk in [df] if single else df:
+            table = _encode(chunk, schema)
+            if single:
+                # IPC files cannot replace dictionaries between batches, so only a
+                # single-table publish dictionary-encodes the text columns.
+                table = _dictionary_encode(store, dataset, table)
+            if writer is None:
+                schema = table.schema
+                sink = pa.OSFile(str(tmp), "wb")
+                writer = pa.ipc.new_file(sink, schema)
+            writer.write_table(table)
+    finally:
+        if writer is not None:
+            writer.close()
+        if sink is not None:
+            sink.close()
+    if writer is None:
+        return None
+    os.replace(tmp, path)
+
+    pointer_tmp = directory / f"{POINTER_NAME}.tmp"
+    pointer_tmp.write_text(path.name, encoding="utf-8")
+    os.replace(pointer_tmp, directory / POINTER_NAME)
+
+    for stale in sorted(directory.glob("v*.arrow"))[:-keep]:
+        stale.unlink(missing_ok=True)
+    return path
+
+
+def open_published(store: DataStore, dataset: str) -> pa.Table:
+    """Memory-map the current version; buffers point straight into the page cache."""
+    directory = published_dir(store, dataset)
+    name = (directory / POINTER_NAME).read_text(encoding="utf-8").strip()
+    source = pa.memory_map(str(directory / name), "r")
+    return pa.ipc.open_file(source).read_all()
@@ -0,0 +1,133 @@
+"""Declarative specs for the windowed endpoints driven by the generic fetch engine.
+
+Adding an endpoint means adding its name, fields, dedup keys and row cap to
+``constants`` and one ``DatasetSpec`` below; windowing, autosplit, resume,
+progress and rate control all come from ``ListedCompanyFetcher.fetch_dataset``.
+"""
+
+from __future__ import annotations
+
+import math
+from dataclasses import dataclass
+from datetime import date
+
+from .batching import MAX_CODES_PER_REQUEST
+from .constants import (
+    DATASET_DIVIDEND,
+    DATASET_PLEDGE_DETAIL,
+    DATASET_SHARE_FLOAT,
+    DATASET_STK_MANAGERS,
+    DATASET_TOP10_HOLDERS,
+    DEDUP_KEYS,
+    DEFAULT_FIELDS,
+    DEFAULT_MANAGERS_WINDOW,
+    DEFAULT_SHARE_FLOAT_WINDOW,
+    ROW_CAPS,
+)
+from .windowing import DateWindow, format_yyyymmdd, iter_windows, window_days
+
+# Window policies: how one planned window turns into requests.
+POLICY_RANGE = "range"  # start/end params; past the row cap split to days, then ts_code batches
+POLICY_DAY = "day"  # a single date param; one request per day of the window
+POLICY_CODES = "codes"  # ts_code is required; every window fans out over the universe
+
+
+@dataclass(frozen=True)
+class DatasetSpec:
+    name: str
+    policy: str = POLICY_RANGE
+    api_name: str = ""
+    start_param: str | None = "start_date"
+    end_param: str | None = "end_date"
+    date_param: str | None = None
+    # None means one window over the whole requested range.
+    window: str | None = "month"
+    autosplit: bool = True
+    # ts_codes per request when fanning out; None uses the batching default.
+    max_codes: int | None = None
+
+    @property
+    def api(self) -> str:
+        return self.api_name or self.name
+
+    @property
+    def fields(self) -> str | None:
+        return DEFAULT_FIELDS.get(self.name)
+
+    @property
+    def dedup_keys(self) -> list[str]:
+        return DEDUP_KEYS.get(self.name, [])
+
+    @property
+    def row_cap(self) -> int | None:
+        return ROW_CAPS.get(self.name)
+
+    @property
+    def dated(self) -> bool:
+        return bool(self.date_param or self.start_param or self.end_param)
+
+    def windows(self, start: date, end: date, window: str | None = None) -> list[DateWindow]:
+        """Planned windows; an undated endpoint is one as-of pull on ``end``."""
+        if start > end:
+            return []
+        if not self.dated:
+            return [DateWindow(start=end, end=end)]
+        window = window or self.window
+        if window is None:
+            return [DateWindow(start=start, end=end)]
+        return iter_windows(window, start, end)
+
+    def date_params(self, win: DateWindow) -> dict[str, str]:
+        params: dict[str, str] = {}
+        if self.date_param:
+            params[self.date_param] = format_yyyymmdd(win.start)
+        if self.start_param:
+            params[self.start_param] = format_yyyymmdd(win.start)
+        if self.end_param:
+            params[self.end_param] = format_yyyymmdd(win.end)
+        return params
+
+    @property
+    def codes_per_request(self) -> int:
+        return self.max_codes or MAX_CODES_PER_REQUEST
+
+    def requests_per_window(self, win: DateWindow, codes: int) -> int:
+        """Requests for one window before any autosplit; ``codes`` is the universe size."""
+        if self.policy == POLICY_DAY:
+            return window_days(win)
+        if self.policy == POLICY_CODES:
+            return math.ceil(max(codes, 1) / self.codes_per_request)
+        return 1
+
+
+DATASET_SPECS: dict[str, DatasetSpec] = {
+    spec.name: spec
+    for spec in (
+        DatasetSpec(DATASET_STK_MANAGERS, window=DEFAULT_MANAGERS_WINDOW, autosplit=False),
+        DatasetSpec(DATASET_SHARE_FLOAT, window=DEFAULT_SHARE_FLOAT_WINDOW),
+        # dividend only filters on a single announcement date.
+        DatasetSpec(
+            DATASET_DIVIDEND,
+            policy=POLICY_DAY,
+            start_param=None,
+            end_param=None,
+            date_param="ann_date",
+        ),
+        DatasetSpec(DATASET_TOP10_HOLDERS, policy=POLICY_CODES, window=None, max_codes=1),
+        DatasetSpec(
+            DATASET_PLEDGE_DETAIL,
+            policy=POLICY_CODES,
+            start_param=None,
+            end_param=None,
+            max_codes=1,
+        ),
+    )
+}
+WINDOWED_DATASETS = tuple(DATASET_SPECS)
+
+
+def get_spec(dataset: str) -> DatasetSpec:
+    spec = DATASET_SPECS.get(dataset)
+    if spec is None:
+        raise ValueError(f"Unsupported windowed dataset: {dataset}")
+    return spec
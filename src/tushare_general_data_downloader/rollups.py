@@ -0,0 +1,134 @@
+"""Materialized share_float unlock-calendar rollups, maintained from merge deltas."""
+
+from __future__ import annotations
+
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+from .constants import DATASET_SHARE_FLOAT
+from .delta import FrameDelta
+from .storage import DataStore
+from .windowing import format_yyyymmdd
+
+ROLLUP_KEYS = {
+    "float_date": ["float_date"],
+    "ts_code": ["ts_code", "float_date"],
+    "share_type": ["share_type", "float_date"],
+}
+VALUE_COLUMNS = ["float_share", "float_ratio"]
+ROWS = "rows"
+
+
+def rollup_path(store: DataStore, by: str) -> Path:
+    return store.curated_dir() / "rollups" / f"{DATASET_SHARE_FLOAT}_by_{by}.{store.suffix}"
+
+
+def _key_text(series: pd.Series) -> pd.Series:
+    """Canonical string keys so rollups read from disk line up with fresh aggregates."""
+    if pd.api.types.is_numeric_dtype(series):
+        series = pd.to_numeric(series, errors="coerce").round().astype("Int64")
+    return series.astype("string").fillna("")
+
+
+def _aggregate(df: pd.DataFrame, keys: list[str], sign: int = 1) -> pd.DataFrame:
+    if df.empty:
+        return pd.DataFrame(columns=[*keys, *VALUE_COLUMNS, ROWS])
+    frame = pd.DataFrame(
+        {
+            key: _key_text(df[key]) if key in df.columns else pd.Series("", index=df.index)
+            for key in keys
+        }
+    )
+    for column in VALUE_COLUMNS:
+        values = df[column] if column in df.columns else pd.Series(np.nan, index=df.index)
+        frame[column] = pd.to_numeric(values, errors="coerce").fillna(0.0) * sign
+    frame[ROWS] = sign
+    return frame.groupby(keys, as_index=False, sort=False).sum()
+
+
+def _finish(frame: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    frame = frame[frame[ROWS] != 0].sort_values(keys, kind="stable").reset_index(drop=True)
+    frame[VALUE_COLUMNS] = frame[VALUE_COLUMNS].astype(float).round(8)
+    frame[ROWS] = frame[ROWS].astype(np.int64)
+    return frame
+
+
+def apply_delta(rollup: pd.DataFrame, delta: FrameDelta, keys: list[str]) -> pd.DataFrame:
+    """Add inserted/updated rows and subtract the versions they replaced or removed."""
+    parts = [
+        rollup,
+        _aggregate(delta.inserted, keys),
+        _aggregate(delta.updated, keys),
+        _aggregate(delta.previous, keys, sign=-1),
+        _aggregate(delta.removed, keys, sign=-1),
+    ]
+    parts = [part for part in parts if not part.empty]
+    if not parts:
+        return rollup
+    combined = pd.concat(parts, ignore_index=True)
+    return _finish(combined.groupby(keys, as_index=False, sort=False).sum(), keys)
+
+
+def _rebuild_from_curated(store: DataStore, keys: list[str]) -> pd.DataFrame:
+    """Aggregate curated share_float chunk by chunk; only the rollup is held in memory."""
+    rollup = _aggregate(pd.DataFrame(), keys)
+    for chunk in store.iter_frame_chunks(store.curated_path(DATASET_SHARE_FLOAT), text=True):
+        combined = pd.concat([rollup, _aggregate(chunk, keys)], ignore_index=True)
+        rollup = combined.groupby(keys, as_index=False, sort=False).sum()
+    return _finish(rollup, keys)
+
+
+def read_rollup(store: DataStore, by: str = "float_date") -> pd.DataFrame:
+    keys = ROLLUP_KEYS[by]
+    path = rollup_path(store, by)
+    if not path.exists():
+        return pd.DataFrame(columns=[*keys, *VALUE_COLUMNS, ROWS])
+    frame = store.read_frame(path, text=True)
+    if frame.empty:
+        return pd.DataFrame(columns=[*keys, *VALUE_COLUMNS, ROWS])
+    frame[keys] = frame[keys].fillna("")
+    frame[VALUE_COLUMNS] = frame[VALUE_COLUMNS].astype(float)
+    frame[ROWS] = frame[ROWS].astype(np.int64)
+    return frame
+
+
+def rollups_exist(store: DataStore) -> bool:
+    return all(rollup_path(store, by).exists() for by in ROLLUP_KEYS)
+
+
+def update_rollups(
+    store: DataStore, df: pd.DataFrame | None, delta: FrameDelta | None = None
+) -> dict[str, Path]:
+    """Refresh every rollup after curated share_float was written.
+
+    With a ``delta`` only the changed rows are aggregated and folded into the
+    stored rollups; without one (or without a stored rollup) the rollup is
+    rebuilt from ``df``. A spilled consolidate passes no ``df``, so a missing
+    rollup is rebuilt by streaming the curated file instead.
+    """
+    paths: dict[str, Path] = {}
+    for by, keys in ROLLUP_KEYS.items():
+        path = rollup_path(store, by)
+        if delta is not None and path.exists():
+            rollup = apply_delta(read_rollup(store, by), delta, keys)
+        elif df is None:
+            rollup = _rebuild_from_curated(store, keys)
+        else:
+            rollup = _finish(_aggregate(df, keys), keys)
+        store.write_frame(rollup, path)
+        paths[by] = path
+    return paths
+
+
+def upcoming_unlocks(
+    store: DataStore, start: date, days: int, by: str = "float_date"
+) -> pd.DataFrame:
+    """Rollup rows with ``float_date`` in ``[start, start + days)``."""
+    frame = read_rollup(store, by)
+    low = format_yyyymmdd(start)
+    high = format_yyyymmdd(start + timedelta(days=days - 1))
+    dates = frame["float_date"]
+    return frame[(dates >= low) & (dates <= high)].reset_index(drop=True)
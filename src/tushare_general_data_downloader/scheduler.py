@@ -0,0 +1,44 @@
+"""Run dataset jobs concurrently against one shared rate budget."""
+
+from __future__ import annotations
+
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import nullcontext
+from dataclasses import dataclass
+from typing import Callable
+
+from .fetchers import FetchSummary, ListedCompanyFetcher
+
+
+@dataclass
+class DatasetJob:
+    dataset: str
+    priority: int
+    run: Callable[[ListedCompanyFetcher], FetchSummary]
+
+    def run_tracked(self, fetcher: ListedCompanyFetcher) -> FetchSummary:
+        memory = fetcher.store.memory
+        with memory.stage(f"fetch {self.dataset}") if memory else nullcontext():
+            return self.run(fetcher)
+
+
+def run_jobs(
+    jobs: list[DatasetJob],
+    fetcher: ListedCompanyFetcher,
+    *,
+    concurrent: bool = True,
+) -> list[FetchSummary]:
+    """Run jobs and return their summaries in submission order.
+
+    Every job gets its own fetcher view whose runner shares the parent's rate
+    limiter, so the configured RPM is a global budget and ``priority`` decides
+    who gets the next request slot when several jobs are waiting.
+    """
+    if not concurrent or len(jobs) <= 1:
+        return [job.run_tracked(fetcher.with_priority(job.priority)) for job in jobs]
+    with ThreadPoolExecutor(max_workers=len(jobs), thread_name_prefix="dataset") as pool:
+        futures = {
+            index: pool.submit(jobs[index].run_tracked, fetcher.with_priority(jobs[index].priority))
+            for index in sorted(range(len(jobs)), key=lambda index: -jobs[index].priority)
+        }
+        return [futures[index].result() for index in range(len(jobs))]
@@ -0,0 +1,107 @@
+"""Change-detecting dimension snapshots with SCD2 history."""
+
+from __future__ import annotations
+
+import io
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+
+import pandas as pd
+
+from .constants import DEDUP_KEYS
+from .delta import FrameDelta, _key_index, diff_frames
+from .storage import DataStore
+from .windowing import format_yyyymmdd
+
+VALID_FROM = "valid_from"
+VALID_TO = "valid_to"
+CHANGE = "change"
+
+
+@dataclass
+class SnapshotResult:
+    delta: FrameDelta
+    changes_path: Path | None
+    files: int
+
+
+def as_text(store: DataStore, df: pd.DataFrame) -> pd.DataFrame:
+    """Render values exactly as they read back from the store, as strings.
+
+    Comparing fresh API frames with previous files needs one canonical form: CSV
+    round-trips would otherwise turn ``"000001"`` into ``1`` or ``1.0`` into ``1``.
+    """
+    if store.file_format == "csv":
+        return pd.read_csv(io.StringIO(df.to_csv(index=False)), dtype=str)
+    return df.astype("string")
+
+
+def read_text(store: DataStore, path: Path) -> pd.DataFrame | None:
+    if not path.exists():
+        return None
+    return store.read_frame(path, text=True)
+
+
+def snapshot_changes(delta: FrameDelta) -> pd.DataFrame:
+    parts = [
+        delta.inserted.assign(**{CHANGE: "inserted"}),
+        delta.updated.assign(**{CHANGE: "updated"}),
+        delta.removed.assign(**{CHANGE: "removed"}),
+    ]
+    return pd.concat([part for part in parts if not part.empty], ignore_index=True)
+
+
+def apply_scd2(
+    history: pd.DataFrame, delta: FrameDelta, keys: list[str], as_of: str
+) -> pd.DataFrame:
+    """Close open versions of updated/removed keys and open versions for new data."""
+    history = history.copy()
+    if VALID_TO not in history.columns:
+        history[VALID_TO] = pd.NA
+    closing = pd.concat([delta.updated[keys], delta.removed[keys]], ignore_index=True)
+    if not history.empty and not closing.empty:
+        close = history[VALID_TO].isna() & _key_index(history, keys).isin(
+            _key_index(closing, keys)
+        )
+        history.loc[close, VALID_TO] = as_of
+    opened = pd.concat([delta.inserted, delta.updated], ignore_index=True)
+    if opened.empty:
+        return history
+    opened = opened.assign(**{VALID_FROM: as_of, VALID_TO: pd.NA})
+    return pd.concat([history, opened], ignore_index=True)
+
+
+def record_snapshot(
+    store: DataStore, dataset: str, df: pd.DataFrame, run_date: date
+) -> SnapshotResult:
+    """Store only the rows that changed since the last snapshot and extend the history.
+
+    ``raw/<dataset>/<dataset>_<date>`` holds the changed rows with a ``change``
+    column, ``curated/<dataset>`` stays the full current snapshot and
+    ``curated/<dataset>_history`` carries ``valid_from``/``valid_to`` versions.
+    """
+    keys = DEDUP_KEYS.get(dataset, [])
+    as_of = format_yyyymmdd(run_date)
+    previous = read_text(store, store.curated_path(dataset))
+    delta = diff_frames(previous, as_text(store, df), keys)
+    history_path = store.history_path(dataset)
+    history = read_text(store, history_path)
+    if history is None:
+        # First run with history enabled: earlier versions have unknown start dates.
+        history = (previous if previous is not None else delta.inserted.iloc[0:0]).assign(
+            **{VALID_FROM: pd.NA, VALID_TO: pd.NA}
+        )
+    files = 0
+    changes_path = None
+    if not delta.empty:
+        changes_path = store.save_raw_snapshot(dataset, run_date, snapshot_changes(delta))
+        files += 1
+    if not delta.empty or not history_path.exists():
+        store.write_frame(apply_scd2(history, delta, keys, as_of), history_path)
+        files += 1
+    if delta.empty and previous is not None:
+        # Unchanged snapshot: the curated file, rollups and feed are already current.
+        return SnapshotResult(delta=delta, changes_path=None, files=files)
+    store.save_curated(dataset, df, delta)
+    return SnapshotResult(delta=delta, changes_path=changes_path, files=files + 1)
@@ -0,0 +1,278 @@
+"""Incremental export of curated datasets into SQLite, or DuckDB when installed."""
+
+from __future__ import annotations
+
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .constants import DEDUP_KEYS, FIELD_TYPES
+from .delta import _key_index, row_hashes
+from .feed import CHANGE_KINDS, head_sequence, read_changes
+from .storage import DataStore
+
+SQL_ENGINES = ("auto", "sqlite", "duckdb")
+ROW_HASH = "_row_hash"
+# Last feed sequence applied per dataset, kept inside the exported database.
+EXPORT_STATE = "_export_state"
+BATCH_ROWS = 5000
+
+
+@dataclass
+class ExportResult:
+    dataset: str
+    inserted: int = 0
+    updated: int = 0
+    removed: int = 0
+
+
+def resolve_engine(engine: str, db_path: Path) -> str:
+    if engine != "auto":
+        return engine
+    if db_path.suffix == ".duckdb":
+        try:
+            import duckdb  # noqa: F401
+        except ImportError:
+            return "sqlite"
+        return "duckdb"
+    return "sqlite"
+
+
+def connect(db_path: Path, engine: str):
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    if engine == "duckdb":
+        import duckdb
+
+        return duckdb.connect(str(db_path))
+    return sqlite3.connect(db_path, isolation_level=None)
+
+
+def _quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _sql_type(column: str) -> str:
+    if column == ROW_HASH:
+        return "BIGINT"
+    return "DOUBLE" if FIELD_TYPES.get(column) == "float64" else "TEXT"
+
+
+def _existing_columns(conn, table: str) -> list[str]:
+    rows = conn.execute(f"SELECT * FROM {_quote(table)} LIMIT 0").description
+    return [row[0] for row in rows]
+
+
+def _table_exists(conn, engine: str, table: str) -> bool:
+    if engine == "duckdb":
+        query = "SELECT 1 FROM information_schema.tables WHERE table_name = ?"
+    else:
+        query = "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?"
+    return conn.execute(query, [table]).fetchone() is not None
+
+
+def _sql_frame(frame: pd.DataFrame, keys: list[str]) -> pd.DataFrame:
+    """Rows in SQL form: numeric fields as floats, everything else as text."""
+    frame = frame.astype(object).where(frame.notna(), None)
+    for column in frame.columns:
+        if FIELD_TYPES.get(column) == "float64":
+            frame[column] = pd.to_numeric(frame[column], errors="coerce")
+    for key in (key for key in keys if key in frame.columns):
+        # NULLs never collide in a unique index, so keys are stored as ''.
+        frame[key] = frame[key].fillna("")
+    frame[ROW_HASH] = row_hashes(frame, list(frame.columns)).view(np.int64)
+    return frame.reset_index(drop=True)
+
+
+def _prepare(store: DataStore, dataset: str, keys: list[str]) -> pd.DataFrame:
+    return _sql_frame(store.read_frame(store.curated_path(dataset), text=True), keys)
+
+
+def _ensure_state(conn) -> None:
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {_quote(EXPORT_STATE)} "
+        "(dataset TEXT PRIMARY KEY, sequence BIGINT)"
+    )
+
+
+def _exported_sequence(conn, dataset: str) -> int | None:
+    row = conn.execute(
+        f"SELECT sequence FROM {_quote(EXPORT_STATE)} WHERE dataset = ?", [dataset]
+    ).fetchone()
+    return None if row is None else int(row[0])
+
+
+def _record_sequence(conn, dataset: str, sequence: int) -> None:
+    conn.execute(f"DELETE FROM {_quote(EXPORT_STATE)} WHERE dataset = ?", [dataset])
+    conn.execute(
+        f"INSERT INTO {_quote(EXPORT_STATE)} (dataset, sequence) VALUES (?, ?)",
+        [dataset, sequence],
+    )
+
+
+def _ensure_table(conn, engine: str, table: str, frame: pd.DataFrame, keys: list[str]) -> None:
+    if not _table_exists(conn, engine, table):
+        columns = ", ".join(f"{_quote(col)} {_sql_type(col)}" for col in frame.columns)
+        conn.execute(f"CREATE TABLE {_quote(table)} ({columns})")
+    else:
+        existing = set(_existing_columns(conn, table))
+        for column in frame.columns:
+            if column not in existing:
+                conn.execute(
+                    f"ALTER TABLE {_quote(table)} ADD COLUMN {_quote(column)} {_sql_type(column)}"
+                )
+    if keys:
+        key_list = ", ".join(_quote(key) for key in keys)
+        conn.execute(
+            f"CREATE UNIQUE INDEX IF NOT EXISTS {_quote(f'ux_{table}_keys')} "
+            f"ON {_quote(table)} ({key_list})"
+        )
+    for column in frame.columns:
+        if column == "ts_code" or column.endswith("_date"):
+            conn.execute(
+                f"CREATE INDEX IF NOT EXISTS {_quote(f'ix_{table}_{column}')} "
+                f"ON {_quote(table)} ({_quote(column)})"
+            )
+
+
+def _batches(rows: list[tuple], size: int = BATCH_ROWS) -> Iterable[list[tuple]]:
+    for start in range(0, len(rows), size):
+        yield rows[start : start + size]
+
+
+def _records(frame: pd.DataFrame) -> list[tuple]:
+    frame = frame.astype(object).where(frame.notna(), None)
+    return list(frame.itertuples(index=False, name=None))
+
+
+def _delete_keys(conn, table: str, keys: list[str], frame: pd.DataFrame) -> None:
+    where = " AND ".join(f"{_quote(key)} = ?" for key in keys)
+    for batch in _batches(_records(frame[keys])):
+        conn.executemany(f"DELETE FROM {_quote(table)} WHERE {where}", batch)
+
+
+def _insert(conn, engine: str, table: str, frame: pd.DataFrame) -> None:
+    columns = ", ".join(_quote(col) for col in frame.columns)
+    if engine == "duckdb":
+        conn.register("_staged", frame)
+        conn.execute(f"INSERT INTO {_quote(table)} ({columns}) SELECT {columns} FROM _staged")
+        conn.unregister("_staged")
+        return
+    marks = ", ".join("?" for _ in frame.columns)
+    for batch in _batches(_records(frame)):
+        conn.executemany(f"INSERT INTO {_quote(table)} ({columns}) VALUES ({marks})", batch)
+
+
+def _full_sync(conn, engine: str, table: str, frame: pd.DataFrame, keys: list[str]) -> ExportResult:
+    """Diff the whole curated frame against the table, touching only changed rows."""
+    result = ExportResult(dataset=table)
+    _ensure_table(conn, engine, table, frame, keys)
+    selected = list(dict.fromkeys([*keys, ROW_HASH]))
+    query = f"SELECT {', '.join(_quote(col) for col in selected)} FROM {_quote(table)}"
+    existing = pd.DataFrame(conn.execute(query).fetchall(), columns=selected)
+    old_index = _key_index(existing, keys)
+    new_index = _key_index(frame, keys)
+    known = new_index.isin(old_index)
+    old_hash = pd.Series(existing[ROW_HASH].to_numpy(), index=old_index)
+    new_hash = frame[ROW_HASH].to_numpy()
+    changed = np.zeros(len(frame), dtype=bool)
+    changed[known] = old_hash.reindex(new_index[known]).to_numpy() != new_hash[known]
+    removed = existing[~old_index.isin(new_index)]
+
+    _delete_keys(conn, table, keys, pd.concat([frame[changed][keys], removed[keys]]))
+    _insert(conn, engine, table, frame[changed | ~known])
+    result.inserted = int((~known).sum())
+    result.updated = int(changed.sum())
+    result.removed = len(removed)
+    return result
+
+
+def _apply_changes(conn, engine: str, table: str, changes: list, keys: list[str]) -> ExportResult:
+    """Replay feed change sets: drop every touched key, then insert the new versions."""
+    result = ExportResult(dataset=table)
+    for _, frames in changes:
+        for kind in CHANGE_KINDS:
+            if kind not in frames:
+                continue
+            frame = _sql_frame(frames[kind], keys)
+            setattr(result, kind, getattr(result, kind) + len(frame))
+            if kind == "removed":
+                _delete_keys(conn, table, keys, frame)
+                continue
+            frame = frame.drop_duplicates(subset=keys, keep="last")
+            _ensure_table(conn, engine, table, frame, keys)
+            # Also clears inserted keys, so replaying a set twice stays idempotent.
+            _delete_keys(conn, table, keys, frame)
+            _insert(conn, engine, table, frame)
+    return result
+
+
+def _contiguous(changes: list, after: int, head: int) -> bool:
+    sequences = [entry.sequence for entry, _ in changes]
+    return sequences == list(range(after + 1, head + 1))
+
+
+def export_dataset(conn, engine: str, store: DataStore, dataset: str) -> ExportResult:
+    """Upsert one curated dataset, touching only rows that changed since the last export.
+
+    The feed sequence applied last is kept in ``_export_state``; while the feed
+    still holds every later change set only those delta rows are replayed.
+    Otherwise (first export, no dedup keys, or a gap) the whole curated file is
+    diffed against the table by content hash.
+    """
+    keys = DEDUP_KEYS.get(dataset, [])
+    table = dataset
+    _ensure_state(conn)
+    head = head_sequence(store, dataset)
+    exported = _exported_sequence(conn, dataset)
+    if exported == head and _table_exists(conn, engine, table):
+        return ExportResult(dataset=dataset)
+
+    changes = None
+    if exported is not None and exported < head and _table_exists(conn, engine, table):
+        replay_keys = [key for key in keys if key in _existing_columns(conn, table)]
+        if replay_keys:
+            changes = read_changes(store, dataset, after=exported, text=True)
+            if not _contiguous(changes, exported, head):
+                changes = None
+    frame = None
+    if changes is not None:
+        keys = replay_keys
+    else:
+        frame = _prepare(store, dataset, keys)
+        if frame.empty:
+            return ExportResult(dataset=dataset)
+        keys = [key for key in keys if key in frame.columns] or [ROW_HASH]
+        frame = frame.drop_duplicates(subset=keys, keep="last").reset_index(drop=True)
+
+    conn.execute("BEGIN")
+    try:
+        if changes is not None:
+            result = _apply_changes(conn, engine, table, changes, keys)
+        else:
+            result = _full_sync(conn, engine, table, frame, keys)
+        _record_sequence(conn, dataset, head)
+        conn.execute("COMMIT")
+    except BaseException:
+        conn.execute("ROLLBACK")
+        raise
+    return result
+
+
+def export_sql(
+    store: DataStore, db_path: Path, datasets: Iterable[str], *, engine: str = "auto"
+) -> list[ExportResult]:
+    """Export every curated dataset in ``datasets`` that exists into ``db_path``."""
+    engine = resolve_engine(engine, db_path)
+    conn = connect(db_path, engine)
+    try:
+        return [
+            export_dataset(conn, engine, store, dataset)
+            for dataset in datasets
+            if store.curated_path(dataset).exists()
+        ]
+    finally:
+        conn.close()
@@ -2,15 +2,30 @@
 
 from __future__ import annotations
 
+import csv
 import json
-from dataclasses import dataclass
-from datetime import date
+import os
+import shutil
+from dataclasses import dataclass, field
+from datetime import date, timedelta
 from pathlib import Path
-from typing import Iterable
+from typing import Iterable, Iterator
 
 import pandas as pd
 
-from .windowing import format_yyyymmdd
+from .cache import FrameCache, file_version
+from .constants import (
+    DATASET_SHARE_FLOAT,
+    DATASET_STK_MANAGERS,
+    DEDUP_KEYS,
+    FIELD_TYPES,
+    TEXT_COLUMNS,
+)
+from .delta import FrameDelta, diff_frames, upsert_delta
+from .journal import DEFAULT_STALE_SECONDS, WriteJournal, temp_path
+from .memory import MemoryMonitor, PartitionSpill, estimate_frame_bytes, spill_directory
+from .textpool import StringTable
+from .windowing import DateWindow, format_yyyymmdd, parse_yyyymmdd
 
 
 @dataclass
@@ -20,10 +35,24 @@ class DatasetState:
     rows: int = 0
 
 
+FILE_SUFFIXES = {"csv": "csv", "parquet": "parquet", "ipc": "arrow"}
+
+
 @dataclass
 class DataStore:
     base_dir: Path
     file_format: str = "csv"
+    intern_text: bool = False
+    cache: FrameCache | None = field(default=None, repr=False, compare=False)
+    publish_ipc: bool = False
+    memory: MemoryMonitor | None = field(default=None, repr=False, compare=False)
+    _string_tables: dict[str, StringTable] = field(
+        default_factory=dict, init=False, repr=False, compare=False
+    )
+
+    @property
+    def suffix(self) -> str:
+        return FILE_SUFFIXES.get(self.file_format, self.file_format)
 
     def raw_dir(self, dataset: str) -> Path:
         return self.base_dir / "raw" / dataset
@@ -34,38 +63,237 @@ class DataStore:
     def state_dir(self) -> Path:
         return self.base_dir / "state"
 
+    @property
+    def journal(self) -> WriteJournal:
+        return WriteJournal(self.state_dir() / "inflight")
+
+    def recover(self, *, stale_seconds: float = DEFAULT_STALE_SECONDS) -> list[Path]:
+        """Remove temp files and unreadable targets left by interrupted writes."""
+        return self.journal.recover([self.base_dir], self._readable, stale_seconds=stale_seconds)
+
+    def _readable(self, path: Path) -> bool:
+        try:
+            self._load_frame(path, None, False)
+        except Exception:
+            return False
+        return True
+
     def raw_window_path(self, dataset: str, start: date, end: date) -> Path:
         start_str = format_yyyymmdd(start)
         end_str = format_yyyymmdd(end)
-        return self.raw_dir(dataset) / f"{dataset}_{start_str}_{end_str}.{self.file_format}"
+        return self.raw_dir(dataset) / f"{dataset}_{start_str}_{end_str}.{self.suffix}"
 
     def raw_snapshot_path(self, dataset: str, run_date: date) -> Path:
         run_str = format_yyyymmdd(run_date)
-        return self.raw_dir(dataset) / f"{dataset}_{run_str}.{self.file_format}"
+        return self.raw_dir(dataset) / f"{dataset}_{run_str}.{self.suffix}"
+
+    def raw_codes_path(self, dataset: str, run_stamp: str, batch: int) -> Path:
+        return self.raw_dir(dataset) / f"{dataset}_codes_{run_stamp}_{batch:04d}.{self.suffix}"
+
+    def raw_parts_dir(self, dataset: str, start: date, end: date) -> Path:
+        """Per-batch files of a ts_code fan-out window still in progress.
+
+        They live in a subdirectory, so ``iter_raw_files`` never picks them up.
+        """
+        return self.raw_dir(dataset) / "parts" / self.raw_window_path(dataset, start, end).stem
+
+    def raw_part_path(self, dataset: str, start: date, end: date, batch: int) -> Path:
+        return self.raw_parts_dir(dataset, start, end) / f"{batch:05d}.{self.suffix}"
+
+    def load_batch_plan(self, dataset: str, start: date, end: date) -> list[list[str]] | None:
+        path = self.raw_parts_dir(dataset, start, end) / "batches.json"
+        if not path.exists():
+            return None
+        return json.loads(path.read_text(encoding="utf-8"))["batches"]
+
+    def save_batch_plan(
+        self, dataset: str, start: date, end: date, batches: list[list[str]]
+    ) -> None:
+        """Checkpoint the ts_code batches of a window so a resumed run keeps the same split."""
+        path = self.raw_parts_dir(dataset, start, end) / "batches.json"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = temp_path(path)
+        tmp.write_text(json.dumps({"batches": batches}), encoding="utf-8")
+        os.replace(tmp, path)
+
+    def discard_raw_parts(self, dataset: str, start: date, end: date) -> None:
+        shutil.rmtree(self.raw_parts_dir(dataset, start, end), ignore_errors=True)
+
+    def combine_raw_parts(self, dataset: str, start: date, end: date) -> tuple[int, Path]:
+        """Stream every batch file of a window into its raw window file, then drop the parts.
+
+        Batches hold disjoint ts_codes, so per-batch dedup already holds for the
+        whole window and no more than one batch is in memory at a time.
+        """
+        parts = sorted(self.raw_parts_dir(dataset, start, end).glob(f"*.{self.suffix}"))
+        path = self.raw_window_path(dataset, start, end)
+        text_cols = self.text_columns(dataset)
+        rows = 0
+        path.parent.mkdir(parents=True, exist_ok=True)
+        with self.journal.inflight(path) as tmp:
+            writer = _ChunkWriter(tmp, self.file_format)
+            for part in parts:
+                frame = self.read_frame(part, text=True)
+                if frame.empty:
+                    continue
+                columns = [col for col in text_cols if col in frame.columns]
+                if self.file_format == "csv" and self.intern_text and columns:
+                    frame = self._intern(dataset, frame, columns)
+                writer.write(_typed(frame))
+                rows += len(frame)
+            writer.close()
+        if self.cache is not None:
+            self.cache.discard(path)
+        self.discard_raw_parts(dataset, start, end)
+        if self.memory is not None:
+            self.memory.checkpoint()
+        return rows, path
+
+    def parse_raw_window(self, dataset: str, path: Path) -> DateWindow | None:
+        if not path.stem.startswith(f"{dataset}_"):
+            return None
+        parts = path.stem[len(dataset) + 1 :].split("_")
+        if len(parts) != 2:
+            return None
+        try:
+            return DateWindow(start=parse_yyyymmdd(parts[0]), end=parse_yyyymmdd(parts[1]))
+        except ValueError:
+            return None
 
     def curated_path(self, dataset: str) -> Path:
-        return self.curated_dir() / f"{dataset}.{self.file_format}"
+        return self.curated_dir() / f"{dataset}.{self.suffix}"
+
+    def history_path(self, dataset: str) -> Path:
+        return self.curated_dir() / f"{dataset}_history.{self.suffix}"
 
     def state_path(self, dataset: str) -> Path:
         return self.state_dir() / f"{dataset}.json"
 
+    def strings_path(self, dataset: str) -> Path:
+        return self.base_dir / "strings" / f"{dataset}.csv"
+
+    def dataset_for(self, path: Path) -> str:
+        """Infer the dataset a file belongs to from this store's layout."""
+        if path.parent.parent in (self.base_dir / "raw", self.base_dir / "feed"):
+            return path.parent.name
+        return path.stem.removesuffix("_history")
+
+    def text_columns(self, dataset: str) -> list[str]:
+        return TEXT_COLUMNS.get(dataset, [])
+
+    def string_table(self, dataset: str) -> StringTable:
+        table = self._string_tables.get(dataset)
+        if table is None:
+            table = self._string_tables.setdefault(
+                dataset, StringTable(self.strings_path(dataset))
+            )
+        return table
+
     def write_frame(self, df: pd.DataFrame, path: Path) -> None:
+        """Write a pandas frame, or a ``pyarrow.Table`` from the columnar fetch path.
+
+        The file is written to a journaled temp path and renamed into place, so an
+        existing path is always a complete file. Heavy text columns (``TEXT_COLUMNS``)
+        are dictionary-encoded in Parquet and IPC, and replaced by string-table refs
+        in CSV when ``intern_text`` is set.
+        """
         path.parent.mkdir(parents=True, exist_ok=True)
+        if self.cache is not None:
+            self.cache.discard(path)
+        dataset = self.dataset_for(path)
+        columns = df.columns if isinstance(df, pd.DataFrame) else df.column_names
+        text_cols = [col for col in self.text_columns(dataset) if col in columns]
+        if self.file_format == "csv" and self.intern_text and text_cols:
+            df = self._intern(dataset, df, text_cols)
+        with self.journal.inflight(path) as tmp:
+            if not isinstance(df, pd.DataFrame):
+                from .columnar import write_table
+
+                write_table(df, tmp, self.file_format, dictionary_columns=text_cols)
+            elif self.file_format == "parquet":
+                df.to_parquet(tmp, index=False)
+            elif self.file_format == "ipc":
+                encoded = df.reset_index(drop=True)
+                for col in text_cols:
+                    encoded[col] = encoded[col].astype("category")
+                encoded.to_feather(tmp, compression="uncompressed")
+            else:
+                df.to_csv(tmp, index=False)
+
+    def _intern(self, dataset: str, df, columns: list[str]):
+        table = self.string_table(dataset)
+        if isinstance(df, pd.DataFrame):
+            df = df.copy()
+            for col in columns:
+                df[col] = table.intern(df[col].tolist())
+            return df
+        import pyarrow as pa
+
+        for col in columns:
+            index = df.column_names.index(col)
+            values = table.intern(df.column(col).to_pylist())
+            df = df.set_column(index, col, pa.array(values, pa.string()))
+        return df
+
+    def read_frame(
+        self, path: Path, columns: list[str] | None = None, *, text: bool = False
+    ) -> pd.DataFrame:
+        """Read a stored frame, optionally only ``columns`` and/or with every value as str.
+
+        Text columns come back as categoricals from Parquet/IPC and are only
+        resolved against the string table when they are part of the projection.
+        With a ``cache`` attached, unchanged files are served from memory.
+        """
+        if self.cache is None:
+            return self._load_frame(path, columns, text)
+        cached = self.cache.get(path, self.file_format, columns, text)
+        if cached is not None:
+            return cached
+        version = file_version(path)
+        frame = self._load_frame(path, columns, text)
+        self.cache.put(path, self.file_format, columns, text, frame, version)
+        return frame.copy(deep=False)
+
+    def _load_frame(self, path: Path, columns: list[str] | None, text: bool) -> pd.DataFrame:
+        dataset = self.dataset_for(path)
+        text_cols = self.text_columns(dataset)
         if self.file_format == "parquet":
-            df.to_parquet(path, index=False)
+            frame = pd.read_parquet(path, columns=columns, read_dictionary=text_cols or None)
+        elif self.file_format == "ipc":
+            frame = pd.read_feather(path, columns=columns)
         else:
-            df.to_csv(path, index=False)
+            try:
+                frame = pd.read_csv(path, usecols=columns, dtype=str if text else None)
+            except pd.errors.EmptyDataError:
+                # Empty windows are written as a bare newline.
+                return pd.DataFrame()
+            if self.intern_text:
+                table = self.string_table(dataset)
+                for col in text_cols:
+                    if col in frame.columns:
+                        frame[col] = table.decode(frame[col].tolist())
+            return frame
+        return frame.astype("string") if text else frame
 
-    def read_frame(self, path: Path) -> pd.DataFrame:
+    def count_rows(self, path: Path) -> int:
+        """Count data rows without materializing a frame."""
         if self.file_format == "parquet":
-            return pd.read_parquet(path)
-        return pd.read_csv(path)
+            import pyarrow.parquet as pq
 
-    def save_raw_window(
-        self, dataset: str, start: date, end: date, df: pd.DataFrame
-    ) -> Path:
+            return pq.ParquetFile(path).metadata.num_rows
+        if self.file_format == "ipc":
+            import pyarrow as pa
+
+            with pa.memory_map(str(path)) as source:
+                return pa.ipc.open_file(source).read_all().num_rows
+        with path.open(newline="", encoding="utf-8") as handle:
+            return max(sum(1 for _ in csv.reader(handle)) - 1, 0)
+
+    def save_raw_window(self, dataset: str, start: date, end: date, df: pd.DataFrame) -> Path:
         path = self.raw_window_path(dataset, start, end)
         self.write_frame(df, path)
+        if self.memory is not None:
+            self.memory.checkpoint()
         return path
 
     def save_raw_snapshot(self, dataset: str, run_date: date, df: pd.DataFrame) -> Path:
@@ -73,11 +301,72 @@ class DataStore:
         self.write_frame(df, path)
         return path
 
-    def save_curated(self, dataset: str, df: pd.DataFrame) -> Path:
+    def save_curated(
+        self, dataset: str, df: pd.DataFrame, delta: FrameDelta | None = None
+    ) -> Path:
+        """Write the curated file, publish its change feed and refresh derived tables.
+
+        ``delta`` is the change against the previous curated version when the
+        caller knows it; otherwise it is diffed here against the file on disk.
+        """
         path = self.curated_path(dataset)
+        existed = path.exists()
+        if delta is None:
+            delta = self._diff_curated(dataset, df)
         self.write_frame(df, path)
+        self._after_curated(dataset, df, [delta], existed)
         return path
 
+    def _after_curated(
+        self,
+        dataset: str,
+        df: pd.DataFrame | None,
+        deltas: Iterable[FrameDelta],
+        existed: bool,
+    ) -> None:
+        """Feed, tenure index, rollups and IPC publish; ``df`` is None after a spilled write.
+
+        A spilled write passes one delta per partition, loaded lazily, so each
+        becomes its own feed entry and only one is in memory at a time.
+        """
+        from .feed import publish_delta
+        from .rollups import rollups_exist, update_rollups
+
+        incremental = dataset == DATASET_SHARE_FLOAT and existed and rollups_exist(self)
+        for delta in deltas:
+            publish_delta(self, dataset, delta)
+            if incremental:
+                update_rollups(self, None, delta)
+        if dataset == DATASET_STK_MANAGERS:
+            from .tenures import TenureIndex
+
+            frame = df if df is not None else self.read_frame(self.curated_path(dataset))
+            TenureIndex.build(frame).save(self)
+        elif dataset == DATASET_SHARE_FLOAT and not incremental:
+            update_rollups(self, df)
+        if self.publish_ipc:
+            from .published import publish_ipc
+
+            if df is not None:
+                publish_ipc(self, dataset, df)
+            else:
+                chunks = self.iter_frame_chunks(self.curated_path(dataset), text=True)
+                publish_ipc(self, dataset, (_typed(chunk) for chunk in chunks))
+
+    def _diff_curated(self, dataset: str, df: pd.DataFrame) -> FrameDelta:
+        from .snapshots import as_text
+
+        path = self.curated_path(dataset)
+        previous = self.read_frame(path, text=True) if path.exists() else None
+        current = as_text(self, df) if previous is not None else df
+        return diff_frames(previous, current, DEDUP_KEYS.get(dataset, []))
+
+    def export_sql(self, db_path: Path, datasets: Iterable[str], *, engine: str = "auto"):
+        """Upsert curated datasets into a SQLite/DuckDB file; see ``sqlexport``."""
+        from .sqlexport import export_sql
+
+        return export_sql(self, db_path, datasets, engine=engine)
+
     def load_state(self, dataset: str) -> DatasetState | None:
         path = self.state_path(dataset)
         if not path.exists():
@@ -89,6 +378,12 @@ class DataStore:
             rows=int(raw.get("rows", 0)),
         )
 
+    def resume_start(self, dataset: str, start: date) -> date:
+        state = self.load_state(dataset)
+        if state and state.last_end_date:
+            return max(start, parse_yyyymmdd(state.last_end_date) + timedelta(days=1))
+        return start
+
     def update_state(self, dataset: str, end_date: date, rows: int, windows: int) -> None:
         state = DatasetState(
             last_end_date=format_yyyymmdd(end_date),
@@ -97,23 +392,206 @@ class DataStore:
         )
         path = self.state_path(dataset)
         path.parent.mkdir(parents=True, exist_ok=True)
-        path.write_text(json.dumps(state.__dict__, ensure_ascii=False, indent=2), encoding="utf-8")
+        tmp = temp_path(path)
+        tmp.write_text(json.dumps(state.__dict__, ensure_ascii=False, indent=2), encoding="utf-8")
+        os.replace(tmp, path)
 
     def iter_raw_files(self, dataset: str) -> Iterable[Path]:
         raw_dir = self.raw_dir(dataset)
         if not raw_dir.exists():
             return []
-        return sorted(raw_dir.glob(f"{dataset}_*.{self.file_format}"))
+        return sorted(raw_dir.glob(f"{dataset}_*.{self.suffix}"))
 
     def consolidate(self, dataset: str, dedup_keys: list[str]) -> pd.DataFrame:
         frames: list[pd.DataFrame] = []
         for path in self.iter_raw_files(dataset):
             frames.append(self.read_frame(path))
-        if not frames:
-            return pd.DataFrame()
-        merged = pd.concat(frames, ignore_index=True)
-        if dedup_keys:
-            subset = [key for key in dedup_keys if key in merged.columns]
-            if subset:
-                merged = merged.drop_duplicates(subset=subset, keep="last")
+            if self.memory is not None:
+                self.memory.checkpoint()
+        return _merge_frames(frames, dedup_keys)
+
+    def save_consolidated(self, dataset: str, dedup_keys: list[str]) -> tuple[int, Path | None]:
+        """Rebuild curated from every raw file, spilling to disk past ``memory.limit``."""
+        paths = list(self.iter_raw_files(dataset))
+        partitions = 1
+        if self.memory is not None and self.memory.limit and paths:
+            largest = max(paths, key=lambda path: path.stat().st_size)
+            sample = self.read_frame(largest)
+            partitions = self.memory.partitions_for(estimate_frame_bytes(paths, sample, largest))
+        if partitions > 1:
+            return self._save_consolidated_spilled(dataset, dedup_keys, paths, partitions)
+        df = self.consolidate(dataset, dedup_keys)
+        if df.empty:
+            return 0, None
+        return len(df), self.save_curated(dataset, df)
+
+    def _save_consolidated_spilled(
+        self, dataset: str, dedup_keys: list[str], paths: list[Path], partitions: int
+    ) -> tuple[int, Path | None]:
+        """Partition raw rows by ts_code hash on disk, then dedup and write one partition at a time.
+
+        Everything is handled as text so partitions share one schema; numeric
+        fields are cast back just before writing. The feed delta is diffed per
+        partition against the matching slice of the previous curated file and
+        spilled as well, then published partition by partition once curated is
+        in place, so a first build never gathers the whole dataset as one delta.
+        """
+        curated = self.curated_path(dataset)
+        existed = curated.exists()
+        rows = 0
+        with spill_directory(self.base_dir / "spill") as root:
+            incoming = PartitionSpill(root / "raw", partitions, "ts_code")
+            for path in paths:
+                incoming.add(self.read_frame(path, text=True))
+                self.memory.checkpoint()
+            previous = PartitionSpill(root / "curated", partitions, "ts_code")
+            if existed:
+                for chunk in self.iter_frame_chunks(curated, text=True):
+                    previous.add(chunk)
+                    self.memory.checkpoint()
+            deltas_dir = root / "deltas"
+            deltas_dir.mkdir()
+            curated.parent.mkdir(parents=True, exist_ok=True)
+            with self.journal.inflight(curated) as tmp:
+                writer = _ChunkWriter(tmp, self.file_format)
+                for partition in range(partitions):
+                    part = _merge_frames(incoming.read(partition), dedup_keys)
+                    old = _merge_frames(previous.read(partition), [])
+                    delta = diff_frames(old if not old.empty else None, part, dedup_keys)
+                    if not delta.empty:
+                        pd.to_pickle(delta, deltas_dir / f"{partition:05d}.pkl")
+                    if part.empty:
+                        continue
+                    dataset_cols = [c for c in self.text_columns(dataset) if c in part.columns]
+                    if self.file_format == "csv" and self.intern_text and dataset_cols:
+                        part = self._intern(dataset, part, dataset_cols)
+                    writer.write(_typed(part))
+                    rows += len(part)
+                    self.memory.checkpoint()
+                writer.close()
+            if self.cache is not None:
+                self.cache.discard(curated)
+            if rows == 0:
+                return 0, None
+            deltas = (pd.read_pickle(path) for path in sorted(deltas_dir.glob("*.pkl")))
+            self._after_curated(dataset, None, deltas, existed)
+        return rows, curated
+
+    def iter_frame_chunks(
+        self, path: Path, rows: int = 100_000, *, text: bool = False
+    ) -> Iterator[pd.DataFrame]:
+        """Read a stored file in row chunks without materializing all of it."""
+        text_cols = self.text_columns(self.dataset_for(path))
+        if self.file_format == "csv":
+            try:
+                reader = pd.read_csv(path, chunksize=rows, dtype=str if text else None)
+                for chunk in reader:
+                    if self.intern_text:
+                        table = self.string_table(self.dataset_for(path))
+                        for col in text_cols:
+                            if col in chunk.columns:
+                                chunk[col] = table.decode(chunk[col].tolist())
+                    yield chunk
+            except pd.errors.EmptyDataError:
+                return
+            return
+        import pyarrow as pa
+
+        if self.file_format == "parquet":
+            import pyarrow.parquet as pq
+
+            batches = pq.ParquetFile(path).iter_batches(batch_size=rows)
+        else:
+            reader = pa.ipc.open_file(pa.memory_map(str(path)))
+            batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+        for batch in batches:
+            frame = batch.to_pandas()
+            yield frame.astype("string") if text else frame
+
+    def merge_into_curated(
+        self, dataset: str, dedup_keys: list[str], paths: Iterable[Path]
+    ) -> pd.DataFrame:
+        """Fold newly written raw windows into the curated file without rereading raw/."""
+        curated = self.curated_path(dataset)
+        delta = None
+        if curated.exists():
+            current = self.read_frame(curated)
+            incoming = _merge_frames([self.read_frame(path) for path in paths], dedup_keys)
+            merged = _merge_frames([current, incoming], dedup_keys)
+            delta = upsert_delta(current, incoming, dedup_keys)
+        else:
+            merged = self.consolidate(dataset, dedup_keys)
+        if not merged.empty:
+            self.save_curated(dataset, merged, delta)
         return merged
+
+
+class _ChunkWriter:
+    """Append frames with one schema to a single CSV, Parquet or Arrow IPC file."""
+
+    def __init__(self, path: Path, file_format: str) -> None:
+        self.path = path
+        self.file_format = file_format
+        self._writer = None
+        self._schema = None
+        self._sink = None
+
+    def write(self, df: pd.DataFrame) -> None:
+        if self.file_format == "csv":
+            first = self._schema is None
+            if not first:
+                df = df.reindex(columns=self._schema)
+            df.to_csv(self.path, mode="w" if first else "a", header=first, index=False)
+            self._schema = list(df.columns)
+            return
+        import pyarrow as pa
+
+        if self._schema is None:
+            table = pa.Table.from_pandas(df, preserve_index=False)
+            self._schema = table.schema
+            if self.file_format == "parquet":
+                import pyarrow.parquet as pq
+
+                self._writer = pq.ParquetWriter(self.path, self._schema)
+            else:
+                self._sink = pa.OSFile(str(self.path), "wb")
+                self._writer = pa.ipc.new_file(self._sink, self._schema)
+        else:
+            table = pa.Table.from_pandas(
+                df.reindex(columns=self._schema.names), schema=self._schema, preserve_index=False
+            )
+        self._writer.write_table(table)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+        if self._sink is not None:
+            self._sink.close()
+        if self._schema is None:
+            # Nothing written: leave an empty file that still reads back in this format.
+            if self.file_format == "parquet":
+                pd.DataFrame().to_parquet(self.path, index=False)
+            elif self.file_format == "ipc":
+                pd.DataFrame().to_feather(self.path)
+            else:
+                self.path.write_text("\n", encoding="utf-8")
+
+
+def _typed(df: pd.DataFrame) -> pd.DataFrame:
+    """Cast known numeric fields of an all-text frame back to their types."""
+    for column, dtype in FIELD_TYPES.items():
+        if column in df.columns:
+            df[column] = pd.to_numeric(df[column], errors="coerce").astype(dtype)
+    return df
+
+
+def _merge_frames(frames: list[pd.DataFrame], dedup_keys: list[str]) -> pd.DataFrame:
+    frames = [frame for frame in frames if not frame.empty]
+    if not frames:
+        return pd.DataFrame()
+    merged = pd.concat(frames, ignore_index=True)
+    if dedup_keys:
+        subset = [key for key in dedup_keys if key in merged.columns]
+        if subset:
+            merged = merged.drop_duplicates(subset=subset, keep="last")
+    return merged
@@ -0,0 +1,161 @@
+"""Point-in-time interval index over stk_managers tenures."""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+from datetime import date
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+import pandas as pd
+
+from .constants import DATASET_STK_MANAGERS
+from .storage import DataStore
+
+# Open-ended bounds for tenures with a missing begin/end date, in days since epoch.
+OPEN_BEGIN = np.iinfo(np.int32).min
+OPEN_END = np.iinfo(np.int32).max
+BEGIN_COLUMN = "_begin_day"
+END_COLUMN = "_end_day"
+TENURE_KEYS = ["ts_code", "name", "title", "begin_date"]
+
+
+def day_numbers(values, missing: int) -> np.ndarray:
+    """Convert YYYYMMDD strings/ints/floats or dates to int days since epoch."""
+    series = pd.Series(values)
+    if not series.map(lambda value: isinstance(value, date)).any():
+        numeric = pd.to_numeric(series, errors="coerce").astype("Int64").astype("string")
+        series = pd.to_datetime(numeric, format="%Y%m%d", errors="coerce")
+    parsed = pd.to_datetime(series, errors="coerce")
+    days = parsed.to_numpy(dtype="datetime64[D]").astype(np.int64)
+    days[parsed.isna().to_numpy()] = missing
+    return days
+
+
+def _composite(slots: np.ndarray, days: np.ndarray) -> np.ndarray:
+    """Single sortable int64 key for ``(code slot, day)``."""
+    return (slots.astype(np.int64) << 33) | (days.astype(np.int64) - OPEN_BEGIN)
+
+
+def _collapse_announcements(df: pd.DataFrame) -> pd.DataFrame:
+    """Keep the latest announcement per tenure; later ones carry the real end_date."""
+    keys = [key for key in TENURE_KEYS if key in df.columns]
+    if "ann_date" in df.columns:
+        order = pd.to_numeric(df["ann_date"], errors="coerce").fillna(0)
+        df = df.assign(_ann=order).sort_values("_ann", kind="stable").drop(columns="_ann")
+    return df.drop_duplicates(subset=keys, keep="last")
+
+
+@dataclass
+class TenureIndex:
+    """Tenures sorted by ``(ts_code, begin)`` with per-code offsets.
+
+    Rows of code ``codes[i]`` live in ``rows[offsets[i]:offsets[i + 1]]``, so an as-of
+    lookup is a binary search on ``codes`` and on the begin days of that slice,
+    followed by an ``end >= date`` filter over the tenures that had started.
+    """
+
+    rows: pd.DataFrame
+    codes: np.ndarray
+    offsets: np.ndarray
+    begin: np.ndarray
+    end: np.ndarray
+    keys: np.ndarray
+
+    @classmethod
+    def build(cls, df: pd.DataFrame) -> "TenureIndex":
+        """Build the index from a curated stk_managers frame."""
+        if df.empty or "ts_code" not in df.columns:
+            df = pd.DataFrame(columns=["ts_code", "begin_date", "end_date"])
+        df = _collapse_announcements(df)
+        begin = day_numbers(df.get("begin_date", pd.Series(index=df.index)), OPEN_BEGIN)
+        end = day_numbers(df.get("end_date", pd.Series(index=df.index)), OPEN_END)
+        rows = df.assign(**{BEGIN_COLUMN: begin, END_COLUMN: end})
+        rows = rows.sort_values(["ts_code", BEGIN_COLUMN], kind="stable").reset_index(drop=True)
+        return cls.from_sorted(rows)
+
+    @classmethod
+    def from_sorted(cls, rows: pd.DataFrame) -> "TenureIndex":
+        if BEGIN_COLUMN not in rows.columns:
+            return cls.build(rows)
+        codes, starts = np.unique(rows["ts_code"].astype(str).to_numpy(), return_index=True)
+        offsets = np.append(starts, len(rows)).astype(np.int64)
+        begin = rows[BEGIN_COLUMN].to_numpy(dtype=np.int64)
+        slots = np.repeat(np.arange(len(codes)), np.diff(offsets))
+        return cls(
+            rows=rows,
+            codes=codes,
+            offsets=offsets,
+            begin=begin,
+            end=rows[END_COLUMN].to_numpy(dtype=np.int64),
+            keys=_composite(slots, begin),
+        )
+
+    def save(self, store: DataStore) -> Path:
+        path = index_path(store)
+        store.write_frame(self.rows, path)
+        return path
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def as_of(self, ts_codes: Iterable[str], dates: Iterable) -> pd.DataFrame:
+        """Tenures active for each ``(ts_code, date)`` pair, inclusive of both ends.
+
+        Returns one row per matching tenure with a ``query`` column holding the
+        position of the pair in the input and an ``as_of`` column with its date.
+        """
+        codes = np.asarray(list(ts_codes), dtype=str)
+        raw_dates = list(dates)
+        if len(raw_dates) == 1 and len(codes) != 1:
+            raw_dates = raw_dates * len(codes)
+        if len(raw_dates) != len(codes):
+            raise ValueError("ts_codes and dates must have the same length")
+        days = day_numbers(raw_dates, OPEN_END)
+
+        slot = np.searchsorted(self.codes, codes)
+        known = slot < len(self.codes)
+        known[known] = self.codes[slot[known]] == codes[known]
+        lo = np.zeros(len(codes), dtype=np.int64)
+        hi = np.zeros(len(codes), dtype=np.int64)
+        lo[known] = self.offsets[slot[known]]
+        hi[known] = np.searchsorted(
+            self.keys, _composite(slot[known], days[known]), side="right"
+        )
+
+        counts = hi - lo
+        query = np.repeat(np.arange(len(codes)), counts)
+        candidate = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+        candidate += np.repeat(lo, counts)
+        active = self.end[candidate] >= days[query]
+        query, candidate = query[active], candidate[active]
+
+        result = self.rows.iloc[candidate].drop(columns=[BEGIN_COLUMN, END_COLUMN])
+        as_of = pd.Series(raw_dates, dtype=object).iloc[query].to_numpy()
+        return result.assign(query=query, as_of=as_of).reset_index(drop=True)
+
+    def on_date(self, when) -> pd.DataFrame:
+        """All tenures active on ``when`` across every ts_code."""
+        day = day_numbers([when], OPEN_END)[0]
+        mask = (self.begin <= day) & (self.end >= day)
+        return self.rows[mask].drop(columns=[BEGIN_COLUMN, END_COLUMN]).reset_index(drop=True)
+
+
+def index_path(store: DataStore) -> Path:
+    return store.base_dir / "index" / f"{DATASET_STK_MANAGERS}.{store.suffix}"
+
+
+def load_tenure_index(store: DataStore) -> TenureIndex:
+    """Load the persisted index, rebuilding it when curated stk_managers is newer."""
+    curated = store.curated_path(DATASET_STK_MANAGERS)
+    path = index_path(store)
+    if path.exists() and (
+        not curated.exists() or path.stat().st_mtime >= curated.stat().st_mtime
+    ):
+        return TenureIndex.from_sorted(store.read_frame(path))
+    frame = store.read_frame(curated) if curated.exists() else pd.DataFrame()
+    index = TenureIndex.build(frame)
+    if curated.exists():
+        index.save(store)
+    return index
@@ -0,0 +1,76 @@
+"""Content-addressed string table for interning long text columns in CSV output."""
+
+from __future__ import annotations
+
+import csv
+import hashlib
+import threading
+from pathlib import Path
+from typing import Iterable
+
+REF_PREFIX = "#"
+REF_HEX = 10
+
+
+def text_ref(text: str, width: int = REF_HEX) -> str:
+    return REF_PREFIX + hashlib.sha1(text.encode("utf-8")).hexdigest()[:width]
+
+
+class StringTable:
+    """Append-only ``ref,text`` table shared by every file of one dataset.
+
+    Values are replaced by a short content hash, so the same text written in many
+    snapshots or windows is stored once and identical input always maps to the
+    same ref without coordination between writers. Values no longer than a ref
+    stay inline.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path
+        self._texts: dict[str, str] | None = None
+        self._lock = threading.Lock()
+
+    def _load(self) -> dict[str, str]:
+        if self._texts is None:
+            texts: dict[str, str] = {}
+            if self.path.exists():
+                with self.path.open(newline="", encoding="utf-8") as handle:
+                    for row in csv.reader(handle):
+                        if len(row) == 2:
+                            texts[row[0]] = row[1]
+            self._texts = texts
+        return self._texts
+
+    def intern(self, values: Iterable) -> list:
+        with self._lock:
+            texts = self._load()
+            added: list[tuple[str, str]] = []
+            out = []
+            for value in values:
+                if not isinstance(value, str) or len(value.encode("utf-8")) <= REF_HEX + 1:
+                    out.append(value)
+                    continue
+                width = REF_HEX
+                ref = text_ref(value, width)
+                while texts.get(ref, value) != value:
+                    width += 2
+                    ref = text_ref(value, width)
+                if ref not in texts:
+                    texts[ref] = value
+                    added.append((ref, value))
+                out.append(ref)
+            if added:
+                self.path.parent.mkdir(parents=True, exist_ok=True)
+                with self.path.open("a", newline="", encoding="utf-8") as handle:
+                    csv.writer(handle).writerows(added)
+            return out
+
+    def decode(self, values: Iterable) -> list:
+        with self._lock:
+            texts = self._load()
+        return [
+            texts.get(value, value)
+            if isinstance(value, str) and value.startswith(REF_PREFIX)
+            else value
+            for value in values
+        ]
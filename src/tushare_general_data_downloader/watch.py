@@ -0,0 +1,139 @@
+"""Long-running incremental refresh loop that keeps client and state warm."""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from datetime import time as clock_time
+from typing import Callable
+
+from .constants import (
+    DATASET_SHARE_FLOAT,
+    DATASET_STK_MANAGERS,
+    DEDUP_KEYS,
+    DEFAULT_EXCHANGES,
+    DEFAULT_MANAGERS_WINDOW,
+    DEFAULT_SHARE_FLOAT_THRESHOLD,
+    DEFAULT_SHARE_FLOAT_WINDOW,
+)
+from .fetchers import FetchSummary, ListedCompanyFetcher
+from .master import refresh_security_master
+from .windowing import BJT, next_run_bjt, today_bjt
+
+
+@dataclass
+class WatchConfig:
+    datasets: list[str]
+    start: date
+    times: list[clock_time]
+    lookback_days: int = 2
+    dimension_interval: float = 86400.0
+    managers_window: str = DEFAULT_MANAGERS_WINDOW
+    share_float_window: str = DEFAULT_SHARE_FLOAT_WINDOW
+    threshold: int = DEFAULT_SHARE_FLOAT_THRESHOLD
+    list_status: str = ""
+    exchanges: tuple[str, ...] = field(default=DEFAULT_EXCHANGES)
+
+
+class WatchLoop:
+    """Poll for new windows on a Beijing-time schedule with one warm fetcher.
+
+    Each cycle fills any gap since the last state watermark, force-refreshes the
+    trailing ``lookback_days`` day windows (announcements for the open trading
+    day keep arriving) and folds only the files it wrote into ``curated/``.
+    Dimension snapshots refresh on their own, slower cadence.
+    """
+
+    def __init__(self, fetcher: ListedCompanyFetcher, config: WatchConfig) -> None:
+        self.fetcher = fetcher
+        self.config = config
+        self._last_dimension_refresh: float | None = None
+        self.failed_cycles = 0
+        self.last_error = ""
+
+    def _refresh_dimensions(self, summaries: list[FetchSummary]) -> None:
+        now = time.monotonic()
+        if (
+            self._last_dimension_refresh is not None
+            and now - self._last_dimension_refresh < self.config.dimension_interval
+        ):
+            return
+        if "stock_basic" in self.config.datasets:
+            summaries.append(self.fetcher.fetch_stock_basic(list_status=self.config.list_status))
+        if "stock_company" in self.config.datasets:
+            summaries.append(self.fetcher.fetch_stock_company(exchanges=self.config.exchanges))
+        self._last_dimension_refresh = now
+
+    def _fetch_event(self, dataset: str, start: date, end: date, *, window: str, force: bool):
+        if dataset == DATASET_STK_MANAGERS:
+            return self.fetcher.fetch_stk_managers(
+                start, end, window=window, resume=False, force=force
+            )
+        return self.fetcher.fetch_share_float(
+            start, end, window=window, resume=False, force=force, threshold=self.config.threshold
+        )
+
+    def run_cycle(self) -> list[FetchSummary]:
+        summaries: list[FetchSummary] = []
+        self._refresh_dimensions(summaries)
+        today = today_bjt()
+        recent_start = today - timedelta(days=max(self.config.lookback_days, 1) - 1)
+        for dataset, window in (
+            (DATASET_STK_MANAGERS, self.config.managers_window),
+            (DATASET_SHARE_FLOAT, self.config.share_float_window),
+        ):
+            if dataset not in self.config.datasets:
+                continue
+            gap_start = self.fetcher.store.resume_start(dataset, self.config.start)
+            gap_end = recent_start - timedelta(days=1)
+            if gap_start <= gap_end:
+                summaries.append(
+                    self._fetch_event(dataset, gap_start, gap_end, window=window, force=False)
+                )
+            recent = self._fetch_event(
+                dataset, max(recent_start, self.config.start), today, window="day", force=True
+            )
+            summaries.append(recent)
+            paths = [
+                path
+                for summary in summaries
+                if summary.dataset == dataset
+                for path in summary.paths
+            ]
+            merged = self.fetcher.store.merge_into_curated(
+                dataset, DEDUP_KEYS.get(dataset, []), paths
+            )
+            print(f"- {dataset}: +{len(paths)} file(s), curated rows={len(merged)}")
+        refresh_security_master(self.fetcher.store)
+        return summaries
+
+    def _record_failure(self, exc: Exception) -> None:
+        self.failed_cycles += 1
+        self.last_error = f"{type(exc).__name__}: {exc}"
+        print(f"[watch] cycle failed: {self.last_error}; retrying at the next slot")
+        progress = self.fetcher.progress
+        if progress is not None:
+            progress.cycle_failed(exc)
+
+    def run(
+        self,
+        *,
+        max_cycles: int | None = None,
+        sleep: Callable[[float], None] = time.sleep,
+        clock: Callable[[], datetime] = lambda: datetime.now(tz=BJT),
+    ) -> None:
+        cycles = 0
+        while max_cycles is None or cycles < max_cycles:
+            started = clock()
+            print(f"[watch] cycle {cycles + 1} at {started:%Y-%m-%d %H:%M:%S} BJT")
+            try:
+                self.run_cycle()
+            except Exception as exc:  # noqa: BLE001 - one bad cycle must not stop the daemon
+                self._record_failure(exc)
+            cycles += 1
+            if max_cycles is not None and cycles >= max_cycles:
+                break
+            wake = next_run_bjt(clock(), self.config.times)
+            print(f"[watch] next cycle at {wake:%Y-%m-%d %H:%M} BJT")
+            sleep(max((wake - clock()).total_seconds(), 0.0))
@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from dataclasses import dataclass
-from datetime import date, datetime, timedelta
+from datetime import date, datetime, time, timedelta
 from zoneinfo import ZoneInfo
 
 BJT = ZoneInfo("Asia/Shanghai")
@@ -92,3 +92,33 @@ def iter_month_ranges(start: date, end: date) -> list[DateWindow]:
         windows.append(DateWindow(start=window_start, end=window_end))
         cursor = window_end + timedelta(days=1)
     return windows
+
+
+def iter_windows(window: str, start: date, end: date) -> list[DateWindow]:
+    if window == "day":
+        return iter_day_ranges(start, end)
+    if window == "week":
+        return iter_week_ranges(start, end)
+    if window == "month":
+        return iter_month_ranges(start, end)
+    raise ValueError(f"Unsupported window: {window}")
+
+
+def window_days(win: DateWindow) -> int:
+    return (win.end - win.start).days + 1
+
+
+def parse_hhmm(raw: str) -> time:
+    return datetime.strptime(raw.strip(), "%H:%M").time()
+
+
+def next_run_bjt(now: datetime, times: list[time]) -> datetime:
+    """Return the next Beijing-time slot strictly after ``now``."""
+    local = now.astimezone(BJT)
+    for offset in (0, 1):
+        day = local.date() + timedelta(days=offset)
+        for slot in sorted(times):
+            candidate = datetime.combine(day, slot, tzinfo=BJT)
+            if candidate > local:
+                return candidate
+    raise ValueError("times must not be empty")
@@ -0,0 +1,58 @@
+import time
+
+import pandas as pd
+import pytest
+
+from tushare_general_data_downloader.api import FetchRunner, RateLimiter
+from tushare_general_data_downloader.fetchers import ListedCompanyFetcher
+from tushare_general_data_downloader.storage import DataStore
+
+
+class EventPro:
+    """stk_managers/share_float stand-in returning ``counts[(start, end)]`` rows per window."""
+
+    def __init__(self, counts=None, *, default=1, latency=0.0):
+        self.counts = counts or {}
+        self.default = default
+        self.latency = latency
+        self.calls: list[tuple[str, str]] = []
+
+    def _frame(self, start_date, end_date):
+        self.calls.append((start_date, end_date))
+        if self.latency:
+            time.sleep(self.latency)
+        count = self.counts.get((start_date, end_date), self.default)
+        return pd.DataFrame(
+            {
+                "ts_code": [f"{i:06d}.SZ" for i in range(count)],
+                "float_date": [start_date] * count,
+                "holder_name": ["h"] * count,
+                "share_type": ["A"] * count,
+                "ann_date": [start_date] * count,
+            }
+        )
+
+    def stk_managers(self, start_date, end_date, fields=None):
+        return self._frame(start_date, end_date)
+
+    def share_float(self, start_date, end_date, fields=None):
+        return self._frame(start_date, end_date)
+
+
+@pytest.fixture
+def event_pro():
+    return EventPro
+
+
+@pytest.fixture
+def make_fetcher(tmp_path):
+    """Build ``(fetcher, store)`` over ``tmp_path`` with an unthrottled runner."""
+
+    def make(pro, *, file_format="csv", universe=None, **runner_kwargs):
+        store = DataStore(base_dir=tmp_path, file_format=file_format)
+        if universe is not None:
+            store.save_curated("stock_basic", pd.DataFrame({"ts_code": universe}))
+        runner = FetchRunner(rate_limiter=RateLimiter(min_interval=0), **runner_kwargs)
+        return ListedCompanyFetcher(pro, runner, store), store
+
+    return make
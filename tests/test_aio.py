@@ -0,0 +1,105 @@
+import asyncio
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from tushare_general_data_downloader.aio import (
+    AsyncFetchRunner,
+    AsyncListedCompanyFetcher,
+    AsyncRateLimiter,
+)
+from tushare_general_data_downloader.api import RequestBudget
+from tushare_general_data_downloader.storage import DataStore
+
+
+def _fetcher(tmp_path, pro, **runner_kwargs):
+    runner = AsyncFetchRunner(rate_limiter=AsyncRateLimiter(rpm=0), **runner_kwargs)
+    return AsyncListedCompanyFetcher(pro, runner, DataStore(base_dir=tmp_path))
+
+
+def test_windows_overlap_and_state_advances(tmp_path, event_pro):
+    pro = event_pro(latency=0.2)
+
+    async def main():
+        async with _fetcher(tmp_path, pro, max_in_flight=16) as fetcher:
+            return await fetcher.fetch_stk_managers(
+                date(2024, 1, 1), date(2024, 1, 10), window="day", resume=False, force=False
+            )
+
+    started = time.monotonic()
+    summary = asyncio.run(main())
+    elapsed = time.monotonic() - started
+
+    assert summary.windows == 10 and summary.files == 10
+    assert elapsed < 1.0
+    assert DataStore(base_dir=tmp_path).load_state("stk_managers").last_end_date == "20240110"
+
+
+def test_share_float_autosplits_and_respects_budget(tmp_path, event_pro):
+    pro = event_pro({("20240101", "20240107"): 6})
+
+    async def main(budget):
+        async with _fetcher(tmp_path, pro, budget=budget) as fetcher:
+            return await fetcher.fetch_share_float(
+                date(2024, 1, 1),
+                date(2024, 1, 14),
+                window="week",
+                resume=False,
+                force=False,
+                threshold=5,
+            )
+
+    summary = asyncio.run(main(RequestBudget(max_requests=100)))
+    assert summary.windows == 8
+    assert len(pro.calls) == 9
+    assert not DataStore(base_dir=tmp_path).raw_window_path(
+        "share_float", date(2024, 1, 1), date(2024, 1, 7)
+    ).exists()
+
+    summary = asyncio.run(main(RequestBudget(max_requests=0)))
+    assert [(w.start.day, w.end.day) for w in summary.pending] == [(1, 7)]
+    assert summary.windows == 1
+
+
+def test_token_bucket_spacing():
+    async def main():
+        limiter = AsyncRateLimiter(rpm=600)
+        started = time.monotonic()
+        for _ in range(3):
+            await limiter.acquire()
+        return time.monotonic() - started
+
+    assert 0.15 <= asyncio.run(main()) < 0.5
+
+
+def test_cancelled_run_keeps_completed_prefix(tmp_path):
+    class StallingPro:
+        """Coroutine client that never answers after the second day."""
+
+        async def stk_managers(self, start_date, end_date, fields=None):
+            if start_date > "20240102":
+                await asyncio.Event().wait()
+            return pd.DataFrame({"ts_code": ["000001.SZ"], "ann_date": [start_date]})
+
+    store = DataStore(base_dir=tmp_path)
+
+    async def main():
+        fetcher = _fetcher(tmp_path, StallingPro())
+        run = asyncio.ensure_future(
+            fetcher.fetch_stk_managers(
+                date(2024, 1, 1), date(2024, 1, 5), window="day", resume=False, force=False
+            )
+        )
+        while getattr(store.load_state("stk_managers"), "last_end_date", None) != "20240102":
+            await asyncio.sleep(0.01)
+        run.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await run
+        fetcher.close()
+        return [task for task in asyncio.all_tasks() if task is not asyncio.current_task()]
+
+    assert asyncio.run(main()) == []
+    assert len(list(store.iter_raw_files("stk_managers"))) == 2
+    assert store.load_state("stk_managers").last_end_date == "20240102"
@@ -0,0 +1,62 @@
+import json
+from datetime import date
+
+import pandas as pd
+
+from tushare_general_data_downloader.audit import audit_dataset, checksums_path, scan_file
+from tushare_general_data_downloader.cli import main
+from tushare_general_data_downloader.storage import DataStore
+
+
+def _frame(rows, extra=False):
+    df = pd.DataFrame({"ts_code": [f"{i:06d}.SZ" for i in range(rows)], "float_share": 1.0})
+    return df.assign(note="x") if extra else df
+
+
+def test_audit_flags_gaps_truncation_drift_and_corruption(tmp_path, capsys):
+    store = DataStore(base_dir=tmp_path)
+    save = store.save_raw_window
+    save("share_float", date(2024, 1, 1), date(2024, 1, 7), _frame(3))
+    save("share_float", date(2024, 1, 8), date(2024, 1, 14), _frame(10))  # at the cap
+    save("share_float", date(2024, 1, 13), date(2024, 1, 13), _frame(12))  # split day, fine
+    corrupt = save("share_float", date(2024, 1, 22), date(2024, 1, 28), _frame(2, extra=True))
+    save("share_float", date(2024, 1, 29), date(2024, 1, 29), pd.DataFrame())
+    store.update_state("share_float", date(2024, 2, 2), rows=0, windows=0)
+
+    first = audit_dataset(store, "share_float", threshold=10)
+    assert first.gaps == [("20240115", "20240121"), ("20240130", "20240202")]
+    assert first.truncated == ["share_float_20240108_20240114.csv"]
+    assert first.schema_drift == ["share_float_20240122_20240128.csv"]
+    assert first.empty == ["share_float_20240129_20240129.csv"]
+    assert first.overlaps == ["20240108-20240114 / 20240113-20240113"]
+    assert first.refetch == [("20240108", "20240121"), ("20240130", "20240202")]
+
+    # Same size and mtime, different bytes: silent corruption.
+    recorded = json.loads(checksums_path(store, "share_float").read_text())
+    recorded[corrupt.name]["sha1"] = "0" * 40
+    checksums_path(store, "share_float").write_text(json.dumps(recorded))
+    second = audit_dataset(store, "share_float", threshold=10)
+    assert second.checksum_mismatch == [corrupt.name]
+    assert second.refetch[0] == ("20240108", "20240128")
+
+    main(
+        [
+            "audit",
+            "--output-dir",
+            str(tmp_path),
+            "--datasets",
+            "share_float",
+            "--share-float-threshold",
+            "10",
+        ]
+    )
+    out = capsys.readouterr().out
+    assert "share_float 20240130 20240202" in out
+
+
+def test_csv_header_quotes_are_stripped(tmp_path):
+    path = tmp_path / "share_float_20240101_20240107.csv"
+    path.write_text('"ts_code","holder_name"\n000001.SZ,"A, Ltd"\n', encoding="utf-8")
+    facts = scan_file(path, "csv")
+    assert facts.columns == ("ts_code", "holder_name")
+    assert facts.rows == 1
@@ -0,0 +1,43 @@
+from datetime import date
+
+from tushare_general_data_downloader.api import RequestBudget
+
+
+def test_newest_first_budget_leaves_pending_and_converges(event_pro, make_fetcher):
+    pro = event_pro()
+    fetcher, store = make_fetcher(pro, budget=RequestBudget(max_requests=2))
+
+    summary = fetcher.fetch_stk_managers(
+        date(2024, 1, 1),
+        date(2024, 4, 30),
+        window="month",
+        resume=True,
+        force=False,
+        order="newest-first",
+    )
+
+    assert pro.calls == [("20240401", "20240430"), ("20240301", "20240331")]
+    assert [(w.start.month, w.end.month) for w in summary.pending] == [(1, 1), (2, 2)]
+    assert store.load_state("stk_managers") is None
+
+    pro = event_pro()
+    fetcher, store = make_fetcher(pro)
+    summary = fetcher.fetch_stk_managers(
+        date(2024, 1, 1),
+        date(2024, 4, 30),
+        window="month",
+        resume=True,
+        force=False,
+        order="newest-first",
+    )
+
+    assert pro.calls == [("20240201", "20240229"), ("20240101", "20240131")]
+    assert summary.pending == []
+    assert store.load_state("stk_managers").last_end_date == "20240430"
+
+
+def test_request_budget_counts_and_expires():
+    budget = RequestBudget(max_requests=1)
+    budget.consume()
+    assert budget.exhausted()
+    assert RequestBudget(time_budget=0).exhausted()
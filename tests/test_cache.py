@@ -0,0 +1,39 @@
+import os
+
+import pandas as pd
+
+from tushare_general_data_downloader.cache import FrameCache
+from tushare_general_data_downloader.storage import DataStore
+
+
+def test_cached_reads_projection_and_invalidation(tmp_path):
+    store = DataStore(base_dir=tmp_path, cache=FrameCache(max_bytes=1 << 20))
+    path = store.curated_path("share_float")
+    store.write_frame(pd.DataFrame({"ts_code": ["A", "B"], "float_share": [1.0, 2.0]}), path)
+
+    first = store.read_frame(path)
+    first["extra"] = 1  # callers get their own column set
+    assert "extra" not in store.read_frame(path).columns
+    assert store.read_frame(path, columns=["ts_code"])["ts_code"].tolist() == ["A", "B"]
+    assert (store.cache.hits, store.cache.misses) == (2, 1)
+
+    # A rewrite from another process: mtime/size change invalidates the entry.
+    pd.DataFrame({"ts_code": ["C"], "float_share": [3.0]}).to_csv(path, index=False)
+    os.utime(path, ns=(1, 1))
+    assert store.read_frame(path)["ts_code"].tolist() == ["C"]
+
+
+def test_lru_evicts_to_stay_within_budget(tmp_path):
+    store = DataStore(base_dir=tmp_path)
+    paths = []
+    for index in range(3):
+        path = tmp_path / f"f{index}.csv"
+        pd.DataFrame({"v": range(100)}).to_csv(path, index=False)
+        paths.append(path)
+    budget = int(pd.DataFrame({"v": range(100)}).memory_usage(deep=True).sum()) * 2
+    store.cache = FrameCache(max_bytes=budget)
+    for path in paths:
+        store.read_frame(path)
+    assert len(store.cache) == 2 and store.cache.bytes <= budget
+    store.read_frame(paths[0])
+    assert store.cache.misses == 4
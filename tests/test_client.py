@@ -0,0 +1,69 @@
+import gzip
+import json
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+from tushare_general_data_downloader.client import PooledProClient, TushareAPIError
+
+
+class _StandIn(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    connections: set[tuple[str, int]] = set()
+
+    def do_POST(self):  # noqa: N802 - http.server naming
+        type(self).connections.add(self.client_address)
+        body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+        if body["token"] != "good":
+            result = {"code": 40101, "msg": "bad token", "data": None}
+        else:
+            result = {
+                "code": 0,
+                "msg": "",
+                "data": {
+                    "fields": ["ts_code", "start_date"],
+                    "items": [["000001.SZ", body["params"]["start_date"]]],
+                },
+            }
+        payload = json.dumps(result).encode()
+        if "gzip" in self.headers.get("Accept-Encoding", ""):
+            payload = gzip.compress(payload)
+            self.send_response(200)
+            self.send_header("Content-Encoding", "gzip")
+        else:
+            self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture()
+def server():
+    _StandIn.connections = set()
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _StandIn)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{httpd.server_address[1]}/dataapi"
+    httpd.shutdown()
+    httpd.server_close()
+
+
+def test_pooled_client_reuses_connection(server):
+    client = PooledProClient("good", url=server, timeout=5)
+    frames = [client.stk_managers(start_date=f"2024010{day}", fields=None) for day in (1, 2, 3)]
+    client.close()
+
+    assert [frame.iloc[0]["start_date"] for frame in frames] == ["20240101", "20240102", "20240103"]
+    assert list(frames[0].columns) == ["ts_code", "start_date"]
+    assert len(_StandIn.connections) == 1
+
+
+def test_pooled_client_raises_on_api_error(server):
+    client = PooledProClient("bad", url=server, timeout=5)
+    with pytest.raises(TushareAPIError, match="bad token"):
+        client.share_float(start_date="20240101")
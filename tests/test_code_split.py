@@ -0,0 +1,77 @@
+from datetime import date
+
+import pandas as pd
+
+from tushare_general_data_downloader.api import FetchRunner, RateLimiter
+from tushare_general_data_downloader.audit import audit_dataset
+from tushare_general_data_downloader.batching import split_evenly
+from tushare_general_data_downloader.fetchers import ListedCompanyFetcher
+from tushare_general_data_downloader.storage import DataStore
+
+CODES = [f"{i:06d}.SZ" for i in range(8)]
+ROWS_PER_CODE = 2
+CAP = 6
+
+
+class CappedPro:
+    """share_float stand-in that truncates every response at CAP rows."""
+
+    def __init__(self):
+        self.calls: list[str | None] = []
+
+    def share_float(self, start_date, end_date, ts_code=None, fields=None):
+        self.calls.append(ts_code)
+        codes = ts_code.split(",") if ts_code else CODES
+        rows = [
+            {
+                "ts_code": code,
+                "float_date": start_date,
+                "holder_name": f"holder{n}",
+                "share_type": "A",
+                "ann_date": start_date,
+            }
+            for code in codes
+            for n in range(ROWS_PER_CODE)
+        ]
+        return pd.DataFrame(rows[:CAP])
+
+
+def test_split_evenly():
+    assert split_evenly(list("abcde"), 2) == [["a", "b", "c"], ["d", "e"]]
+    assert split_evenly(list("ab"), 5) == [["a"], ["b"]]
+
+
+def test_overflowing_day_fans_out_by_ts_code(tmp_path):
+    store = DataStore(base_dir=tmp_path)
+    store.save_curated("stock_basic", pd.DataFrame({"ts_code": CODES}))
+    pro = CappedPro()
+    fetcher = ListedCompanyFetcher(pro, FetchRunner(rate_limiter=RateLimiter(0)), store)
+
+    summary = fetcher.fetch_share_float(
+        date(2024, 1, 2), date(2024, 1, 2), window="day", resume=False, force=False, threshold=CAP
+    )
+
+    assert summary.rows == len(CODES) * ROWS_PER_CODE
+    saved = store.read_frame(
+        store.raw_window_path("share_float", date(2024, 1, 2), date(2024, 1, 2))
+    )
+    assert sorted(set(saved["ts_code"])) == CODES
+    assert pro.calls[0] is None
+    # Two halves overflow again and are bisected once more: 1 + 2 + 4 requests.
+    assert len(pro.calls) == 7
+
+
+def test_capped_day_without_universe_is_left_truncated(tmp_path, capsys):
+    store = DataStore(base_dir=tmp_path)
+    pro = CappedPro()
+    fetcher = ListedCompanyFetcher(pro, FetchRunner(rate_limiter=RateLimiter(0)), store)
+
+    summary = fetcher.fetch_share_float(
+        date(2024, 1, 2), date(2024, 1, 2), window="day", resume=False, force=False, threshold=CAP
+    )
+
+    assert pro.calls == [None]
+    assert summary.rows == CAP
+    assert "Fetch stock_basic first" in capsys.readouterr().out
+    report = audit_dataset(store, "share_float", threshold=CAP, update_checksums=False)
+    assert report.truncated == ["share_float_20240102_20240102.csv"]
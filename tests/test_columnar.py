@@ -0,0 +1,57 @@
+from datetime import date
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from tushare_general_data_downloader.api import FetchRunner, RateLimiter  # noqa: E402
+from tushare_general_data_downloader.columnar import decode_payload, dedup_table  # noqa: E402
+from tushare_general_data_downloader.fetchers import ListedCompanyFetcher  # noqa: E402
+from tushare_general_data_downloader.storage import DataStore  # noqa: E402
+
+FIELDS = ["ts_code", "float_date", "holder_name", "share_type", "ann_date", "float_share"]
+
+
+def _payload(rows):
+    return {"fields": FIELDS, "items": rows}
+
+
+def test_decode_payload_uses_declared_types():
+    table = decode_payload(_payload([["000001.SZ", "20240101", "h", "A", "20231201", 100]]))
+    assert table.schema.field("float_share").type == pa.float64()
+    assert table.schema.field("ann_date").type == pa.string()
+    assert decode_payload(_payload([])).num_rows == 0
+
+
+def test_dedup_table_keeps_last_occurrence_in_order():
+    table = decode_payload(
+        _payload(
+            [
+                ["000001.SZ", "20240101", "h", "A", "20231201", 1],
+                ["000002.SZ", "20240101", "h", "A", "20231201", 2],
+                ["000001.SZ", "20240101", "h", "A", "20231201", 3],
+            ]
+        )
+    )
+    deduped = dedup_table(table, ["ts_code", "float_date", "holder_name", "share_type"])
+    assert deduped.column("float_share").to_pylist() == [2.0, 3.0]
+
+
+class ArrowPro:
+    def share_float(self, start_date, end_date, fields=None):
+        return decode_payload(_payload([["000001.SZ", start_date, "h", "A", start_date, 5]] * 2))
+
+
+def test_fetcher_writes_arrow_tables(tmp_path):
+    for file_format in ("csv", "parquet", "ipc"):
+        store = DataStore(base_dir=tmp_path / file_format, file_format=file_format)
+        fetcher = ListedCompanyFetcher(
+            ArrowPro(), FetchRunner(rate_limiter=RateLimiter(0)), store
+        )
+        summary = fetcher.fetch_share_float(
+            date(2024, 1, 1), date(2024, 1, 7), window="week", resume=False, force=True
+        )
+        assert summary.rows == 1
+        frame = store.read_frame(summary.paths[0])
+        assert frame["float_share"].tolist() == [5.0]
+        assert store.count_rows(summary.paths[0]) == 1
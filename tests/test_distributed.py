@@ -0,0 +1,104 @@
+import json
+import time
+from datetime import date
+
+import pandas as pd
+
+from tushare_general_data_downloader.api import FetchRunner, RateLimiter, RequestBudget
+from tushare_general_data_downloader.distributed import WindowTask, WorkQueue, run_worker
+from tushare_general_data_downloader.fetchers import FetchSummary, ListedCompanyFetcher
+from tushare_general_data_downloader.storage import DataStore
+
+
+class FakePro:
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+
+    def stk_managers(self, start_date: str, end_date: str, fields=None):
+        self.calls.append((start_date, end_date))
+        return pd.DataFrame({"ts_code": ["000001.SZ"], "ann_date": [start_date]})
+
+
+def _tasks():
+    return [
+        WindowTask("stk_managers", date(2024, 1, 1), date(2024, 1, 31)),
+        WindowTask("stk_managers", date(2024, 2, 1), date(2024, 2, 29)),
+    ]
+
+
+def test_publish_is_idempotent_and_leases_are_exclusive(tmp_path):
+    queue = WorkQueue(tmp_path / "work", lease_seconds=60)
+    assert queue.publish(_tasks()) == 2
+    assert queue.publish(_tasks()) == 0
+
+    first = queue.claim("a")
+    second = queue.claim("b")
+    assert first.task != second.task
+    assert queue.claim("c") is None
+
+    queue.complete(first, FetchSummary(dataset="stk_managers", rows=1))
+    queue.complete(first, FetchSummary(dataset="stk_managers", rows=1))
+    assert queue.status() == {"tasks": 2, "done": 1, "leased": 1, "available": 0}
+
+
+def test_expired_lease_is_reclaimed(tmp_path):
+    queue = WorkQueue(tmp_path / "work", lease_seconds=60)
+    queue.publish(_tasks()[:1])
+    crashed = queue.claim("crashed")
+    lease_path = tmp_path / "work" / "leases" / f"{crashed.task.task_id}.lease"
+    payload = json.loads(lease_path.read_text())
+    payload["expires"] = time.time() - 1
+    lease_path.write_text(json.dumps(payload))
+
+    rescued = queue.claim("rescuer")
+    assert rescued is not None and rescued.worker_id == "rescuer"
+    assert not queue.heartbeat(crashed)
+    assert queue.heartbeat(rescued)
+
+
+def test_workers_drain_queue(tmp_path):
+    queue = WorkQueue(tmp_path / "work", lease_seconds=60)
+    queue.publish(_tasks())
+    pro = FakePro()
+    store = DataStore(base_dir=tmp_path / "data")
+    fetcher = ListedCompanyFetcher(pro, FetchRunner(rate_limiter=RateLimiter(0)), store)
+
+    done = run_worker(fetcher, queue, worker_id="w1", threshold=5500)
+
+    assert len(done) == 2
+    assert sorted(pro.calls) == [("20240101", "20240131"), ("20240201", "20240229")]
+    assert queue.status()["done"] == 2
+    assert store.raw_window_path("stk_managers", date(2024, 2, 1), date(2024, 2, 29)).exists()
+
+
+def test_worker_waits_for_peer_lease_and_reclaims_it(tmp_path):
+    queue = WorkQueue(tmp_path / "work", lease_seconds=60)
+    queue.publish(_tasks()[:1])
+    crashed = queue.claim("crashed")
+    lease_path = tmp_path / "work" / "leases" / f"{crashed.task.task_id}.lease"
+    pro = FakePro()
+    fetcher = ListedCompanyFetcher(
+        pro, FetchRunner(rate_limiter=RateLimiter(0)), DataStore(base_dir=tmp_path / "data")
+    )
+
+    def expire(_seconds):
+        payload = json.loads(lease_path.read_text())
+        payload["expires"] = time.time() - 1
+        lease_path.write_text(json.dumps(payload))
+
+    done = run_worker(fetcher, queue, worker_id="w1", threshold=5500, sleep=expire)
+
+    assert len(done) == 1 and pro.calls == [("20240101", "20240131")]
+    assert queue.status() == {"tasks": 1, "done": 1, "leased": 0, "available": 0}
+
+
+def test_budget_exhaustion_releases_lease(tmp_path):
+    queue = WorkQueue(tmp_path / "work", lease_seconds=60)
+    queue.publish(_tasks())
+    runner = FetchRunner(rate_limiter=RateLimiter(0), budget=RequestBudget(max_requests=1))
+    fetcher = ListedCompanyFetcher(FakePro(), runner, DataStore(base_dir=tmp_path / "data"))
+
+    done = run_worker(fetcher, queue, worker_id="w1", threshold=5500)
+
+    assert len(done) == 1
+    assert queue.status() == {"tasks": 2, "done": 1, "leased": 0, "available": 1}
@@ -0,0 +1,40 @@
+import pandas as pd
+
+from tushare_general_data_downloader.api import FetchRunner, RateLimiter
+from tushare_general_data_downloader.batching import pack_code_batches, rows_per_code
+from tushare_general_data_downloader.fetchers import ListedCompanyFetcher
+from tushare_general_data_downloader.storage import DataStore
+
+
+def test_pack_code_batches_respects_row_budget():
+    estimates = {"A": 50, "B": 30, "C": 30, "D": 10}
+    batches = pack_code_batches(["A", "B", "C", "D", "E"], estimates, row_cap=100)
+    assert batches == [["A", "B"], ["C", "D", "E"]]
+    assert pack_code_batches(["A", "B"], {}, row_cap=100, max_codes=1) == [["A"], ["B"]]
+
+
+class ManagersPro:
+    def __init__(self):
+        self.calls: list[str] = []
+
+    def stk_managers(self, ts_code, fields=None):
+        self.calls.append(ts_code)
+        return pd.DataFrame(
+            {"ts_code": ts_code.split(","), "name": ["n"] * len(ts_code.split(","))}
+        )
+
+
+def test_fetch_by_codes_uses_history_to_size_batches(tmp_path):
+    store = DataStore(base_dir=tmp_path)
+    history = pd.DataFrame({"ts_code": ["A"] * 3 + ["B"] * 3 + ["C"], "name": list("abcdefg")})
+    store.save_curated("stk_managers", history)
+    assert rows_per_code(store, "stk_managers") == {"A": 3, "B": 3, "C": 1}
+
+    pro = ManagersPro()
+    fetcher = ListedCompanyFetcher(pro, FetchRunner(rate_limiter=RateLimiter(0)), store)
+    summary = fetcher.fetch_by_codes("stk_managers", ["C", "A", "B"], row_cap=5)
+
+    assert pro.calls == ["A", "B,C"]
+    assert summary.rows == 3
+    merged = store.merge_into_curated("stk_managers", ["ts_code", "name"], summary.paths)
+    assert len(merged) == 10
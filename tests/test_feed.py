@@ -0,0 +1,61 @@
+from datetime import date
+
+import pandas as pd
+
+from tushare_general_data_downloader.constants import DEDUP_KEYS
+from tushare_general_data_downloader import feed
+from tushare_general_data_downloader.feed import read_changes, read_manifest
+from tushare_general_data_downloader.snapshots import record_snapshot
+from tushare_general_data_downloader.storage import DataStore
+
+
+def test_consolidate_and_merge_append_sequenced_changes(tmp_path):
+    store = DataStore(base_dir=tmp_path)
+    frame = pd.DataFrame(
+        {
+            "ts_code": ["000001.SZ", "000002.SZ"],
+            "ann_date": ["20240101", "20240101"],
+            "name": ["A", "B"],
+            "title": ["董事", "监事"],
+            "begin_date": ["20200101", "20200101"],
+            "end_date": [None, None],
+            "edu": ["本科", "硕士"],
+        }
+    )
+    store.save_curated("stk_managers", frame)
+    store.save_curated("stk_managers", frame)  # unchanged: no entry
+
+    window = frame.iloc[[1]].assign(edu="博士")
+    path = store.save_raw_window("stk_managers", date(2024, 7, 1), date(2024, 7, 1), window)
+    store.merge_into_curated("stk_managers", DEDUP_KEYS["stk_managers"], [path])
+
+    entries = read_manifest(store, "stk_managers")
+    assert [entry.sequence for entry in entries] == [1, 2]
+    assert entries[0].counts == {"inserted": 2, "updated": 0, "removed": 0}
+
+    ((entry, changes),) = read_changes(store, "stk_managers", after=1)
+    assert entry.files == {"updated": "00000002_updated.csv"}
+    assert changes["updated"]["edu"].tolist() == ["博士"]
+
+
+def test_dimension_snapshots_feed_removals(tmp_path):
+    store = DataStore(base_dir=tmp_path)
+    basic = pd.DataFrame({"ts_code": ["000001.SZ", "000002.SZ"], "name": ["A", "B"]})
+    record_snapshot(store, "stock_basic", basic, date(2024, 1, 1))
+    record_snapshot(store, "stock_basic", basic.iloc[:1], date(2024, 1, 2))
+    ((_, changes),) = read_changes(store, "stock_basic", after=1)
+    assert changes["removed"]["ts_code"].tolist() == ["000002.SZ"]
+
+
+def test_manifest_keeps_only_recent_entries(tmp_path, monkeypatch):
+    monkeypatch.setattr(feed, "MANIFEST_ENTRIES", 2)
+    store = DataStore(base_dir=tmp_path)
+    for index in range(5):
+        frame = pd.DataFrame({"ts_code": ["000001.SZ"], "name": [f"v{index}"]})
+        store.save_curated("stock_basic", frame)
+
+    assert [entry.sequence for entry in read_manifest(store, "stock_basic")] == [4, 5]
+    assert feed.head_sequence(store, "stock_basic") == 5
+    changes = read_changes(store, "stock_basic", after=1)
+    assert [entry.sequence for entry, _ in changes] == [2, 3, 4, 5]
+    assert changes[0][1]["updated"]["name"].tolist() == ["v1"]
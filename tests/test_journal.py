@@ -0,0 +1,67 @@
+import json
+import os
+import socket
+import time
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from tushare_general_data_downloader.journal import temp_path
+from tushare_general_data_downloader.storage import DataStore
+
+
+def test_failed_write_leaves_no_target_or_journal(tmp_path):
+    store = DataStore(base_dir=tmp_path)
+    path = store.raw_window_path("share_float", date(2024, 1, 1), date(2024, 1, 7))
+
+    class Boom(pd.DataFrame):
+        def to_csv(self, *args, **kwargs):
+            super().to_csv(*args, **kwargs)
+            raise KeyboardInterrupt
+
+    with pytest.raises(KeyboardInterrupt):
+        store.write_frame(Boom({"ts_code": ["A"]}), path)
+    assert not path.exists() and not temp_path(path).exists()
+    assert list(store.journal.directory.glob("*.json")) == []
+
+
+def test_recover_discards_partial_files_from_dead_writers(tmp_path):
+    pytest.importorskip("pyarrow")
+    store = DataStore(base_dir=tmp_path, file_format="parquet")
+    good = store.raw_window_path("share_float", date(2024, 1, 1), date(2024, 1, 7))
+    store.write_frame(pd.DataFrame({"ts_code": ["A"]}), good)
+
+    # Simulate a crash after an old-style in-place write truncated the target.
+    torn = store.raw_window_path("share_float", date(2024, 1, 8), date(2024, 1, 14))
+    torn.write_bytes(b"PAR1\x00\x01")
+    temp_path(torn).write_bytes(b"partial")
+    store.journal.directory.mkdir(parents=True, exist_ok=True)
+    record = {
+        "path": str(torn),
+        "tmp": str(temp_path(torn)),
+        "pid": 2**22 + 7,
+        "host": socket.gethostname(),
+        "started": time.time(),
+    }
+    (store.journal.directory / "torn.json").write_text(json.dumps(record), encoding="utf-8")
+
+    removed = store.recover()
+    assert set(removed) == {torn, temp_path(torn)}
+    assert good.exists() and not torn.exists()
+    assert list(store.journal.directory.glob("*.json")) == []
+
+
+def test_temp_file_is_synced_before_rename(tmp_path, monkeypatch):
+    store = DataStore(base_dir=tmp_path)
+    path = store.curated_path("stock_basic")
+    synced = []
+    real_fsync = os.fsync
+
+    def fsync(fd):
+        synced.append(path.exists())
+        real_fsync(fd)
+
+    monkeypatch.setattr(os, "fsync", fsync)
+    store.write_frame(pd.DataFrame({"ts_code": ["A"]}), path)
+    assert synced == [False] and path.exists()
@@ -0,0 +1,68 @@
+import sys
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from tushare_general_data_downloader.master import (
+    load_security_master,
+    refresh_security_master,
+)
+from tushare_general_data_downloader.snapshots import record_snapshot
+from tushare_general_data_downloader.storage import DataStore
+
+pytest.importorskip("pyarrow")
+
+
+def _seed(store):
+    basic = pd.DataFrame(
+        {"ts_code": ["600000.SH", "000001.SZ"], "name": ["浦发银行", "平安银行"]}
+    )
+    company = pd.DataFrame(
+        {"ts_code": ["000001.SZ"], "chairman": ["谢永林"], "business_scope": ["吸收公众存款"]}
+    )
+    record_snapshot(store, "stock_basic", basic, date(2024, 1, 1))
+    record_snapshot(store, "stock_company", company, date(2024, 1, 1))
+    managers = pd.DataFrame(
+        [
+            ["000001.SZ", "20200101", "Old", "董事长", "20150101", "20191231"],
+            ["000001.SZ", "20200101", "谢永林", "董事长", "20200101", None],
+            ["000001.SZ", "20200101", "Ji", "总经理", "20200101", None],
+        ],
+        columns=["ts_code", "ann_date", "name", "title", "begin_date", "end_date"],
+    )
+    store.save_curated("stk_managers", managers)
+    return basic
+
+
+def test_master_joins_dimensions_and_skips_unchanged_inputs(tmp_path):
+    store = DataStore(base_dir=tmp_path)
+    basic = _seed(store)
+
+    first = refresh_security_master(store)
+    assert first.rebuilt and first.rows == 2
+    master = load_security_master(store)
+    assert master.index.tolist() == ["000001.SZ", "600000.SH"]
+    assert master.loc["000001.SZ", "mgr_chairman_name"] == "谢永林"
+    assert master.loc["000001.SZ", "mgr_manager_name"] == "Ji"
+    assert pd.isna(master.loc["600000.SH", "business_scope"])
+
+    # Snapshots rewrite curated files with identical content: no rebuild.
+    record_snapshot(store, "stock_basic", basic, date(2024, 1, 2))
+    assert not refresh_security_master(store).rebuilt
+
+    changed = pd.concat([basic, pd.DataFrame({"ts_code": ["300750.SZ"], "name": ["宁德时代"]})])
+    record_snapshot(store, "stock_basic", changed, date(2024, 1, 3))
+    again = refresh_security_master(store)
+    assert again.rebuilt and again.rows == 3
+
+
+def test_missing_pyarrow_skips_quietly_unless_asked(tmp_path, monkeypatch, capsys):
+    store = DataStore(base_dir=tmp_path)
+    _seed(store)
+    monkeypatch.setitem(sys.modules, "pyarrow", None)
+
+    assert refresh_security_master(store) is None
+    assert capsys.readouterr().out == ""
+    assert refresh_security_master(store, warn=True) is None
+    assert "needs pyarrow" in capsys.readouterr().out
@@ -0,0 +1,98 @@
+import shutil
+from datetime import date, timedelta
+
+import pandas as pd
+import pytest
+
+from tushare_general_data_downloader.constants import DEDUP_KEYS
+from tushare_general_data_downloader.feed import read_manifest
+from tushare_general_data_downloader.memory import MemoryMonitor, parse_size
+from tushare_general_data_downloader.rollups import read_rollup, rollup_path
+from tushare_general_data_downloader.storage import DataStore
+
+
+def _window(day, codes, share):
+    return pd.DataFrame(
+        {
+            "ts_code": codes,
+            "ann_date": "20240101",
+            "float_date": day.strftime("%Y%m%d"),
+            "holder_name": "H",
+            "share_type": "定增",
+            "float_share": share,
+            "float_ratio": 0.1,
+        }
+    )
+
+
+def _seed(store):
+    start = date(2024, 1, 1)
+    for offset in range(6):
+        day = start + timedelta(days=offset)
+        codes = [f"{i:06d}.SZ" for i in range(offset * 20, offset * 20 + 40)]
+        store.save_raw_window("share_float", day, day, _window(day, codes, float(offset)))
+
+
+def test_parse_size():
+    assert parse_size("512M") == 512 << 20
+    assert parse_size("1.5g") == int(1.5 * (1 << 30))
+    assert parse_size("") is None
+
+
+def test_spilled_consolidate_matches_in_memory(tmp_path):
+    keys = DEDUP_KEYS["share_float"]
+    plain = DataStore(base_dir=tmp_path / "plain")
+    _seed(plain)
+    plain_rows, _ = plain.save_consolidated("share_float", keys)
+
+    store = DataStore(base_dir=tmp_path / "spill", memory=MemoryMonitor(limit=8 << 10))
+    _seed(store)
+    assert store.memory.partitions_for(64 << 10) > 1
+    with store.memory.stage("consolidate share_float"):
+        rows, path = store.save_consolidated("share_float", keys)
+
+    assert rows == plain_rows
+    expected = plain.read_frame(plain.curated_path("share_float")).sort_values(keys)
+    actual = store.read_frame(path).sort_values(keys)
+    assert actual.reset_index(drop=True).equals(expected.reset_index(drop=True))
+    assert read_rollup(store, "float_date").equals(read_rollup(plain, "float_date"))
+    entries = read_manifest(store, "share_float")
+    # One feed entry per partition, so no step holds the whole first build as a delta.
+    assert len(entries) > 1
+    assert sum(entry.counts["inserted"] for entry in entries) == rows
+    assert store.memory.peaks["consolidate share_float"] > 0
+    assert not any((tmp_path / "spill" / "spill").iterdir())
+
+
+@pytest.mark.parametrize("drop_rollups", [False, True])
+def test_spilled_consolidate_keeps_rollups_in_step(tmp_path, drop_rollups):
+    keys = DEDUP_KEYS["share_float"]
+    plain = DataStore(base_dir=tmp_path / "plain")
+    store = DataStore(base_dir=tmp_path / "spill", memory=MemoryMonitor(limit=8 << 10))
+    day = date(2024, 2, 1)
+    for target in (plain, store):
+        _seed(target)
+        target.save_consolidated("share_float", keys)
+    if drop_rollups:
+        shutil.rmtree(rollup_path(store, "float_date").parent)
+
+    for target in (plain, store):
+        target.save_raw_window("share_float", day, day, _window(day, ["999999.SZ"], 7.0))
+        target.save_consolidated("share_float", keys)
+
+    rollup = read_rollup(store, "float_date")
+    assert rollup["rows"].sum() == len(store.read_frame(store.curated_path("share_float")))
+    assert rollup.equals(read_rollup(plain, "float_date"))
+
+
+def test_memory_estimate_ignores_an_empty_first_file(tmp_path, monkeypatch):
+    store = DataStore(base_dir=tmp_path, memory=MemoryMonitor(limit=64 << 20))
+    store.save_raw_window("share_float", date(2023, 12, 31), date(2023, 12, 31), pd.DataFrame())
+    _seed(store)
+    estimates = []
+    monkeypatch.setattr(store.memory, "partitions_for", lambda size: estimates.append(size) or 1)
+
+    store.save_consolidated("share_float", DEDUP_KEYS["share_float"])
+
+    total = sum(path.stat().st_size for path in store.iter_raw_files("share_float"))
+    assert estimates and estimates[0] < total * 20
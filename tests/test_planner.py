@@ -0,0 +1,53 @@
+from datetime import date
+
+import pandas as pd
+
+from tushare_general_data_downloader.planner import plan_windowed
+from tushare_general_data_downloader.storage import DataStore
+
+
+def _rows(count: int) -> pd.DataFrame:
+    return pd.DataFrame({"ts_code": ["000001.SZ"] * count, "float_date": ["20240101"] * count})
+
+
+def test_plan_skips_existing_and_predicts_splits(tmp_path):
+    store = DataStore(base_dir=tmp_path, file_format="csv")
+    store.save_raw_window("share_float", date(2023, 12, 25), date(2023, 12, 31), _rows(14))
+    store.save_raw_window("share_float", date(2024, 1, 1), date(2024, 1, 7), _rows(14))
+
+    plan = plan_windowed(
+        store,
+        "share_float",
+        date(2024, 1, 1),
+        date(2024, 1, 21),
+        window="week",
+        resume=False,
+        force=False,
+        threshold=10,
+    )
+
+    assert plan.windows == 3
+    assert plan.skipped == 1
+    assert plan.rows_per_day == 2.0
+    assert plan.expected_splits == 2
+    assert plan.requests == 2 + 14
+    assert plan.eta_seconds(0.5) == 8.0
+
+
+def test_plan_respects_resume_state(tmp_path):
+    store = DataStore(base_dir=tmp_path, file_format="csv")
+    store.update_state("stk_managers", date(2024, 1, 31), rows=0, windows=1)
+
+    plan = plan_windowed(
+        store,
+        "stk_managers",
+        date(2024, 1, 1),
+        date(2024, 3, 31),
+        window="month",
+        resume=True,
+        force=False,
+    )
+
+    assert plan.windows == 2
+    assert plan.requests == 2
+    assert plan.rows_per_day is None
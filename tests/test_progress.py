@@ -0,0 +1,97 @@
+import io
+import json
+from datetime import date
+
+import pandas as pd
+
+from tushare_general_data_downloader.progress import ProgressTracker
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000.0
+
+    def __call__(self):
+        return self.now
+
+
+class FakePro:
+    def __init__(self, clock, rows_per_day=0):
+        self.clock = clock
+        self.rows_per_day = rows_per_day
+
+    def stk_managers(self, start_date, end_date, fields=None):
+        self.clock.now += 3.0
+        return pd.DataFrame({"ts_code": ["000001.SZ", "000002.SZ"], "ann_date": [start_date] * 2})
+
+    def share_float(self, start_date, end_date, fields=None, ts_code=None):
+        self.clock.now += 1.0
+        days = pd.date_range(start_date, end_date)
+        rows = [
+            (f"{index:06d}.SZ", start_date, day.strftime("%Y%m%d"))
+            for day in days
+            for index in range(self.rows_per_day)
+        ]
+        return pd.DataFrame(rows, columns=["ts_code", "ann_date", "float_date"])
+
+
+def test_tracker_reports_throughput_eta_and_status_file(tmp_path, make_fetcher):
+    clock = FakeClock()
+    status_file = tmp_path / "status" / "progress.json"
+    tracker = ProgressTracker(rpm=60, status_file=status_file, display=False, clock=clock)
+    fetcher, _ = make_fetcher(FakePro(clock), progress=tracker)
+
+    fetcher.fetch_stk_managers(
+        date(2024, 1, 1), date(2024, 12, 31), window="month", resume=False, force=False
+    )
+    status = json.loads(tracker.write_status().read_text(encoding="utf-8"))
+
+    managers = status["datasets"]["stk_managers"]
+    assert (managers["windows_done"], managers["windows_total"]) == (12, 12)
+    assert managers["requests"] == 12 and managers["rows"] == 24
+    assert managers["state"] == "done" and managers["eta_seconds"] is None
+    assert managers["rows_per_sec"] == round(24 / 36, 2)
+    assert status["rpm"] == 20.0 and status["rpm_limit"] == 60
+    assert not list(status_file.parent.glob("*.tmp"))
+
+
+def test_rolling_eta_backoff_and_tty_line():
+    clock = FakeClock()
+    stream = io.StringIO()
+    tracker = ProgressTracker(rpm=120, stream=stream, display=True, clock=clock)
+    tracker.begin("share_float", 10)
+    for _ in range(4):
+        clock.now += 5.0
+        tracker.request("share_float 20240101->20240107")
+        tracker.window_done("share_float", 100)
+
+    item = tracker.snapshot()["datasets"]["share_float"]
+    assert item["eta_seconds"] == 30.0
+    assert item["rows_per_sec"] == 20.0
+
+    tracker.backoff("share_float 20240108->20240114", 8.0, RuntimeError("timeout"))
+    tracker.split("share_float", 2)
+    item = tracker.snapshot()["datasets"]["share_float"]
+    assert item["state"] == "backoff" and item["backoff_remaining"] == 8.0
+    assert item["last_error"] == "RuntimeError: timeout"
+
+    tracker.refresh()
+    line = stream.getvalue()
+    assert "share_float 4/10 40%" in line and "split=2" in line and "backoff 8s" in line
+    assert line.endswith("rpm 12/120")
+    tracker.stop()
+    assert stream.getvalue().endswith("\n")
+
+
+def test_autosplit_depth_is_recorded(make_fetcher):
+    clock = FakeClock()
+    tracker = ProgressTracker(display=False, clock=clock)
+    fetcher, _ = make_fetcher(FakePro(clock, rows_per_day=3), progress=tracker)
+
+    fetcher.fetch_share_float(
+        date(2024, 1, 1), date(2024, 1, 3), window="week", resume=False, force=False, threshold=5
+    )
+
+    item = tracker.snapshot()["datasets"]["share_float"]
+    assert item["max_split_depth"] == 1 and item["split_depth"] == 0
+    assert item["requests"] == 4 and item["windows_done"] == 1
@@ -0,0 +1,43 @@
+import pandas as pd
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from tushare_general_data_downloader.published import (  # noqa: E402
+    open_published,
+    publish_ipc,
+    published_dir,
+    published_version,
+)
+from tushare_general_data_downloader.storage import DataStore  # noqa: E402
+
+
+def test_publish_swaps_versions_and_keeps_mapped_tables_valid(tmp_path):
+    store = DataStore(base_dir=tmp_path, publish_ipc=True)
+    frame = pd.DataFrame(
+        {
+            "ts_code": ["000001.SZ"],
+            "ann_date": ["20240101"],
+            "name": ["A"],
+            "title": ["董事"],
+            "begin_date": ["20200101"],
+            "end_date": [None],
+        }
+    )
+    store.save_curated("stk_managers", frame)
+    first = open_published(store, "stk_managers")
+    assert str(first.schema.field("title").type).startswith("dictionary")
+
+    for index in range(4):
+        store.save_curated("stk_managers", pd.concat([frame] * (index + 2), ignore_index=True))
+    assert published_version(store, "stk_managers") == 5
+    assert len(list(published_dir(store, "stk_managers").glob("v*.arrow"))) == 3
+    assert open_published(store, "stk_managers").num_rows == 5
+    assert first.column("ts_code").to_pylist() == ["000001.SZ"]
+
+
+def test_publish_without_chunks_keeps_current_version(tmp_path):
+    store = DataStore(base_dir=tmp_path)
+    assert publish_ipc(store, "stk_managers", iter([])) is None
+    assert published_version(store, "stk_managers") == 0
+    assert not list(published_dir(store, "stk_managers").iterdir())
@@ -0,0 +1,167 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from tushare_general_data_downloader.api import RequestBudget
+from tushare_general_data_downloader.audit import audit_dataset
+from tushare_general_data_downloader.planner import plan_windowed
+from tushare_general_data_downloader.registry import DATASET_SPECS, get_spec
+from tushare_general_data_downloader.windowing import DateWindow
+
+CODES = ["000001.SZ", "000002.SZ", "600000.SH"]
+
+
+class FakePro:
+    def __init__(self):
+        self.calls: list[tuple[str, dict]] = []
+
+    def dividend(self, ann_date, fields=None):
+        self.calls.append(("dividend", {"ann_date": ann_date}))
+        if ann_date.endswith("2"):
+            return pd.DataFrame()
+        return pd.DataFrame(
+            {
+                "ts_code": CODES[:2],
+                "end_date": ["20231231"] * 2,
+                "ann_date": [ann_date] * 2,
+                "div_proc": ["预案", "预案"],
+                "cash_div": [0.1, 0.2],
+            }
+        )
+
+    def top10_holders(self, ts_code, start_date, end_date, fields=None):
+        self.calls.append(("top10_holders", {"ts_code": ts_code, "end_date": end_date}))
+        return pd.DataFrame(
+            {
+                "ts_code": [ts_code] * 2,
+                "ann_date": [end_date] * 2,
+                "end_date": ["20240331"] * 2,
+                "holder_name": ["A", "B"],
+                "hold_amount": [1.0, 2.0],
+            }
+        )
+
+    def pledge_detail(self, ts_code, fields=None):
+        self.calls.append(("pledge_detail", {"ts_code": ts_code}))
+        return pd.DataFrame(
+            {"ts_code": [ts_code], "ann_date": ["20240101"], "holder_name": ["X"]}
+        )
+
+
+def test_specs_cover_engine_settings():
+    for name, spec in DATASET_SPECS.items():
+        assert spec.dedup_keys and spec.fields and spec.row_cap, name
+    dividend = get_spec("dividend")
+    window = dividend.windows(date(2024, 1, 1), date(2024, 1, 31))[0]
+    assert dividend.requests_per_window(window, len(CODES)) == 31
+    assert get_spec("pledge_detail").windows(date(2020, 1, 1), date(2024, 6, 30)) == [
+        DateWindow(start=date(2024, 6, 30), end=date(2024, 6, 30))
+    ]
+
+
+def test_single_date_endpoint_fetches_day_by_day_and_resumes(make_fetcher):
+    pro = FakePro()
+    fetcher, store = make_fetcher(pro, universe=CODES)
+
+    summary = fetcher.fetch_dataset("dividend", date(2024, 1, 1), date(2024, 1, 3), resume=True)
+
+    assert [params["ann_date"] for _, params in pro.calls] == ["20240101", "20240102", "20240103"]
+    assert summary.rows == 4 and summary.files == 3
+    assert store.raw_window_path("dividend", date(2024, 1, 3), date(2024, 1, 3)).exists()
+    assert store.load_state("dividend").last_end_date == "20240103"
+
+    pro.calls.clear()
+    fetcher.fetch_dataset("dividend", date(2024, 1, 1), date(2024, 1, 3), resume=True)
+    assert pro.calls == []
+
+    plan = plan_windowed(
+        store,
+        "dividend",
+        date(2024, 1, 1),
+        date(2024, 1, 5),
+        window=None,
+        resume=False,
+        force=False,
+    )
+    assert (plan.skipped, plan.requests) == (0, 2)
+
+    rows, _ = store.save_consolidated("dividend", get_spec("dividend").dedup_keys)
+    assert rows == 4
+
+
+def test_code_endpoints_fan_out_over_universe(make_fetcher):
+    pro = FakePro()
+    fetcher, store = make_fetcher(pro, universe=CODES)
+
+    summary = fetcher.fetch_dataset("top10_holders", date(2024, 1, 1), date(2024, 6, 30))
+    assert [params["ts_code"] for _, params in pro.calls] == CODES
+    assert summary.windows == 1 and summary.rows == 6
+    saved = store.read_frame(
+        store.raw_window_path("top10_holders", date(2024, 1, 1), date(2024, 6, 30))
+    )
+    assert sorted(saved["ts_code"]) == sorted(CODES * 2)
+
+    pro.calls.clear()
+    summary = fetcher.fetch_dataset("pledge_detail", date(2024, 1, 1), date(2024, 6, 30))
+    assert [name for name, _ in pro.calls] == ["pledge_detail"] * 3
+    assert store.raw_window_path("pledge_detail", date(2024, 6, 30), date(2024, 6, 30)).exists()
+
+    plan = plan_windowed(
+        store,
+        "top10_holders",
+        date(2024, 7, 1),
+        date(2024, 12, 31),
+        window=None,
+        resume=False,
+        force=False,
+    )
+    assert (plan.windows, plan.requests) == (1, len(CODES))
+
+
+def test_code_fan_out_persists_batches_and_resumes(make_fetcher):
+    pro = FakePro()
+    fetcher, store = make_fetcher(pro, universe=CODES)
+    start, end = date(2024, 1, 1), date(2024, 6, 30)
+    fetcher.runner.budget = RequestBudget(max_requests=2)
+
+    summary = fetcher.fetch_dataset("top10_holders", start, end)
+    assert len(summary.pending) == 1 and summary.rows == 0
+    assert not store.raw_window_path("top10_holders", start, end).exists()
+    assert store.raw_part_path("top10_holders", start, end, 1).exists()
+
+    pro.calls.clear()
+    fetcher.runner.budget = None
+    summary = fetcher.fetch_dataset("top10_holders", start, end)
+    assert [params["ts_code"] for _, params in pro.calls] == CODES[2:]
+    assert summary.rows == 6 and not store.raw_parts_dir("top10_holders", start, end).exists()
+    saved = store.read_frame(store.raw_window_path("top10_holders", start, end))
+    assert sorted(saved["ts_code"]) == sorted(CODES * 2)
+
+
+def test_code_window_with_only_empty_batches_stays_readable(make_fetcher):
+    pytest.importorskip("pyarrow")
+
+    class EmptyPro(FakePro):
+        def top10_holders(self, ts_code, start_date, end_date, fields=None):
+            self.calls.append(("top10_holders", {"ts_code": ts_code}))
+            return pd.DataFrame()
+
+    fetcher, store = make_fetcher(EmptyPro(), file_format="parquet", universe=CODES)
+    start, end = date(2024, 1, 1), date(2024, 6, 30)
+
+    summary = fetcher.fetch_dataset("top10_holders", start, end)
+    assert summary.rows == 0
+    assert store.read_frame(store.raw_window_path("top10_holders", start, end)).empty
+    rows, _ = store.save_consolidated("top10_holders", get_spec("top10_holders").dedup_keys)
+    assert rows == 0
+    report = audit_dataset(store, "top10_holders", update_checksums=False)
+    assert report.unreadable == [] and len(report.empty) == 1
+
+
+def test_code_endpoints_need_a_universe(make_fetcher):
+    fetcher, _ = make_fetcher(FakePro())
+    with pytest.raises(ValueError, match="needs curated stock_basic"):
+        next(fetcher.iter_dataset("top10_holders", date(2024, 1, 1), date(2024, 6, 30)))
+    with pytest.raises(ValueError, match="needs curated stock_basic"):
+        fetcher.fetch_dataset("pledge_detail", date(2024, 1, 1), date(2024, 6, 30))
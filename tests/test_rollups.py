@@ -0,0 +1,56 @@
+from datetime import date
+
+import pandas as pd
+
+from tushare_general_data_downloader.constants import DEDUP_KEYS
+from tushare_general_data_downloader.rollups import read_rollup, upcoming_unlocks
+from tushare_general_data_downloader.storage import DataStore, _merge_frames
+
+COLUMNS = [
+    "ts_code",
+    "ann_date",
+    "float_date",
+    "holder_name",
+    "share_type",
+    "float_share",
+    "float_ratio",
+]
+
+
+def _rows(rows):
+    return pd.DataFrame(rows, columns=COLUMNS)
+
+
+def test_merge_updates_rollups_incrementally(tmp_path):
+    store = DataStore(base_dir=tmp_path)
+    first = _rows(
+        [
+            ["000001.SZ", "20240101", "20240110", "A", "定增", 100.0, 1.0],
+            ["000001.SZ", "20240101", "20240110", "B", "定增", 50.0, 0.5],
+            ["600000.SH", "20240102", "20240115", "C", "首发", 10.0, 0.1],
+        ]
+    )
+    store.save_raw_window("share_float", date(2024, 1, 1), date(2024, 1, 7), first)
+    store.merge_into_curated("share_float", DEDUP_KEYS["share_float"], [])
+
+    second = _rows(
+        [
+            ["000001.SZ", "20240101", "20240110", "B", "定增", 70.0, 0.7],
+            ["300750.SZ", "20240108", "20240120", "D", "首发", 5.0, 0.05],
+        ]
+    )
+    path = store.save_raw_window("share_float", date(2024, 1, 8), date(2024, 1, 14), second)
+    merged = store.merge_into_curated("share_float", DEDUP_KEYS["share_float"], [path])
+
+    by_date = read_rollup(store, "float_date").set_index("float_date")
+    expected = _merge_frames([first, second], DEDUP_KEYS["share_float"])
+    assert len(merged) == len(expected)
+    assert by_date.loc["20240110", "float_share"] == 170.0
+    assert by_date.loc["20240110", "rows"] == 2
+    assert by_date["rows"].sum() == len(expected)
+
+    by_type = read_rollup(store, "share_type").set_index(["share_type", "float_date"])
+    assert by_type.loc[("首发", "20240120"), "float_share"] == 5.0
+
+    window = upcoming_unlocks(store, date(2024, 1, 12), days=5)
+    assert window["float_date"].tolist() == ["20240115"]
@@ -0,0 +1,51 @@
+import threading
+import time
+
+from tushare_general_data_downloader.api import FetchRunner, RateLimiter
+from tushare_general_data_downloader.fetchers import FetchSummary, ListedCompanyFetcher
+from tushare_general_data_downloader.scheduler import DatasetJob, run_jobs
+from tushare_general_data_downloader.storage import DataStore
+
+
+def test_rate_limiter_serves_higher_priority_first():
+    limiter = RateLimiter(min_interval=0.2)
+    limiter.wait()
+    order: list[str] = []
+
+    def worker(name: str, priority: int) -> None:
+        limiter.wait(priority)
+        order.append(name)
+
+    low = threading.Thread(target=worker, args=("low", 0))
+    high = threading.Thread(target=worker, args=("high", 10))
+    low.start()
+    time.sleep(0.05)
+    high.start()
+    low.join()
+    high.join()
+
+    assert order == ["high", "low"]
+
+
+def test_run_jobs_overlaps_latency_bound_datasets(tmp_path):
+    runner = FetchRunner(rate_limiter=RateLimiter(min_interval=0))
+    fetcher = ListedCompanyFetcher(None, runner, DataStore(base_dir=tmp_path))
+    seen_priorities: list[int] = []
+
+    def job(name: str):
+        def run(f: ListedCompanyFetcher) -> FetchSummary:
+            seen_priorities.append(f.runner.priority)
+            time.sleep(0.3)
+            return FetchSummary(dataset=name, windows=1)
+
+        return run
+
+    jobs = [DatasetJob("a", 1, job("a")), DatasetJob("b", 5, job("b"))]
+    started = time.monotonic()
+    summaries = run_jobs(jobs, fetcher, concurrent=True)
+    elapsed = time.monotonic() - started
+
+    assert [summary.dataset for summary in summaries] == ["a", "b"]
+    assert sorted(seen_priorities) == [1, 5]
+    assert runner.priority == 0
+    assert elapsed < 0.55
@@ -0,0 +1,63 @@
+from datetime import date
+
+import pandas as pd
+
+from tushare_general_data_downloader.delta import diff_frames
+from tushare_general_data_downloader.snapshots import record_snapshot
+from tushare_general_data_downloader.storage import DataStore
+
+
+def _basic(rows):
+    return pd.DataFrame(rows, columns=["ts_code", "symbol", "name", "list_date"])
+
+
+def test_diff_frames_classifies_rows():
+    old = pd.DataFrame({"k": ["a", "b", "c"], "v": ["1", "2", "3"]})
+    new = pd.DataFrame({"k": ["a", "b", "d"], "v": ["1", "9", "4"]})
+    delta = diff_frames(old, new, ["k"])
+    assert delta.inserted["k"].tolist() == ["d"]
+    assert delta.updated["v"].tolist() == ["9"]
+    assert delta.previous["v"].tolist() == ["2"]
+    assert delta.removed["k"].tolist() == ["c"]
+
+
+def test_record_snapshot_stores_only_changes_and_history(tmp_path):
+    store = DataStore(base_dir=tmp_path)
+    day1 = _basic(
+        [
+            ["000001.SZ", "000001", "PAB", "19910403"],
+            ["000002.SZ", "000002", "Vanke", "19910129"],
+        ]
+    )
+    first = record_snapshot(store, "stock_basic", day1, date(2024, 1, 1))
+    assert len(first.delta.inserted) == 2
+
+    curated = store.curated_path("stock_basic")
+    before = curated.stat().st_mtime_ns
+    unchanged = record_snapshot(store, "stock_basic", day1.copy(), date(2024, 1, 2))
+    assert unchanged.delta.empty
+    assert unchanged.changes_path is None
+    assert unchanged.files == 0
+    assert curated.stat().st_mtime_ns == before
+
+    day3 = _basic(
+        [
+            ["000001.SZ", "000001", "Ping An Bank", "19910403"],
+            ["600000.SH", "600000", "SPDB", "19991110"],
+        ]
+    )
+    third = record_snapshot(store, "stock_basic", day3, date(2024, 1, 3))
+    changes = pd.read_csv(third.changes_path, dtype=str)
+    assert sorted(zip(changes["ts_code"], changes["change"])) == [
+        ("000001.SZ", "updated"),
+        ("000002.SZ", "removed"),
+        ("600000.SH", "inserted"),
+    ]
+
+    history = pd.read_csv(store.history_path("stock_basic"), dtype=str)
+    assert len(history) == 4
+    closed = history[history["valid_to"].notna()]
+    assert sorted(closed["ts_code"]) == ["000001.SZ", "000002.SZ"]
+    assert set(closed["valid_to"]) == {"20240103"}
+    current = history[history["valid_to"].isna()]
+    assert sorted(current["name"]) == ["Ping An Bank", "SPDB"]
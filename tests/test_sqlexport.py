@@ -0,0 +1,102 @@
+import sqlite3
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from tushare_general_data_downloader import sqlexport
+from tushare_general_data_downloader.snapshots import record_snapshot
+from tushare_general_data_downloader.storage import DataStore
+
+
+def _float(rows):
+    return pd.DataFrame(
+        rows,
+        columns=["ts_code", "ann_date", "float_date", "holder_name", "share_type", "float_share"],
+    )
+
+
+def test_export_upserts_only_changed_rows(tmp_path):
+    store = DataStore(base_dir=tmp_path)
+    db = tmp_path / "tushare.sqlite"
+    store.save_curated(
+        "share_float",
+        _float(
+            [
+                ["000001.SZ", "20240101", "20240110", "A", "定增", 100.0],
+                ["000002.SZ", "20240101", "20240111", None, "首发", 5.0],
+            ]
+        ),
+    )
+    basic = pd.DataFrame({"ts_code": ["000001.SZ"], "name": ["PAB"]})
+    record_snapshot(store, "stock_basic", basic, date(2024, 1, 1))
+    first = store.export_sql(db, ["stock_basic", "share_float", "stk_managers"])
+    assert [(r.dataset, r.inserted) for r in first] == [("stock_basic", 1), ("share_float", 2)]
+
+    store.save_curated(
+        "share_float",
+        _float(
+            [
+                ["000001.SZ", "20240101", "20240110", "A", "定增", 120.0],
+                ["000002.SZ", "20240101", "20240111", None, "首发", 5.0],
+                ["000003.SZ", "20240102", "20240112", "C", "首发", 1.0],
+            ]
+        ),
+    )
+    (second,) = store.export_sql(db, ["share_float"])
+    assert (second.inserted, second.updated, second.removed) == (1, 1, 0)
+
+    with sqlite3.connect(db) as conn:
+        rows = conn.execute(
+            "SELECT ts_code, float_share FROM share_float ORDER BY ts_code"
+        ).fetchall()
+        indexes = {row[1] for row in conn.execute("PRAGMA index_list('share_float')")}
+    assert rows == [("000001.SZ", 120.0), ("000002.SZ", 5.0), ("000003.SZ", 1.0)]
+    assert {"ix_share_float_ts_code", "ix_share_float_float_date", "ux_share_float_keys"} <= indexes
+
+
+def _managers(names):
+    return pd.DataFrame(
+        {
+            "ts_code": ["000001.SZ"] * len(names),
+            "ann_date": ["20240101"] * len(names),
+            "name": names,
+            "title": ["董事"] * len(names),
+            "begin_date": ["20200101"] * len(names),
+        }
+    )
+
+
+def _export_deltas(tmp_path, monkeypatch, db, engine):
+    store = DataStore(base_dir=tmp_path)
+    store.save_curated("stk_managers", _managers(["A", "B"]))
+    (first,) = store.export_sql(db, ["stk_managers"], engine=engine)
+    assert first.inserted == 2
+
+    store.save_curated("stk_managers", _managers(["A", "C"]))
+
+    def whole_file(*args):
+        raise AssertionError("incremental export must not re-read the curated file")
+
+    monkeypatch.setattr(sqlexport, "_prepare", whole_file)
+    (second,) = store.export_sql(db, ["stk_managers"], engine=engine)
+    assert (second.inserted, second.updated, second.removed) == (1, 0, 1)
+    (third,) = store.export_sql(db, ["stk_managers"], engine=engine)
+    assert (third.inserted, third.updated, third.removed) == (0, 0, 0)
+
+
+def test_export_replays_only_feed_deltas(tmp_path, monkeypatch):
+    db = tmp_path / "tushare.sqlite"
+    _export_deltas(tmp_path, monkeypatch, db, "sqlite")
+    with sqlite3.connect(db) as conn:
+        names = conn.execute("SELECT name FROM stk_managers ORDER BY name").fetchall()
+    assert names == [("A",), ("C",)]
+
+
+def test_duckdb_export_replays_only_feed_deltas(tmp_path, monkeypatch):
+    duckdb = pytest.importorskip("duckdb")
+    db = tmp_path / "tushare.duckdb"
+    _export_deltas(tmp_path, monkeypatch, db, "duckdb")
+    with duckdb.connect(str(db)) as conn:
+        names = conn.execute("SELECT name FROM stk_managers ORDER BY name").fetchall()
+    assert names == [("A",), ("C",)]
@@ -0,0 +1,35 @@
+from datetime import date
+
+from tushare_general_data_downloader.fetchers import raw_window_sink
+
+
+def test_iter_share_float_is_lazy_and_writes_nothing(tmp_path, event_pro, make_fetcher):
+    pro = event_pro({("20240101", "20240107"): 6})
+    fetcher, store = make_fetcher(pro)
+
+    stream = fetcher.iter_share_float(
+        date(2024, 1, 1), date(2024, 1, 14), window="week", threshold=5
+    )
+    first = next(stream)
+    assert (first.window.start, first.window.end) == (date(2024, 1, 1), date(2024, 1, 1))
+    assert len(pro.calls) == 2
+
+    rest = list(stream)
+    assert len(rest) == 7
+    assert sum(len(item.frame) for item in [first, *rest]) == 8
+    assert not (tmp_path / "raw").exists()
+    assert store.load_state("share_float") is None
+
+
+def test_iter_share_float_with_sink_persists_windows(event_pro, make_fetcher):
+    pro = event_pro()
+    fetcher, store = make_fetcher(pro)
+
+    items = list(
+        fetcher.iter_share_float(
+            date(2024, 1, 1), date(2024, 1, 14), window="week", sink=raw_window_sink(store)
+        )
+    )
+
+    assert len(items) == 2
+    assert len(list(store.iter_raw_files("share_float"))) == 2
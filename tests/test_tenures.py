@@ -0,0 +1,41 @@
+from datetime import date
+
+import pandas as pd
+
+from tushare_general_data_downloader.storage import DataStore
+from tushare_general_data_downloader.tenures import index_path, load_tenure_index
+
+
+def _managers():
+    return pd.DataFrame(
+        [
+            ["000001.SZ", "20100101", "Li", "董事长", "20100101", "20150630"],
+            ["000001.SZ", "20150701", "Wang", "董事长", "20150701", None],
+            ["000001.SZ", "20120101", "Zhao", "独立董事", "20120101", None],
+            ["000001.SZ", "20130101", "Zhao", "独立董事", "20120101", "20130101"],
+            ["600000.SH", "20180101", "Chen", "总经理", "20180101", "20201231"],
+        ],
+        columns=["ts_code", "ann_date", "name", "title", "begin_date", "end_date"],
+    )
+
+
+def test_consolidation_builds_index_and_as_of_is_vectorized(tmp_path):
+    store = DataStore(base_dir=tmp_path)
+    store.save_curated("stk_managers", _managers())
+    assert index_path(store).exists()
+
+    index = load_tenure_index(store)
+    result = index.as_of(
+        ["000001.SZ", "000001.SZ", "600000.SH", "600000.SH", "300750.SZ"],
+        ["20120601", date(2016, 1, 1), "20201231", "20210101", "20200101"],
+    )
+    by_query = result.groupby("query")["name"].apply(sorted).to_dict()
+    assert by_query == {0: ["Li", "Zhao"], 1: ["Wang"], 2: ["Chen"]}
+    assert result.loc[result["query"] == 1, "as_of"].tolist() == [date(2016, 1, 1)]
+
+
+def test_on_date_spans_all_codes(tmp_path):
+    store = DataStore(base_dir=tmp_path)
+    store.save_curated("stk_managers", _managers())
+    active = load_tenure_index(store).on_date("20190101")
+    assert sorted(active["name"]) == ["Chen", "Wang"]
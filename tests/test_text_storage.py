@@ -0,0 +1,65 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from tushare_general_data_downloader.storage import DataStore
+
+
+def _company(scope):
+    return pd.DataFrame(
+        {
+            "ts_code": ["000001.SZ", "000002.SZ"],
+            "chairman": ["A", "B"],
+            "business_scope": [scope, scope],
+        }
+    )
+
+
+def test_interned_csv_round_trips_and_shares_strings(tmp_path):
+    store = DataStore(base_dir=tmp_path, intern_text=True)
+    scope = "吸收公众存款；发放短期、中期和长期贷款；办理国内外结算。" * 4
+    first = store.save_curated("stock_company", _company(scope))
+    second = store.raw_snapshot_path("stock_company", date(2024, 1, 2))
+    store.write_frame(_company(scope), second)
+
+    raw = pd.read_csv(first)
+    assert raw["business_scope"].str.startswith("#").all()
+    strings = store.strings_path("stock_company").read_text(encoding="utf-8")
+    assert strings.count("吸收公众存款") == 4
+
+    fresh = DataStore(base_dir=tmp_path, intern_text=True)
+    assert fresh.read_frame(second)["business_scope"].tolist() == [scope, scope]
+    projected = fresh.read_frame(first, columns=["ts_code", "chairman"])
+    assert projected.columns.tolist() == ["ts_code", "chairman"]
+    assert fresh.read_frame(first, text=True)["ts_code"].tolist() == ["000001.SZ", "000002.SZ"]
+
+
+def test_short_values_stay_inline(tmp_path):
+    store = DataStore(base_dir=tmp_path, intern_text=True)
+    path = store.save_curated("stock_company", _company("银行"))
+    assert pd.read_csv(path)["business_scope"].tolist() == ["银行", "银行"]
+
+
+def test_parquet_text_columns_read_as_categorical(tmp_path):
+    pytest.importorskip("pyarrow")
+    store = DataStore(base_dir=tmp_path, file_format="parquet")
+    path = store.save_curated("stock_company", _company("long scope text"))
+    frame = store.read_frame(path)
+    assert isinstance(frame["business_scope"].dtype, pd.CategoricalDtype)
+    assert store.read_frame(path, text=True)["business_scope"].tolist() == ["long scope text"] * 2
+
+
+@pytest.mark.parametrize("file_format", ["csv", "parquet", "ipc"])
+def test_arrow_table_text_columns_are_encoded(tmp_path, file_format):
+    pa = pytest.importorskip("pyarrow")
+    scope = "吸收公众存款；发放短期、中期和长期贷款；办理国内外结算。" * 4
+    store = DataStore(base_dir=tmp_path, file_format=file_format, intern_text=True)
+    path = store.curated_path("stock_company")
+    store.write_frame(pa.Table.from_pandas(_company(scope), preserve_index=False), path)
+
+    if file_format == "csv":
+        assert pd.read_csv(path)["business_scope"].str.startswith("#").all()
+    else:
+        assert isinstance(store.read_frame(path)["business_scope"].dtype, pd.CategoricalDtype)
+    assert store.read_frame(path, text=True)["business_scope"].tolist() == [scope, scope]
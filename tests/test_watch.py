@@ -0,0 +1,86 @@
+from datetime import datetime, time, timedelta
+
+import pandas as pd
+
+from tushare_general_data_downloader.api import FetchRunner, RateLimiter
+from tushare_general_data_downloader.fetchers import ListedCompanyFetcher
+from tushare_general_data_downloader.progress import ProgressTracker
+from tushare_general_data_downloader.storage import DataStore
+from tushare_general_data_downloader.watch import WatchConfig, WatchLoop
+from tushare_general_data_downloader.windowing import BJT, next_run_bjt, today_bjt
+
+
+class FakePro:
+    def __init__(self):
+        self.calls: list[tuple[str, str]] = []
+
+    def stk_managers(self, start_date: str, end_date: str, fields=None):
+        self.calls.append((start_date, end_date))
+        return pd.DataFrame(
+            {
+                "ts_code": ["000001.SZ"],
+                "ann_date": [start_date],
+                "name": ["A"],
+                "title": ["CEO"],
+                "begin_date": [start_date],
+                "end_date": [end_date],
+            }
+        )
+
+
+def test_next_run_bjt_rolls_to_next_day():
+    slots = [time(9, 0), time(21, 0)]
+    now = datetime(2024, 1, 2, 21, 30, tzinfo=BJT)
+    assert next_run_bjt(now, slots) == datetime(2024, 1, 3, 9, 0, tzinfo=BJT)
+    assert next_run_bjt(now.replace(hour=10), slots).hour == 21
+
+
+def test_watch_cycle_fills_gap_then_refreshes_recent_days(tmp_path):
+    pro = FakePro()
+    store = DataStore(base_dir=tmp_path, file_format="csv")
+    fetcher = ListedCompanyFetcher(pro, FetchRunner(rate_limiter=RateLimiter(0)), store)
+    today = today_bjt()
+    config = WatchConfig(
+        datasets=["stk_managers"],
+        start=today - timedelta(days=4),
+        times=[time(9, 0)],
+        lookback_days=2,
+        managers_window="day",
+    )
+    loop = WatchLoop(fetcher, config)
+
+    loop.run_cycle()
+    assert len(pro.calls) == 5
+    assert len(store.read_frame(store.curated_path("stk_managers"))) == 5
+
+    pro.calls.clear()
+    loop.run_cycle()
+    assert len(pro.calls) == 2
+    assert len(store.read_frame(store.curated_path("stk_managers"))) == 5
+    assert store.load_state("stk_managers").last_end_date == today.strftime("%Y%m%d")
+
+
+def test_failed_cycle_is_recorded_and_loop_continues(tmp_path):
+    pro = FakePro()
+    store = DataStore(base_dir=tmp_path, file_format="csv")
+    tracker = ProgressTracker(display=False)
+    runner = FetchRunner(rate_limiter=RateLimiter(0), progress=tracker)
+    fetcher = ListedCompanyFetcher(pro, runner, store)
+    config = WatchConfig(datasets=["stk_managers"], start=today_bjt(), times=[time(9, 0)])
+    loop = WatchLoop(fetcher, config)
+    outcomes = iter([RuntimeError("HTTP 502"), None])
+
+    def flaky_cycle():
+        outcome = next(outcomes)
+        if outcome is not None:
+            raise outcome
+        return []
+
+    loop.run_cycle = flaky_cycle
+    sleeps: list[float] = []
+    loop.run(max_cycles=2, sleep=sleeps.append)
+
+    assert loop.failed_cycles == 1
+    assert loop.last_error == "RuntimeError: HTTP 502"
+    assert len(sleeps) == 1
+    assert tracker.snapshot()["failed_cycles"] == 1